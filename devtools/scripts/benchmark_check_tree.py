@@ -0,0 +1,293 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Benchmarks for the CheckTree widget.
+
+Builds synthetic trees with a given depth, fan-out and fraction of checked leaves,
+and times the main operations of CheckTree, counting the calls made to Tcl for each.
+The widgets need a display, so on a machine without one, run the benchmarks under a
+virtual X server, e.g.
+
+    xvfb-run -a python devtools/scripts/benchmark_check_tree.py
+
+or `make benchmark`. Use --json to save the results so that they can be compared from
+run to run.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tkinter as tk
+
+import seamm_widgets as sw
+
+# The default trees, as (depth, fan-out)
+default_shapes = ((2, 100), (3, 30), (4, 12), (7, 4))
+
+widget_classes = {
+    "CheckTree": sw.CheckTree,
+    "CanvasCheckTree": sw.CanvasCheckTree,
+}
+
+
+class CountingTk(object):
+    """A wrapper around a Tk interpreter that counts the calls made to it.
+
+    Only call() and eval() are counted, which is how tkinter and the widgets talk to
+    Tcl. Everything else is passed through.
+    """
+
+    def __init__(self, tkapp):
+        self._tkapp = tkapp
+        self.calls = 0
+
+    def __getattr__(self, name):
+        return getattr(self._tkapp, name)
+
+    def call(self, *args):
+        self.calls += 1
+        return self._tkapp.call(*args)
+
+    def eval(self, script):
+        self.calls += 1
+        return self._tkapp.eval(script)
+
+
+def make_metadata(depth, fanout, checked=0.3, columns=("Description",), seed=42):
+    """Create the metadata for a tree.
+
+    Parameters
+    ----------
+    depth : int
+        The number of levels in the tree.
+    fanout : int
+        The number of children of each branch.
+    checked : float
+        The fraction of leaves that are checked.
+    columns : [str]
+        The columns to give values for.
+    seed : int
+        The seed for the random choice of checked leaves.
+
+    Returns
+    -------
+    dict(str: dict), int
+        The metadata for CheckTree.from_dict and the number of items.
+    """
+    rng = random.Random(seed)
+    count = 0
+
+    def level(prefix, remaining):
+        nonlocal count
+        result = {}
+        for i in range(fanout):
+            key = f"{prefix}.{i}" if prefix != "" else f"item{i}"
+            value = {column.lower(): f"{column} of {key}" for column in columns}
+            if remaining > 1:
+                value["items"] = level(key, remaining - 1)
+            elif rng.random() < checked:
+                value["checked"] = True
+            result[key] = value
+            count += 1
+        return result
+
+    metadata = level("", depth)
+    return metadata, count
+
+
+def path_to_depth(metadata, depth):
+    """The key of the first item at the given depth, counting the top level as 1."""
+    key = None
+    for _ in range(depth):
+        key, value = next(iter(metadata.items()))
+        metadata = value.get("items", {})
+    return key
+
+
+class Benchmark(object):
+    """Time operations on a widget, counting the Tcl calls.
+
+    Parameters
+    ----------
+    root : tkinter.Tk
+        The main window, whose interpreter is wrapped in a CountingTk.
+    repeat : int
+        How many times to repeat each operation, keeping the fastest time.
+    """
+
+    def __init__(self, root, repeat=3):
+        self.root = root
+        self.repeat = repeat
+        self.results = []
+
+    def time(self, name, function, setup=None):
+        """Time an operation, including the work Tk does once idle.
+
+        Parameters
+        ----------
+        name : str
+            The name of the operation for the report.
+        function : callable
+            The operation.
+        setup : callable
+            An optional function called before each repetition, which is not timed.
+        """
+        best = None
+        calls = None
+        for _ in range(self.repeat):
+            if setup is not None:
+                setup()
+            self.root.update_idletasks()
+            start_calls = self.root.tk.calls
+            start = time.perf_counter()
+            function()
+            self.root.update_idletasks()
+            elapsed = time.perf_counter() - start
+            if best is None or elapsed < best:
+                best = elapsed
+                calls = self.root.tk.calls - start_calls
+        self.results.append({"operation": name, "seconds": best, "tcl calls": calls})
+
+
+def run(widget_class, depth, fanout, checked, repeat, lazy):
+    """Run the benchmarks for one shape of tree.
+
+    Returns
+    -------
+    dict
+        The description of the tree and the results.
+    """
+    metadata, n_items = make_metadata(depth, fanout, checked)
+    top = path_to_depth(metadata, 1)
+    mid = path_to_depth(metadata, max(1, (depth + 1) // 2))
+    leaf = path_to_depth(metadata, depth)
+
+    root = tk.Tk()
+    root.withdraw()
+    root.tk = CountingTk(root.tk)
+    benchmark = Benchmark(root, repeat=repeat)
+
+    kwargs = {"columns": ["Description"]}
+    if lazy:
+        kwargs["lazy"] = True
+    widgets = []
+
+    def new_widget():
+        for widget in widgets:
+            widget.destroy()
+        widgets[:] = [widget_class(root, **kwargs)]
+        widgets[0].grid(row=0, column=0, sticky=tk.NSEW)
+
+    benchmark.time(
+        "from_dict", lambda: widgets[0].from_dict("", metadata), setup=new_widget
+    )
+    tree = widgets[0]
+    benchmark.time("invoke top", lambda: tree.invoke(top))
+    benchmark.time("invoke mid", lambda: tree.invoke(mid))
+    benchmark.time("invoke leaf", lambda: tree.invoke(leaf))
+    benchmark.time("get", lambda: tree.get())
+    benchmark.time("get as_dict", lambda: tree.get(as_dict=True))
+    benchmark.time("get_leaves", lambda: tree.get_leaves())
+    benchmark.time("state", lambda: tree.state())
+    benchmark.time("state mid", lambda: tree.state(mid))
+
+    root.destroy()
+    return {
+        "widget": widget_class.__name__,
+        "lazy": lazy,
+        "depth": depth,
+        "fanout": fanout,
+        "checked": checked,
+        "items": n_items,
+        "results": benchmark.results,
+    }
+
+
+def report(runs, out=sys.stdout):
+    """Print a table of the results."""
+    for result in runs:
+        print(
+            f"\n{result['widget']}{' (lazy)' if result['lazy'] else ''}: "
+            f"depth {result['depth']}, fan-out {result['fanout']}, "
+            f"{result['items']} items, {result['checked']:.0%} checked",
+            file=out,
+        )
+        print(f"    {'operation':<14} {'seconds':>10} {'tcl calls':>10}", file=out)
+        for line in result["results"]:
+            print(
+                f"    {line['operation']:<14} {line['seconds']:10.4f} "
+                f"{line['tcl calls']:10d}",
+                file=out,
+            )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--shape",
+        action="append",
+        metavar="DEPTHxFANOUT",
+        help="The shape of a tree, e.g. 4x10. May be repeated.",
+    )
+    parser.add_argument(
+        "--checked", type=float, default=0.3, help="The fraction of checked leaves"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="The number of times to repeat each"
+    )
+    parser.add_argument(
+        "--widget",
+        choices=[*widget_classes, "all"],
+        default="all",
+        help="The widget to benchmark",
+    )
+    parser.add_argument(
+        "--lazy", action="store_true", help="Create the CheckTree with lazy=True"
+    )
+    parser.add_argument("--json", help="Write the results to this JSON file")
+    options = parser.parse_args(argv)
+
+    if options.shape is None:
+        shapes = default_shapes
+    else:
+        shapes = [tuple(int(x) for x in shape.split("x")) for shape in options.shape]
+    if options.widget == "all":
+        classes = [*widget_classes.values()]
+    else:
+        classes = [widget_classes[options.widget]]
+
+    runs = []
+    for widget_class in classes:
+        for depth, fanout in shapes:
+            runs.append(
+                run(
+                    widget_class,
+                    depth,
+                    fanout,
+                    options.checked,
+                    options.repeat,
+                    options.lazy,
+                )
+            )
+    report(runs)
+
+    if options.json is not None:
+        with open(options.json, "w") as fd:
+            json.dump(
+                {
+                    "seamm_widgets": sw.__version__,
+                    "python": platform.python_version(),
+                    "tk": tk.TkVersion,
+                    "platform": platform.platform(),
+                    "runs": runs,
+                },
+                fd,
+                indent=4,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Benchmarks for filling the ScrolledColumns widget.
+
+Fills tables of a given number of rows and columns of text, setting the cells one at
+a time and with the bulk methods, and times each, counting the calls made to Tcl.
+The widgets need a display, so on a machine without one, run the benchmarks under a
+virtual X server, e.g.
+
+    xvfb-run -a python devtools/scripts/benchmark_scrolled_columns.py
+
+or `make benchmark`. Use --json to save the results so that they can be compared from
+run to run.
+"""
+
+import argparse
+import json
+import platform
+import tkinter as tk
+
+from benchmark_check_tree import Benchmark, CountingTk
+import seamm_widgets as sw
+
+# The default tables, as (rows, columns)
+default_shapes = ((100, 5), (1000, 5), (5000, 3))
+
+
+def make_data(nrows, ncolumns):
+    """The text of the cells of a table."""
+    return [
+        [f"cell {row}, {column}" for column in range(ncolumns)] for row in range(nrows)
+    ]
+
+
+def run(nrows, ncolumns, repeat):
+    """Run the benchmarks for one size of table.
+
+    Returns
+    -------
+    dict
+        The description of the table and the results.
+    """
+    data = make_data(nrows, ncolumns)
+    extra = make_data(max(1, nrows // 10), ncolumns)
+
+    root = tk.Tk()
+    root.withdraw()
+    root.tk = CountingTk(root.tk)
+    benchmark = Benchmark(root, repeat=repeat)
+
+    table = sw.ScrolledColumns(root, columns=[f"Column {i}" for i in range(ncolumns)])
+    table.grid(row=0, column=0, sticky=tk.NSEW)
+
+    def by_cell():
+        for row, values in enumerate(data):
+            for column, value in enumerate(values):
+                table[row, column] = value
+
+    benchmark.time("cell by cell", by_cell, setup=table.clear)
+    benchmark.time("append_rows", lambda: table.append_rows(data), setup=table.clear)
+    benchmark.time("set_data", lambda: table.set_data(data))
+
+    def fill():
+        table.set_data(data)
+
+    benchmark.time(
+        f"insert {len(extra)} at top", lambda: table.insert_rows(0, extra), setup=fill
+    )
+
+    root.destroy()
+    return {
+        "rows": nrows,
+        "columns": ncolumns,
+        "results": benchmark.results,
+    }
+
+
+def report(runs):
+    """Print a table of the results."""
+    for result in runs:
+        print(f"\nScrolledColumns: {result['rows']} rows x {result['columns']} columns")
+        print(f"    {'operation':<18} {'seconds':>10} {'tcl calls':>10}")
+        for line in result["results"]:
+            print(
+                f"    {line['operation']:<18} {line['seconds']:10.4f} "
+                f"{line['tcl calls']:10d}"
+            )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--shape",
+        action="append",
+        metavar="ROWSxCOLUMNS",
+        help="The size of a table, e.g. 1000x5. May be repeated.",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="The number of times to repeat each"
+    )
+    parser.add_argument("--json", help="Write the results to this JSON file")
+    options = parser.parse_args(argv)
+
+    if options.shape is None:
+        shapes = default_shapes
+    else:
+        shapes = [tuple(int(x) for x in shape.split("x")) for shape in options.shape]
+
+    runs = [run(nrows, ncolumns, options.repeat) for nrows, ncolumns in shapes]
+    report(runs)
+
+    if options.json is not None:
+        with open(options.json, "w") as fd:
+            json.dump(
+                {
+                    "seamm_widgets": sw.__version__,
+                    "python": platform.python_version(),
+                    "tk": tk.TkVersion,
+                    "platform": platform.platform(),
+                    "runs": runs,
+                },
+                fd,
+                indent=4,
+            )
+
+
+if __name__ == "__main__":
+    main()
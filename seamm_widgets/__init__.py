@@ -8,6 +8,11 @@ Custom Tk widgets for SEAMM.
 # Bring up the classes so that they appear to be directly in
 # the seamm_widgets package.
 
+from seamm_widgets.images import (  # noqa: F401
+    forget_images,
+    get_image,
+    preload_images,
+)
 from seamm_widgets.mousewheel_support import MousewheelSupport  # noqa: F401
 from seamm_widgets.labeled_widget import LabeledWidget, align_labels  # noqa: F401, E501
 from seamm_widgets.scrolled_frame import ScrolledFrame  # noqa: F401
@@ -29,6 +34,7 @@ from seamm_widgets.unit_combobox import UnitCombobox  # noqa: F401
 from seamm_widgets.search_criteria import Criterion  # noqa: F401
 from seamm_widgets.search_criteria import SearchCriteria  # noqa: F401
 from seamm_widgets.check_tree import CheckTree  # noqa: F401
+from seamm_widgets.canvas_check_tree import CanvasCheckTree  # noqa: F401
 from .html_widgets import HTMLScrolledText, HTMLText, HTMLLabel  # noqa: F401
 
 # Handle versioneer
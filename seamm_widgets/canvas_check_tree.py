@@ -0,0 +1,663 @@
+# -*- coding: utf-8 -*-
+
+"""A CheckTree that draws only the visible rows on a canvas.
+
+A ttk.Treeview holds every item in Tk, which becomes slow and uses a lot of memory for
+very large trees, even when the items are only created as branches are opened.
+CanvasCheckTree keeps the items only in the Python model of the CheckTree and draws
+just the rows in view on a canvas, so the cost of drawing and scrolling depends on the
+height of the window rather than the size of the tree.
+"""
+
+import logging
+import tkinter as tk
+from tkinter import ttk
+import tkinter.font as tkfont
+
+import seamm_widgets as sw
+from seamm_widgets.check_tree import CheckTree
+
+logger = logging.getLogger(__name__)
+
+
+class CanvasTree(ttk.Frame):
+    """A stand-in for ttk.Treeview that draws the items of a CheckTree model.
+
+    Only the parts of the Treeview API used by CheckTree are provided. The items are
+    not held in Tk: the list of rows is worked out from the model when the structure
+    of the tree changes, and only the rows in view are drawn, once Tk is idle.
+
+    Parameters
+    ----------
+    master : tkinter.Misc
+        The parent widget.
+    model : CheckTreeModel
+        The model holding the items.
+    children : callable
+        Function giving the children of an item that should be shown.
+    image : callable
+        Function giving the image for an item.
+    tags : callable
+        Function giving the tags of an item.
+    columns : [str]
+        The identifiers of the columns.
+    """
+
+    indent = 20
+
+    def __init__(self, master, model, children, image, tags, columns=(), **kwargs):
+        super().__init__(master)
+
+        self._model = model
+        self._children = children
+        self._image = image
+        self._tags = tags
+        self._columns = []
+        self._column_options = {}
+        self._headings = {}
+        self._displaycolumns = "#all"
+        self._show = ("tree", "headings")
+        self._height = 10
+        self._tag_options = {}
+        self._tag_bindings = {}
+        self._focus = ""
+        self._yscrollcommand = None
+
+        self._rows = []
+        self._row_of = None
+        self._top = 0
+        self._stale = True
+        self._redraw_id = None
+
+        style = ttk.Style(self)
+        self.font = tkfont.nametofont("TkDefaultFont")
+        self.heading_font = tkfont.nametofont("TkHeadingFont")
+        self.rowheight = max(self.font.metrics("linespace") + 4, 20)
+        self.background = style.lookup("Treeview", "fieldbackground") or "white"
+        self.foreground = style.lookup("Treeview", "foreground") or "black"
+        self.heading_background = style.lookup("Heading", "background") or "gray85"
+
+        self.canvas = tk.Canvas(
+            self,
+            background=self.background,
+            borderwidth=0,
+            highlightthickness=0,
+        )
+        self.canvas.grid(row=0, column=0, sticky=tk.NSEW)
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        self.canvas.bind("<Configure>", lambda event: self.redraw())
+        self.canvas.bind("<Button-1>", self._click_cb)
+        self.canvas.bind("<Double-Button-1>", self._double_click_cb)
+
+        self.config(columns=columns, **kwargs)
+
+    def bbox(self, item, column=None):
+        """The bounding box (x, y, width, height) of the item, or of one of its cells,
+        or an empty string if it is not in view."""
+        row = self._row(self._model[item])
+        if row is None or row < self._top or row >= self._top + self._page():
+            return ""
+        y = self._header_height() + (row - self._top) * self.rowheight
+        x0 = int(self.canvas.canvasx(0))
+        if column is None:
+            return (-x0, y, self._total_width(), self.rowheight)
+        cid = self._column_id(column)
+        for other, x, width in self._layout_columns():
+            if other == cid:
+                return (x - x0, y, width, self.rowheight)
+        return ""
+
+    def _click_cb(self, event):
+        """Handle clicks on the headings and on the indicators that open branches."""
+        if event.y < self._header_height():
+            column = self.identify_column(event.x)
+            if column != "":
+                command = self._headings[self._column_id(column)]["command"]
+                if callable(command):
+                    command()
+            return
+        iid = self.identify_row(event.y)
+        if iid == "":
+            return
+        self._focus = iid
+        if self.identify_element(event.x, event.y) == "Treeitem.indicator":
+            self._toggle(iid)
+
+    def column(self, cid, option=None, **kw):
+        """Query or set the options of a column, as for ttk.Treeview."""
+        options = self._column_options[self._column_id(cid)]
+        if option is not None:
+            return options[option]
+        if len(kw) == 0:
+            return dict(options)
+        options.update(kw)
+        self._resize()
+        self.redraw()
+
+    def _column_id(self, cid):
+        """The identifier of a column given its identifier, index or #n."""
+        if isinstance(cid, int):
+            return self._columns[cid]
+        if cid.startswith("#") and cid != "#0":
+            return self._display_columns()[int(cid[1:]) - 1]
+        return cid
+
+    def config(self, **kwargs):
+        """Configure the options of the widget, as for ttk.Treeview."""
+        if "columns" in kwargs:
+            columns = kwargs.pop("columns")
+            if isinstance(columns, str):
+                columns = columns.split()
+            self._columns = list(columns)
+            for cid in ("#0", *self._columns):
+                self._column_options.setdefault(
+                    cid,
+                    {
+                        "anchor": tk.W,
+                        "id": cid,
+                        "minwidth": 20,
+                        "stretch": True,
+                        "width": 200,
+                    },
+                )
+                self._headings.setdefault(
+                    cid, {"anchor": tk.W, "command": "", "image": "", "text": ""}
+                )
+            self._resize()
+            self.redraw()
+        if "displaycolumns" in kwargs:
+            self._displaycolumns = kwargs.pop("displaycolumns")
+            self._resize()
+            self.redraw()
+        if "show" in kwargs:
+            show = kwargs.pop("show")
+            self._show = tuple(show.split() if isinstance(show, str) else show)
+            self._resize()
+            self.redraw()
+        if "height" in kwargs:
+            self._height = int(kwargs.pop("height"))
+            self._resize()
+        if "cursor" in kwargs:
+            self.canvas.config(cursor=kwargs.pop("cursor"))
+        if "xscrollcommand" in kwargs:
+            self.canvas.config(xscrollcommand=kwargs.pop("xscrollcommand"))
+        if "yscrollcommand" in kwargs:
+            self._yscrollcommand = kwargs.pop("yscrollcommand")
+        for key in ("padding", "selectmode", "style", "takefocus"):
+            kwargs.pop(key, None)
+        if len(kwargs) > 0:
+            super().config(**kwargs)
+
+    configure = config
+
+    def delete(self, *items):
+        """Note that items were deleted from the model."""
+        self.refresh()
+
+    def destroy(self):
+        """Cancel any pending redraw, then destroy the widget."""
+        if self._redraw_id is not None:
+            self.after_cancel(self._redraw_id)
+            self._redraw_id = None
+        super().destroy()
+
+    def detach(self, *items):
+        """Note that items were detached in the model."""
+        self.refresh()
+
+    def _display_columns(self):
+        """The identifiers of the columns that are displayed, in order."""
+        if self._displaycolumns in ("#all", ("#all",)):
+            return self._columns
+        return [self._column_id(cid) for cid in self._displaycolumns]
+
+    def _double_click_cb(self, event):
+        """Open or close a branch when it is double-clicked."""
+        iid = self.identify_row(event.y)
+        if iid != "" and self.identify_element(event.x, event.y) != "image":
+            self._toggle(iid)
+
+    def _draw(self):
+        """Draw the rows that are in view, and the headings."""
+        self._redraw_id = None
+        if self._stale:
+            self._layout()
+        canvas = self.canvas
+        canvas.delete("all")
+
+        rowheight = self.rowheight
+        header = self._header_height()
+        page = self._page()
+        self._top = max(0, min(self._top, len(self._rows) - page))
+        columns = self._layout_columns()
+        width = max(self._total_width(), canvas.winfo_width())
+        height = canvas.winfo_height()
+        canvas.config(scrollregion=(0, 0, self._total_width(), height))
+
+        y = header
+        for node, depth in self._rows[self._top : self._top + page + 1]:
+            tags = self._tags(node)
+            options = {}
+            for tag in tags:
+                options.update(self._tag_options.get(tag, {}))
+            if options.get("background", "") != "":
+                canvas.create_rectangle(
+                    0, y, width, y + rowheight, fill=options["background"], width=0
+                )
+            font = options.get("font", "") or self.font
+            fill = options.get("foreground", "") or self.foreground
+            middle = y + rowheight // 2
+            for cid, x, column_width in columns:
+                if cid == "#0":
+                    x += depth * self.indent
+                    if len(self._children(node)) > 0:
+                        if node.open:
+                            points = (x + 5, middle - 3, x + 13, middle - 3, x + 9)
+                            points += (middle + 3,)
+                        else:
+                            points = (x + 6, middle - 4, x + 6, middle + 4, x + 12)
+                            points += (middle,)
+                        canvas.create_polygon(*points, fill=fill)
+                    x += self.indent
+                    image = self._image(node)
+                    canvas.create_image(x, middle, image=image, anchor=tk.W)
+                    x += image.width() + 4
+                    text = node.text
+                    column_width -= x - columns[0][1]
+                    anchor = tk.W
+                else:
+                    index = self._columns.index(cid)
+                    text = node.values[index] if index < len(node.values) else ""
+                    anchor = self._column_options[cid]["anchor"]
+                self._draw_text(x, middle, column_width, str(text), anchor, font, fill)
+            y += rowheight
+
+        if header > 0:
+            for cid, x, column_width in columns:
+                canvas.create_rectangle(
+                    x,
+                    0,
+                    x + column_width,
+                    header,
+                    fill=self.heading_background,
+                    outline="gray60",
+                )
+                options = self._headings[cid]
+                self._draw_text(
+                    x,
+                    header // 2,
+                    column_width,
+                    options["text"],
+                    options["anchor"],
+                    self.heading_font,
+                    self.foreground,
+                )
+
+        if self._yscrollcommand is not None:
+            self._yscrollcommand(*self.yview())
+
+    def _draw_text(self, x, y, width, text, anchor, font, fill):
+        """Draw text in a cell of the given width, cutting it short if too long."""
+        if text == "" or width < 8:
+            return
+        if font.measure(text) > width - 8:
+            while len(text) > 0 and font.measure(text + "…") > width - 8:
+                text = text[:-1]
+            text += "…"
+        if anchor == tk.CENTER:
+            x += width // 2
+        elif anchor in (tk.E, tk.NE, tk.SE):
+            x += width - 4
+            anchor = tk.E
+        else:
+            x += 4
+            anchor = tk.W
+        self.canvas.create_text(x, y, text=text, anchor=anchor, font=font, fill=fill)
+
+    def focus(self, iid=None):
+        """Get the iid of the item with the focus, or give the focus to an item."""
+        if iid is None:
+            return self._focus
+        self._focus = iid
+
+    def _header_height(self):
+        """The height of the headings, or 0 if they are not shown."""
+        if "headings" not in self._show:
+            return 0
+        return self.rowheight + 4
+
+    def heading(self, cid, option=None, **kw):
+        """Query or set the options of the heading of a column, as for
+        ttk.Treeview."""
+        options = self._headings[self._column_id(cid)]
+        if option is not None:
+            return options[option]
+        if len(kw) == 0:
+            return dict(options)
+        options.update(kw)
+        self.redraw()
+
+    def identify_column(self, x):
+        """The column, as #n, at the x coordinate, or an empty string."""
+        x = self.canvas.canvasx(x)
+        displayed = self._display_columns()
+        for cid, start, width in self._layout_columns():
+            if start <= x < start + width:
+                return "#0" if cid == "#0" else f"#{displayed.index(cid) + 1}"
+        return ""
+
+    def identify_element(self, x, y):
+        """The element of the item at x, y: "Treeitem.indicator", "image" or "text",
+        or an empty string."""
+        iid = self.identify_row(y)
+        column = self.identify_column(x)
+        if iid == "" or column == "":
+            return ""
+        if column != "#0":
+            return "text"
+        node = self._model[iid]
+        x = self.canvas.canvasx(x) - self._layout_columns()[0][1]
+        x -= self._row_depth(node) * self.indent
+        if x < 0:
+            return ""
+        if x < self.indent:
+            return "Treeitem.indicator" if len(self._children(node)) > 0 else ""
+        if x < self.indent + self._image(node).width():
+            return "image"
+        return "text"
+
+    def identify_region(self, x, y):
+        """The region at x, y: "heading", "tree", "cell" or "nothing"."""
+        if y < self._header_height():
+            return "heading" if self.identify_column(x) != "" else "nothing"
+        if self.identify_row(y) == "":
+            return "nothing"
+        column = self.identify_column(x)
+        if column == "":
+            return "nothing"
+        return "tree" if column == "#0" else "cell"
+
+    def identify_row(self, y):
+        """The iid of the item at the y coordinate, or an empty string."""
+        if self._stale:
+            self._layout()
+        y -= self._header_height()
+        if y < 0:
+            return ""
+        row = self._top + y // self.rowheight
+        if row < len(self._rows):
+            return self._rows[row][0].iid
+        return ""
+
+    def item(self, iid, option=None, **kw):
+        """Query the options of an item, or note that they changed in the model."""
+        node = self._model[iid]
+        if len(kw) > 0:
+            if "open" in kw:
+                self.refresh()
+            else:
+                self.redraw()
+            return
+        result = {
+            "image": str(self._image(node)),
+            "open": node.open,
+            "tags": self._tags(node),
+            "text": node.text,
+            "values": node.values,
+        }
+        if option is not None:
+            return result[option]
+        return result
+
+    def _layout(self):
+        """Work out the rows that can be seen, i.e. that are in open branches."""
+        rows = []
+        stack = [(child, 0) for child in reversed(self._children(self._model.root))]
+        while len(stack) > 0:
+            node, depth = stack.pop()
+            rows.append((node, depth))
+            if node.open:
+                children = self._children(node)
+                stack.extend((child, depth + 1) for child in reversed(children))
+        self._rows = rows
+        self._row_of = None
+        self._stale = False
+
+    def _layout_columns(self):
+        """The identifier, x position and width of the displayed columns."""
+        result = []
+        x = 0
+        if "tree" in self._show:
+            width = self._column_options["#0"]["width"]
+            result.append(("#0", x, width))
+            x += width
+        for cid in self._display_columns():
+            width = self._column_options[cid]["width"]
+            result.append((cid, x, width))
+            x += width
+        return result
+
+    def move(self, item, parent, index):
+        """Note that an item was moved in the model."""
+        self.refresh()
+
+    def _page(self):
+        """The number of whole rows that fit in the window."""
+        height = self.canvas.winfo_height()
+        if height <= 1:
+            return self._height
+        return max(1, (height - self._header_height()) // self.rowheight)
+
+    def redraw(self):
+        """Redraw the rows in view once Tk is idle."""
+        if self._redraw_id is None:
+            self._redraw_id = self.after_idle(self._draw)
+
+    def refresh(self):
+        """Note that the structure of the tree or the items shown have changed, and
+        redraw."""
+        self._stale = True
+        self.redraw()
+
+    def _resize(self):
+        """Set the requested size of the canvas from the columns and height."""
+        self.canvas.config(
+            width=self._total_width(),
+            height=self._header_height() + self._height * self.rowheight,
+        )
+
+    def _row(self, node):
+        """The row of an item, or None if it is not in an open branch."""
+        if self._stale:
+            self._layout()
+        if self._row_of is None:
+            self._row_of = {node: row for row, (node, _) in enumerate(self._rows)}
+        return self._row_of.get(node)
+
+    def _row_depth(self, node):
+        """The depth of an item that is in a row."""
+        return self._rows[self._row(node)][1]
+
+    def see(self, iid):
+        """Scroll so that the item is in view. Its ancestors should already be open
+        in the model."""
+        self._stale = True
+        row = self._row(self._model[iid])
+        if row is None:
+            return
+        page = self._page()
+        if row < self._top:
+            self._top = row
+        elif row >= self._top + page:
+            self._top = row - page + 1
+        self.redraw()
+
+    def set(self, iid, column=None, value=None):
+        """Query or set the values of an item in the columns, as for
+        ttk.Treeview."""
+        node = self._model[iid]
+        values = [*node.values]
+        if column is None:
+            return {
+                cid: values[i] if i < len(values) else ""
+                for i, cid in enumerate(self._columns)
+            }
+        index = self._columns.index(self._column_id(column))
+        if value is None:
+            return values[index] if index < len(values) else ""
+        values.extend([""] * (index + 1 - len(values)))
+        values[index] = value
+        node.values = tuple(values)
+        self.redraw()
+
+    def tag_bind(self, tagName, sequence=None, callback=None):
+        """Bind a callback to an event on the items with a tag."""
+        if sequence not in {key[1] for key in self._tag_bindings}:
+            self.canvas.bind(
+                sequence,
+                lambda event, sequence=sequence: self._tag_cb(sequence, event),
+                add="+",
+            )
+        self._tag_bindings[(tagName, sequence)] = callback
+
+    def _tag_cb(self, sequence, event):
+        """Call the callbacks bound to the tags of the item under the pointer."""
+        iid = self.identify_row(event.y)
+        if iid == "":
+            return
+        for tag in self._tags(self._model[iid]):
+            callback = self._tag_bindings.get((tag, sequence))
+            if callback is not None:
+                callback(event)
+
+    def tag_configure(self, tagName, option=None, **kw):
+        """Query or set the options for the items with a tag: background, font and
+        foreground."""
+        options = self._tag_options.setdefault(tagName, {})
+        if option is not None:
+            return options.get(option, "")
+        if len(kw) == 0:
+            return dict(options)
+        options.update(kw)
+        self.redraw()
+
+    def _toggle(self, iid):
+        """Open or close a branch, as the user asked."""
+        node = self._model[iid]
+        if len(self._children(node)) == 0:
+            return
+        self._focus = iid
+        node.open = not node.open
+        self.event_generate("<<TreeviewOpen>>" if node.open else "<<TreeviewClose>>")
+        self.refresh()
+
+    def _total_width(self):
+        """The total width of the displayed columns."""
+        return sum(width for _, _, width in self._layout_columns())
+
+    def xview(self, *args):
+        """Query or change the horizontal position of the view."""
+        return self.canvas.xview(*args)
+
+    def yview(self, *args):
+        """Query or change the vertical position of the view, in rows."""
+        n_rows = len(self._rows)
+        if len(args) == 0:
+            if n_rows == 0:
+                return (0.0, 1.0)
+            return (self._top / n_rows, min(1.0, (self._top + self._page()) / n_rows))
+        if args[0] == "moveto":
+            self._top = int(float(args[1]) * n_rows + 0.5)
+        elif args[0] == "scroll":
+            n = int(args[1])
+            if args[2] == "pages":
+                n *= max(1, self._page() - 1)
+            self._top += n
+        self._top = max(0, min(self._top, n_rows - self._page()))
+        self.redraw()
+
+
+class CanvasCheckTree(CheckTree):
+    """A CheckTree that draws only the rows in view on a canvas.
+
+    The items are held only in the Python model, so very large trees can be shown
+    without creating an item in Tk for each one. The API is the same as CheckTree,
+    though the lazy option has no effect since no items are created in Tk.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        sw.MousewheelSupport(self).add_support_to(
+            self.tree, xscrollbar=self.x_scrollbar, yscrollbar=self.y_scrollbar
+        )
+
+    def bbox(self, item, column=None):
+        """Return the bounding box for the item, as for CheckTree."""
+        return self.tree.bbox(item, column=column)
+
+    def clear_filter(self):
+        """Remove any filter, putting all the items back in their original order."""
+        super().clear_filter()
+        self.tree.refresh()
+
+    def _create_tree(self):
+        """Create the widget that displays the items."""
+        return CanvasTree(
+            self.frame,
+            self._model,
+            children=self._shown_children,
+            image=lambda node: self._images[node.state],
+            tags=self._tags,
+            columns=self._columns,
+        )
+
+    def _filter_children(self, nodes):
+        """Redraw the tree to show the items that match the filter."""
+        self.tree.refresh()
+
+    def _insert_items(self, nodes, index="end"):
+        """Redraw the tree to show new items."""
+        self.tree.refresh()
+
+    def move(self, iid, parent, index):
+        """Move the item to the position index under the item parent, as for
+        CheckTree."""
+        super().move(iid, parent, index)
+        self.tree.refresh()
+
+    def _populate(self, node):
+        """Redraw the tree when a branch is opened."""
+        self.tree.refresh()
+
+    def _show(self, iid):
+        """Check that the item is in the tree, i.e. not detached.
+
+        Parameters
+        ----------
+        iid : str
+            The item.
+        """
+        node = self._model[iid]
+        while node.parent is not None:
+            node = node.parent
+        if node is not self._model.root:
+            raise tk.TclError(f"Item {iid} is detached and not in the tree")
+
+    def _shown_children(self, node):
+        """The children of an item that are shown, allowing for any filter."""
+        if self._visible is None:
+            return node.children
+        return [child for child in node.children if child in self._visible]
+
+    def _update_items(self):
+        """Redraw the tree after the state of items changed."""
+        self._notify_later()
+        if len(self._model.dirty) > 0:
+            self._model.dirty.clear()
+            self.tree.redraw()
+
+    def _update_placeholder(self, node):
+        """Redraw the tree after the children of an item changed."""
+        self.tree.refresh()
@@ -2,14 +2,17 @@
 
 """A Tk widget for a tree of checkboxes."""
 
+import base64
 import logging
-import importlib
 import tkinter as tk
 from tkinter import ttk
-
-from PIL import ImageTk, Image
+import zlib
 
 import seamm_widgets as sw
+from seamm_widgets.check_tree_model import CheckTreeModel
+from seamm_widgets.images import get_image
+from seamm_widgets.tcl_script import for_each
+from seamm_widgets.text_index import TextIndex
 
 logger = logging.getLogger(__name__)
 
@@ -28,24 +31,59 @@ options = {
 
 
 class CheckTree(sw.LabeledWidget):
-    """Class to provide a tree of checkboxes."""
-
-    def __init__(self, parent, *args, columns=[], **kwargs):
+    """Class to provide a tree of checkboxes.
+
+    The state of the items is kept in a Python model of the tree, which updates the
+    state of branches incrementally as items are checked or unchecked. Only the items
+    whose state changed are updated in the Treeview, all at once in a single call to
+    Tk.
+
+    With lazy=True, the children of closed branches are kept only in the model, with a
+    placeholder child in the Treeview so that the branch can be opened. The items are
+    created in the Treeview when the branch is first opened, or when an item is
+    otherwise needed, e.g. by see(). Their state is still tracked, and methods such as
+    get() and get_leaves() include them.
+
+    The items can be filtered by their text and column values with filter(), which
+    uses an index of the text so that it is fast enough to call as the user types.
+    Items that do not match are detached from the Treeview, but remain in the model so
+    their state is kept, and clear_filter() puts them back in their original order.
+
+    When items are checked or unchecked, or checked items are added or removed, the
+    widget generates a single <<CheckTreeChanged>> event once Tk is idle, however many
+    items changed. The iids of the leaves added to and removed from the selection are
+    available from the changes property, and are also passed to the command, if any,
+    so listeners can update incrementally rather than calling get() again.
+
+    The selection can be saved with snapshot() and put back with restore(), which sets
+    the state of all the items in one pass.
+    """
+
+    def __init__(self, parent, *args, columns=[], lazy=False, command=None, **kwargs):
         class_ = kwargs.pop("class_", "MCheckTree")
         super().__init__(parent, class_=class_)
 
         self.frame = self.interior
         self._columns = columns
-
-        self.tree = ttk.Treeview(
-            self.frame,
-            selectmode="none",
-            columns=self._columns,
-        )
+        self._lazy = lazy
+        self._model = CheckTreeModel()
+        self._placeholders = set()
+        self._next_iid = 0
+        self._index = None
+        self._filter = None
+        self._visible = None
+        self._filtered = set()
+        self._command = command
+        self._changes = (set(), set())
+        self._notify_id = None
+
+        self.tree = self._create_tree()
         for column in self._columns:
             self.tree.heading(column, text=column)
 
         self.tree.tag_bind("_node_", "<Button-1>", self._click_cb)
+        self.tree.bind("<<TreeviewOpen>>", self._open_cb)
+        self.tree.bind("<<TreeviewClose>>", self._close_cb)
 
         self.x_scrollbar = ttk.Scrollbar(
             self.frame, orient=tk.HORIZONTAL, command=self.tree.xview
@@ -62,11 +100,15 @@ class CheckTree(sw.LabeledWidget):
         self.frame.rowconfigure(0, weight=1)
         self.frame.columnconfigure(0, weight=1)
 
-        path = importlib.resources.files("seamm_widgets") / "data"
-
-        self.checked_image = ImageTk.PhotoImage(Image.open(path / "checked.png"))
-        self.unchecked_image = ImageTk.PhotoImage(Image.open(path / "unchecked.png"))
-        self.mixed_image = ImageTk.PhotoImage(Image.open(path / "mixed.png"))
+        # The images are shared by all the CheckTrees
+        self.checked_image = get_image("checked.png", self)
+        self.unchecked_image = get_image("unchecked.png", self)
+        self.mixed_image = get_image("mixed.png", self)
+        self._images = {
+            "checked": self.checked_image,
+            "unchecked": self.unchecked_image,
+            "mixed": self.mixed_image,
+        }
 
         self.config(**kwargs)
 
@@ -84,6 +126,8 @@ class CheckTree(sw.LabeledWidget):
         use column=C where C is either the integer index of the column or its column
         identifier.
         """
+        if not self._model[item].shown:
+            return ""
         return self.tree.bbox(item, column=column)
 
     def column(self, cid, option=None, **kw):
@@ -123,6 +167,22 @@ class CheckTree(sw.LabeledWidget):
         """
         return self.tree.column(cid, option=option, **kw)
 
+    @property
+    def changes(self):
+        """The iids of the leaves added to and removed from the selection, as
+        reported by the last <<CheckTreeChanged>> event."""
+        return self._changes
+
+    @property
+    def command(self):
+        """A command to call with the sets of iids of the leaves added to and
+        removed from the selection, when the selection changes."""
+        return self._command
+
+    @command.setter
+    def command(self, value):
+        self._command = value
+
     def config(self, **kwargs):
         """Set the configuration of the megawidget"""
 
@@ -143,20 +203,38 @@ class CheckTree(sw.LabeledWidget):
         """Alias for config()"""
         return self.config(**kwargs)
 
-    def _check_parents(self, iid):
-        """Correct the state of all parents up the tree to make their state correct.
+    def count_checked(self, parent=""):
+        """The number of selected leaves.
 
         Parameters
         ----------
-        iid : str
-            The item to start with.
+        parent : str = ""
+            Count the selected leaves below the parent. Defaults to the entire tree.
+
+        Returns
+        -------
+        int
         """
-        parent = self.tree.parent(iid)
-        logger.debug(f"{iid=} {parent=}")
-        if parent == "":
-            self.state(iid)
-        else:
-            self._check_parents(parent)
+        return self._model.count_checked(parent)
+
+    def clear_filter(self):
+        """Remove any filter, putting all the items back in their original order."""
+        if self._filter is None:
+            return
+        nodes = self._model.nodes
+        for_each(
+            self.tree,
+            "iid children",
+            "$w children $iid $children",
+            [
+                (node.iid, [child.iid for child in node.children])
+                for node in self._filtered
+                if nodes.get(node.iid) is node and node.shown and node.populated
+            ],
+        )
+        self._filter = None
+        self._visible = None
+        self._filtered = set()
 
     def _click_cb(self, event):
         iid = self.tree.identify_row(event.y)
@@ -165,16 +243,49 @@ class CheckTree(sw.LabeledWidget):
 
         logger.info(f"_click_cb, {iid=} {element=}")
 
-        if element in ("image", "text"):
+        if element in ("image", "text") and iid in self._model:
             self.invoke(iid)
 
+    def _close_cb(self, event):
+        """Note that the user closed a branch."""
+        iid = self.tree.focus()
+        if iid in self._model:
+            self._model[iid].open = False
+
+    def _create_tree(self):
+        """Create the widget that displays the items."""
+        return ttk.Treeview(self.frame, selectmode="none", columns=self._columns)
+
     def delete(self, *items):
         """The arguments are iid values. All the items in the widget that have matching
         iid values are destroyed, along with all their descendants.
         """
-        return self.tree.delete(*items)
+        for iid in items:
+            if iid not in self._model:
+                raise tk.TclError(f"Item {iid} not found")
+        for iid in items:
+            self._unfilter(self._model[iid])
+        result = self.tree.delete(*[iid for iid in items if self._model[iid].shown])
+        removed = []
+        for iid in items:
+            if iid in self._model:
+                parent = self._model[iid].parent
+                for node in self._model.remove(iid):
+                    self._placeholders.discard(node.iid)
+                    removed.append(node)
+                self._update_placeholder(parent)
+        self._update_items()
+        self._update_filter(removed=removed)
+        return result
+
+    def destroy(self):
+        """Cancel any pending notification of changes, then destroy the widget."""
+        if self._notify_id is not None:
+            self.after_cancel(self._notify_id)
+            self._notify_id = None
+        super().destroy()
 
-    def _deselect(self, iid, recursive=True, check_parents=True):
+    def _deselect(self, iid, recursive=True):
         """Change the state of the item 'iid' to unchecked.
 
         Parameters
@@ -182,28 +293,9 @@ class CheckTree(sw.LabeledWidget):
         iid : str
             The unique id of the item in the tree.
         recursive : bool
-            Whether to select all children
-        check_parents: bool
-            Whether to set the state of parents
-
-        Returns
-        -------
-        any
-            The return from any command invoked by changing the state.
+            Whether to deselect all children
         """
-        tags = [*self.tree.item(iid, "tags")]
-        if "checked" in tags:
-            tags.remove("checked")
-        self.tree.item(iid, image=self.unchecked_image, tags=tags)
-
-        # If this is a branch node, i.e. it has children, change them too
-        if recursive:
-            children = self.tree.get_children(iid)
-            for child in children:
-                self._deselect(child, recursive=True)
-
-        if check_parents:
-            self._check_parents(iid)
+        self._model.set_checked(iid, False, recursive=recursive)
 
     def detach(self, *items):
         """The arguments are iid values. All the items in the widget that have matching
@@ -213,7 +305,14 @@ class CheckTree(sw.LabeledWidget):
         The items are not destroyed. You may reattach them to the visible tree using the
         .move() method described below.
         """
-        return self.tree.detach(*items)
+        result = self.tree.detach(*[iid for iid in items if self._model[iid].shown])
+        for iid in items:
+            parent = self._model[iid].parent
+            self._model.detach(iid)
+            self._update_placeholder(parent)
+        self._update_items()
+        self._update_filter()
+        return result
 
     def exists(self, iid):
         """Returns True if there exists an item in the widget with the given iid, or
@@ -221,43 +320,126 @@ class CheckTree(sw.LabeledWidget):
         the .detach() method, it is still considered to exist for the purposes of the
         .exists() method.
         """
-        return self.tree.exists(iid)
+        return iid in self._model and iid != ""
 
-    def from_dict(self, parent, metadata):
-        for key, value in metadata.items():
-            # Get any data in the columns
-            column_data = []
-            for column in self._columns:
-                tmp = ""
-                for column_name in value.keys():
-                    if column_name.lower() == column.lower():
-                        tmp = value[column_name]
-                        break
-                column_data.append(tmp)
-
-            tags = ["_node_", key]
-            checked = value.get("checked", False)
-            if checked:
-                tags.append("checked")
-
-            self.tree.insert(
-                parent,
-                "end",
-                iid=key,
-                text=key,
-                image=self.checked_image if checked else self.unchecked_image,
-                tag=tags,
-                open="open" in value and value["open"],
-                values=column_data,
+    def filter(self, text):
+        """Show only the items whose text or column values contain the given text,
+        ignoring case, along with their ancestors and, for branches, their descendants.
+
+        The other items are detached from the Treeview but keep their state, and are
+        still included by e.g. get(). Calling filter() again replaces the filter, and
+        when the text is extended only the items that matched before are checked.
+
+        Parameters
+        ----------
+        text : str
+            The text to search for. An empty string removes the filter.
+        """
+        if text == "":
+            self.clear_filter()
+            return
+        if self._index is None:
+            self._index = TextIndex(
+                (node.iid, self._search_text(node))
+                for node in self._model.nodes.values()
+                if node is not self._model.root
             )
-            # Recurse if a branch node
-            if "items" in value:
-                self.from_dict(key, value["items"])
+        self._filter = text
+
+        visible = {self._model.root}
+        for iid in self._index.search(text):
+            node = self._model[iid]
+            ancestors = []
+            ancestor = node.parent
+            while ancestor is not None and ancestor not in visible:
+                ancestors.append(ancestor)
+                ancestor = ancestor.parent
+            if ancestor is None:
+                # Detached from the tree
+                continue
+            visible.update(ancestors)
+            stack = [node]
+            while len(stack) > 0:
+                node = stack.pop()
+                visible.add(node)
+                stack.extend(node.children)
+
+        # Only branches visible before or now can have changed children.
+        previous = self._visible
+        self._visible = visible
+        self._filter_children(visible if previous is None else visible | previous)
+
+    def _filter_children(self, nodes):
+        """Set the children of branches in the Treeview to their visible children.
+
+        Parameters
+        ----------
+        nodes : iterable of Node
+            The branches to update. Any that are not populated in the Treeview are
+            skipped.
+        """
+        visible = self._visible
+        branches = [
+            node
+            for node in nodes
+            if len(node.children) > 0
+            and node.shown
+            and node.populated
+            and self._model.nodes.get(node.iid) is node
+        ]
+        self._filtered.update(branches)
+        for_each(
+            self.tree,
+            "iid children",
+            "$w children $iid $children",
+            [
+                (node.iid, [child.iid for child in node.children if child in visible])
+                for node in branches
+            ],
+        )
+
+    def _flatten(self, parent, metadata):
+        """Flatten nested metadata into a list of items in tree order.
 
-        # Set the state of intermediate nodes
-        children = self.tree.get_children("")
-        for child in children:
-            self.state(child)
+        Parameters
+        ----------
+        parent : str
+            The iid of the item that the metadata is added to.
+        metadata : dict(str: dict)
+            The nested description of the items, as for `load`.
+
+        Returns
+        -------
+        [(str, str, dict, [str])]
+            The parent iid, iid, metadata and column values of each item.
+        """
+        columns = [column.lower() for column in self._columns]
+        result = []
+        stack = [(parent, iter(metadata.items()))]
+        while len(stack) > 0:
+            parent, items = stack[-1]
+            for key, value in items:
+                # Get any data in the columns, using the first matching key
+                if len(columns) > 0:
+                    lowered = {k.lower(): v for k, v in reversed(value.items())}
+                    column_data = [lowered.get(column, "") for column in columns]
+                else:
+                    column_data = []
+                result.append((parent, key, value, column_data))
+                # Descend into a branch node
+                if "items" in value:
+                    stack.append((key, iter(value["items"].items())))
+                    break
+            else:
+                stack.pop()
+        return result
+
+    def from_dict(self, parent, metadata):
+        """Add the items in a nested dictionary to the tree.
+
+        This is the same as `load(metadata, parent=parent)`.
+        """
+        self.load(metadata, parent=parent)
 
     def focus(self, iid=None):
         """If you don't provide an argument to this method, you get back either the iid
@@ -265,11 +447,16 @@ class CheckTree(sw.LabeledWidget):
 
         You can give focus to an item by passing its iid as the argument to this method.
         """
+        if iid is not None:
+            self._show(iid)
         return self.tree.focus(iid)
 
     def get(self, parent="", as_dict=False):
         """Get the selected items.
 
+        The selected leaves are tracked as they are checked and unchecked, so the cost
+        depends on the number of selected items rather than the size of the tree.
+
         Parameters
         ----------
         parent : str = ""
@@ -281,23 +468,23 @@ class CheckTree(sw.LabeledWidget):
         -------
         [str] or dict(str: str|dict(str: str|dict(...)
         """
-        if as_dict:
-            result = {"selected": [], "children": {}}
-        else:
-            result = []
-        for child in self.get_children(parent):
-            if len(self.get_children(child)) > 0:
-                if as_dict:
-                    result["children"][child] = self.get(parent=child, as_dict=as_dict)
-                else:
-                    result.extend(self.get(parent=child))
-            else:
-                tags = self.item(child, "tags")
-                if "checked" in tags:
-                    if as_dict:
-                        result["selected"].append(child)
-                    else:
-                        result.append(child)
+        leaves = self._model.checked_leaves(parent)
+        if not as_dict:
+            return [leaf.iid for leaf in leaves]
+
+        result = {"selected": [], "children": {}}
+        results = {parent: result}
+        stack = [parent]
+        while len(stack) > 0:
+            iid = stack.pop()
+            for branch in self._model.branches(iid):
+                results[iid]["children"][branch.iid] = results[branch.iid] = {
+                    "selected": [],
+                    "children": {},
+                }
+                stack.append(branch.iid)
+        for leaf in leaves:
+            results[leaf.parent.iid]["selected"].append(leaf.iid)
         return result
 
     def get_children(self, item=None):
@@ -305,20 +492,25 @@ class CheckTree(sw.LabeledWidget):
         the item argument. If the argument is omitted, you get a tuple containing the
         iid values of the top-level items.
         """
-        return self.tree.get_children(item)
+        if item is None:
+            item = ""
+        return tuple(child.iid for child in self._model[item].children)
 
     def get_leaves(self, item=None):
         """Returns the iid values of all leaves of the tree belove of the item specified
         by the item argument. If the argument is omitted, it gives the leaves for the
         entire tree.
         """
+        if item is None:
+            item = ""
         leaves = []
-        for child in self.tree.get_children(item):
-            children = self.tree.get_children(child)
-            if len(children) > 0:
-                leaves.extend(self.get_leaves(child))
+        stack = [*reversed(self._model[item].children)]
+        while len(stack) > 0:
+            node = stack.pop()
+            if len(node.children) > 0:
+                stack.extend(reversed(node.children))
             else:
-                leaves.append(child)
+                leaves.append(node.iid)
         return leaves
 
     def heading(self, cid, option=None, **kw):
@@ -352,6 +544,25 @@ class CheckTree(sw.LabeledWidget):
         """
         return self.tree.heading(cid, option=option, **kw)
 
+    def _hide(self, node):
+        """Remove an item and its descendants from the Treeview, keeping them in the
+        model.
+
+        Parameters
+        ----------
+        node : Node
+            The item to hide.
+        """
+        self._unfilter(node)
+        self.tree.delete(node.iid)
+        stack = [node]
+        while len(stack) > 0:
+            node = stack.pop()
+            node.shown = False
+            node.populated = False
+            self._placeholders.discard(node.iid)
+            stack.extend(node.children)
+
     def identify_column(self, x):
         """Given an x coordinate, this method returns a string of the form '#n' that
         identifies the column that contains that x coordinate.
@@ -405,7 +616,10 @@ class CheckTree(sw.LabeledWidget):
         """This method returns the index of the item with the specified iid relative to
         its parent, counting from zero.
         """
-        return self.tree.index(iid)
+        node = self._model[iid]
+        if node.parent is None:
+            return 0
+        return node.parent.children.index(node)
 
     def insert(
         self,
@@ -459,27 +673,87 @@ class CheckTree(sw.LabeledWidget):
             supplied, the remaining columns will be blank in this item; if too many
             values are supplied, the extras will be discarded.
         """
-        tmp_tags = [*tags]
+        if isinstance(tags, str):
+            tags = tags.split()
+        tmp_tags = [t for t in tags if t not in ("checked", "mixed")]
         if "_node_" not in tmp_tags:
             tmp_tags.append("_node_")
 
-        iid = self.tree.insert(
+        if iid is None:
+            iid = self._new_iid()
+        node = self._model.add(
             parent,
             index,
-            iid=iid,
-            open=open,
+            iid,
+            checked=selected,
             tags=tmp_tags,
             text=text,
             values=values,
-            image=self.checked_image if selected else self.unchecked_image,
+            open=open,
         )
 
-        if selected:
-            self.selection_add(iid)
+        parent_node = node.parent
+        if parent_node.shown and parent_node.populated:
+            self._insert_items([node], index=index)
+        else:
+            self._update_placeholder(parent_node)
+
         if state:
-            self.state()
+            self._update_items()
+        else:
+            self._notify_later()
+        self._update_filter(changed=[node])
         return iid
 
+    def _insert_items(self, nodes, index="end"):
+        """Insert items in the Treeview, with any of their descendants that should
+        be shown.
+
+        In a lazy tree, only the descendants of open branches are inserted, and closed
+        branches are given a placeholder child so that they can be opened.
+
+        Parameters
+        ----------
+        nodes : [Node]
+            The items to insert, in order, after any items already in the Treeview.
+        index : int or "end"
+            The position of the first item among the children of its parent.
+        """
+        rows = []
+        stack = [*reversed(nodes)]
+        while len(stack) > 0:
+            node = stack.pop()
+            node.shown = True
+            rows.append(
+                (
+                    node.parent.iid,
+                    index,
+                    node.iid,
+                    node.text,
+                    self._images[node.state],
+                    self._tags(node),
+                    node.open,
+                    node.values,
+                )
+            )
+            index = "end"
+            if len(node.children) > 0 and self._lazy and not node.open:
+                node.populated = False
+                rows.append(
+                    (node.iid, "end", self._placeholder(node.iid), "", "", "", 0, "")
+                )
+                self._placeholders.add(node.iid)
+            else:
+                node.populated = True
+                stack.extend(reversed(node.children))
+        for_each(
+            self.tree,
+            "parent index iid text image tags open values",
+            "$w insert $parent $index -id $iid -text $text -image $image -tags $tags"
+            " -open $open -values $values",
+            rows,
+        )
+
     def invoke(self, iid, recursive=True):
         """Change the state of the item 'iid' just as if clicked.
 
@@ -495,11 +769,11 @@ class CheckTree(sw.LabeledWidget):
         any
             The return from any command invoked by changing the state.
         """
-        tags = [*self.tree.item(iid, "tags")]
-        if "checked" in tags:
+        if self._model[iid].state == "checked":
             self._deselect(iid, recursive=recursive)
         else:
             self._select(iid, recursive=recursive)
+        self._update_items()
 
     def item(self, iid, option=None, **kw):
         """Use this method to set or retrieve the options within the item specified by
@@ -510,14 +784,113 @@ class CheckTree(sw.LabeledWidget):
         value of a given option, pass the option's name as its second argument. To set
         one or more options, pass them as keyword arguments to the method.
         """
+        self._show(iid)
+        node = self._model[iid]
+        if "text" in kw:
+            node.text = kw["text"]
+        if "values" in kw:
+            node.values = kw["values"]
+        if "text" in kw or "values" in kw:
+            self._update_filter(changed=[node])
+        if "open" in kw:
+            node.open = bool(kw["open"])
+            if node.open:
+                self._populate(node)
+        if "tags" in kw:
+            tags = kw["tags"]
+            if isinstance(tags, str):
+                tags = tags.split()
+            tags = [t for t in tags if t not in ("checked", "mixed")]
+            if "_node_" not in tags:
+                tags.append("_node_")
+            node.tags = tuple(tags)
+            kw["tags"] = self._tags(node)
         return self.tree.item(iid, option=option, **kw)
 
+    def load(self, metadata, parent=""):
+        """Add the items in a nested dictionary to the tree in one batch.
+
+        The dictionary is keyed by the iid of the items, which is also used as their
+        text. The value for each item is a dictionary which may contain
+
+            checked
+                Whether the item is initially checked. Ignored for branches, whose
+                state comes from their children.
+            open
+                Whether a branch is initially open.
+            items
+                A dictionary of the children of a branch, in the same form.
+
+        and the data for the columns, keyed by the column names, ignoring case.
+
+        The state of all the branches is worked out in a single pass over the items,
+        and all the items are inserted in the Treeview in a single call to Tk. If the
+        tree is lazy, only the items that can be seen are inserted.
+
+        Parameters
+        ----------
+        metadata : dict(str: dict)
+            The description of the items.
+        parent : str = ""
+            The item to add the items to. Defaults to the top level of the tree.
+        """
+        rows = self._flatten(parent, metadata)
+        nodes = self._model.add_many(
+            parent,
+            [
+                (
+                    item_parent,
+                    key,
+                    value.get("checked", False),
+                    ("_node_", key),
+                    key,
+                    column_data,
+                    bool(value.get("open", False)),
+                )
+                for item_parent, key, value, column_data in rows
+            ],
+        )
+
+        parent_node = self._model[parent]
+        if parent_node.shown and parent_node.populated:
+            self._insert_items([node for node in nodes if node.parent is parent_node])
+        else:
+            self._update_placeholder(parent_node)
+
+        self._update_items()
+        self._update_filter(changed=nodes)
+
     def move(self, iid, parent, index):
         """Move the item specified by iid to the values under the item specified by
         parent at position index. The parent and index arguments work the same as those
         arguments to the .index() method.
         """
-        return self.tree.move(iid, parent, index)
+        node = self._model[iid]
+        old_parent = node.parent
+        self._model.move(iid, parent, index)
+        new_parent = node.parent
+
+        if new_parent.shown and new_parent.populated:
+            if node.shown:
+                self.tree.move(iid, parent, index)
+            else:
+                self._insert_items([node], index=index)
+        elif node.shown:
+            self._hide(node)
+
+        if old_parent is not None:
+            self._update_placeholder(old_parent)
+        self._update_placeholder(new_parent)
+        self._update_items()
+        self._update_filter()
+
+    def _new_iid(self):
+        """Generate a unique iid for an item."""
+        while True:
+            self._next_iid += 1
+            iid = f"I{self._next_iid:03X}"
+            if iid not in self._model:
+                return iid
 
     def next(self, iid):
         """If the item specified by iid is not the last child of its parent, this method
@@ -526,13 +899,80 @@ class CheckTree(sw.LabeledWidget):
         the method returns the iid of the next top-level item, or an empty string if the
         specified item is the last top-level item.
         """
-        return self.tree.next(iid)
+        node = self._model[iid]
+        if node.parent is None:
+            return ""
+        siblings = node.parent.children
+        index = siblings.index(node) + 1
+        return siblings[index].iid if index < len(siblings) else ""
+
+    def _notify(self):
+        """Tell any listeners about the changes to the selection since the last
+        notification."""
+        self._notify_id = None
+        model = self._model
+        added, removed = model.added, model.removed
+        if len(added) == 0 and len(removed) == 0:
+            return
+        model.added = set()
+        model.removed = set()
+        self._changes = (added, removed)
+        if self._command is not None:
+            self._command(added, removed)
+        self.event_generate("<<CheckTreeChanged>>")
+
+    def _notify_later(self):
+        """Arrange to notify listeners once Tk is idle, if the selection changed."""
+        if self._notify_id is not None:
+            return
+        model = self._model
+        if len(model.added) > 0 or len(model.removed) > 0:
+            self._notify_id = self.after_idle(self._notify)
+
+    def _open_cb(self, event):
+        """Create the children of a branch in the Treeview as the user opens it."""
+        iid = self.tree.focus()
+        if iid in self._model:
+            node = self._model[iid]
+            node.open = True
+            self._populate(node)
 
     def parent(self, iid):
         """If the item specified by iid is a top-level item, this method returns an
         empty string; otherwise it returns the iid of that item's parent.
         """
-        return self.tree.parent(iid)
+        node = self._model[iid]
+        return "" if node.parent is None else node.parent.iid
+
+    def _placeholder(self, iid):
+        """The iid of the placeholder child of a branch in a lazy tree."""
+        return "_placeholder_" + iid
+
+    def _populate(self, node):
+        """Insert the children of an item into the Treeview, if not already there.
+
+        Parameters
+        ----------
+        node : Node
+            The item, which must be in the Treeview.
+        """
+        if node.populated:
+            return
+        if node.iid in self._placeholders:
+            self.tree.delete(self._placeholder(node.iid))
+            self._placeholders.discard(node.iid)
+        node.populated = True
+        self._insert_items(node.children)
+        if self._filter is not None:
+            # Filter the new items, down through any open branches
+            rows = []
+            stack = [node]
+            while len(stack) > 0:
+                node = stack.pop()
+                if node in self._visible and node.populated:
+                    rows.append(node)
+                    stack.extend(node.children)
+            self._filter_children(rows)
 
     def prev(self, iid):
         """If the item specified by iid is not the first child of its parent, this
@@ -541,13 +981,62 @@ class CheckTree(sw.LabeledWidget):
         of the previous top-level item, or an empty string if it is the first top-level
         item.
         """
-        return self.tree.prev(iid)
+        node = self._model[iid]
+        if node.parent is None:
+            return ""
+        siblings = node.parent.children
+        index = siblings.index(node) - 1
+        return siblings[index].iid if index >= 0 else ""
+
+    def restore(self, snapshot, parent=""):
+        """Restore the selection saved by snapshot().
+
+        If the tree has the same shape as when the snapshot was taken, the leaves are
+        found from their position in the tree; otherwise the iids saved in the
+        snapshot are used, and leaves that no longer exist are ignored. Any other
+        leaves below the parent are unchecked.
+
+        Parameters
+        ----------
+        snapshot : dict
+            The snapshot from snapshot().
+        parent : str = ""
+            The item whose leaves to restore. Defaults to the entire tree.
+
+        Returns
+        -------
+        bool
+            True if the tree had the same shape as when the snapshot was taken.
+        """
+        shape, leaves = self._model.shape(parent)
+        same = snapshot["shape"] == shape and snapshot["n leaves"] == len(leaves)
+        if same:
+            bits = zlib.decompress(base64.b64decode(snapshot["bits"]))
+            checked = [
+                leaves[8 * i + bit]
+                for i, byte in enumerate(bits)
+                if byte != 0
+                for bit in range(8)
+                if byte & (1 << bit)
+            ]
+        else:
+            text = zlib.decompress(base64.b64decode(snapshot["checked"])).decode()
+            iids = set(text.split("\0")) if text != "" else set()
+            checked = [leaf for leaf in leaves if leaf.iid in iids]
+        self._model.set_checked_leaves(parent, checked)
+        self._update_items()
+        return same
 
     def see(self, iid):
         """This method ensures that the item specified by iid is visible. Any of its
         ancestors that are closed are opened. The widget is scrolled, if necessary, so
         that the item appears.
         """
+        self._show(iid)
+        node = self._model[iid].parent
+        while node is not None and node is not self._model.root:
+            node.open = True
+            node = node.parent
         return self.tree.see(iid)
 
     def selection_add(self, items):
@@ -559,6 +1048,7 @@ class CheckTree(sw.LabeledWidget):
         else:
             for item in items:
                 self._select(item)
+        self._update_items()
 
     def selection_clear(self, items=None):
         """Clear all selections from the subtree(s)"""
@@ -579,12 +1069,13 @@ class CheckTree(sw.LabeledWidget):
         else:
             for item in items:
                 self._deselect(item)
+        self._update_items()
 
     def selection_set(self, items):
         """Only the specified items will be selected; if any other items were selected
         before, they will become unselected.
         """
-        self.selection_remove(self.get_leaves())
+        self._deselect("")
         self.selection_add(items)
 
     def selection_toggle(self, items):
@@ -593,12 +1084,15 @@ class CheckTree(sw.LabeledWidget):
         unselected, select it.
         """
         if isinstance(items, str):
-            self.invoke(items)
-        else:
-            for item in items:
-                self.invoke(item)
+            items = [items]
+        for item in items:
+            if self._model[item].state == "checked":
+                self._deselect(item)
+            else:
+                self._select(item)
+        self._update_items()
 
-    def _select(self, iid, recursive=True, check_parents=True):
+    def _select(self, iid, recursive=True):
         """Change the state of the item 'iid' to checked.
 
         Parameters
@@ -607,26 +1101,12 @@ class CheckTree(sw.LabeledWidget):
             The unique id of the item in the tree.
         recursive : bool
             Whether to select all children
-        check_parents: bool
-            Whether to set the state of parents
-
-        Returns
-        -------
-        any
-            The return from any command invoked by changing the state.
         """
-        tags = [*self.tree.item(iid, "tags")]
-        tags.append("checked")
-        self.tree.item(iid, image=self.checked_image, tags=tags)
+        self._model.set_checked(iid, True, recursive=recursive)
 
-        # If this is a branch node, i.e. it has children, change them too
-        if recursive:
-            children = self.tree.get_children(iid)
-            for child in children:
-                self._select(child, recursive=True, check_parents=False)
-
-        if check_parents:
-            self._check_parents(iid)
+    def _search_text(self, node):
+        """The text of an item used by the filter: its text and column values."""
+        return "\n".join((node.text, *(str(value) for value in node.values)))
 
     def set(self, iid, column=None, value=None):
         """Use this method to retrieve or set the column values of the item specified by
@@ -638,82 +1118,104 @@ class CheckTree(sw.LabeledWidget):
         arguments, the item's value for the specified column is set to the third
         argument.
         """
-        return self.tree.set(iid, column=column, value=value)
+        self._show(iid)
+        result = self.tree.set(iid, column=column, value=value)
+        if value is not None:
+            node = self._model[iid]
+            node.values = self.tree.item(iid, "values")
+            self._update_filter(changed=[node])
+        return result
 
     def set_children(self, item, *newChildren):
         """Use this method to change the set of children of the item whose iid is
         item. The newChildren argument is a sequence of iid strings. Any current
         children of item that are not in newChildren are removed.
         """
-        return self.tree.set_children(item, *newChildren)
+        for child in self.get_children(item):
+            if child not in newChildren:
+                self.detach(child)
+        for child in newChildren:
+            self.move(child, item, "end")
+
+    def _show(self, iid):
+        """Make sure that an item exists in the Treeview, creating it and its
+        ancestors if necessary. The item is not opened or scrolled to.
+
+        Parameters
+        ----------
+        iid : str
+            The item.
+        """
+        node = self._model[iid]
+        if node.shown:
+            return
+        hidden = []
+        node = node.parent
+        while node is not None and not (node.shown and node.populated):
+            hidden.append(node)
+            node = node.parent
+        if node is None:
+            raise tk.TclError(f"Item {iid} is detached and not in the Treeview")
+        for node in reversed(hidden):
+            self._populate(node)
+
+    def snapshot(self, parent=""):
+        """A compact record of which leaves are checked, to use with restore().
+
+        The snapshot holds a hash of the shape of the tree, and a bitmap of the checked
+        leaves in tree order, as well as the iids of the checked leaves in case the
+        tree has changed when it is restored. Both are compressed and encoded as text,
+        so the snapshot can be saved e.g. as JSON.
+
+        Parameters
+        ----------
+        parent : str = ""
+            The item whose leaves to record. Defaults to the entire tree.
+
+        Returns
+        -------
+        dict(str: str or int)
+            The snapshot.
+        """
+        shape, leaves = self._model.shape(parent)
+        bits = bytearray((len(leaves) + 7) // 8)
+        iids = []
+        for i, leaf in enumerate(leaves):
+            if leaf.checked:
+                bits[i // 8] |= 1 << (i % 8)
+                iids.append(leaf.iid)
+        return {
+            "shape": shape,
+            "n leaves": len(leaves),
+            "bits": base64.b64encode(zlib.compress(bits)).decode("ascii"),
+            "checked": base64.b64encode(zlib.compress("\0".join(iids).encode())).decode(
+                "ascii"
+            ),
+        }
 
     def state(self, iid="", recursive=True):
-        """Determine the state of this item, and optionally its subtree.
+        """Determine the state of this item, and update the display of any items whose
+        state has changed.
+
+        The state of branches is kept up-to-date as items are checked and unchecked,
+        so this does not need to examine the subtree.
 
         Parameters
         ----------
         iid : str
             The item to check, or entire tree if ""
         recursive : bool
-            Whether to check the subtree
+            Unused, kept for compatibility.
 
         Returns
         -------
         str
             "checked", "unchecked", or "mixed"
         """
-        state = None
-        logger.debug(f"\n state for {iid}")
-        if recursive:
-            logger.debug(f"{recursive=}")
-            if iid is None:
-                children = self.get_children("")
-            else:
-                children = self.get_children(iid)
-            for child in children:
-                tmp = self.state(child, recursive=True)
-                if state is None:
-                    state = tmp
-                    logger.debug(f"    {child=} {state=}")
-                elif state != tmp:
-                    logger.debug(f"    {child=} returning 'mixed'")
-                    state = "mixed"
-            if state is not None:
-                tags = [*self.tree.item(iid, "tags")]
-                logger.debug(f"{state=} {tags=}")
-                if state == "checked":
-                    if "checked" not in tags:
-                        tags.append("checked")
-                    if "mixed" in tags:
-                        tags.remove("mixed")
-                    self.tree.item(iid, image=self.checked_image, tags=tags)
-                elif state == "unchecked":
-                    if "checked" in tags:
-                        tags.remove("checked")
-                    if "mixed" in tags:
-                        tags.remove("mixed")
-                    self.tree.item(iid, image=self.unchecked_image, tags=tags)
-                else:
-                    if "checked" in tags:
-                        tags.remove("checked")
-                    if "mixed" not in tags:
-                        tags.append("mixed")
-                    self.tree.item(iid, image=self.mixed_image, tags=tags)
-
-                logger.debug(f"returning {state=} from branch node {iid=}")
-                return state
-
-        tags = [*self.tree.item(iid, "tags")]
-        logger.debug(f"    {tags=}")
-        if "checked" in tags:
-            state = "checked"
-        elif "mixed" in tags:
-            state = "mixed"
-        else:
-            state = "unchecked"
-
-        logger.debug(f"returning {state=} from leaf node {iid=}")
-        return state
+        if iid is None:
+            iid = ""
+        self._update_items()
+        return self._model[iid].state
 
     def tag_bind(self, tagName, sequence=None, callback=None):
         """This method binds the event handler specified by the callback argument to all
@@ -750,40 +1252,116 @@ class CheckTree(sw.LabeledWidget):
         the method returns True if the item with that iid has tag tagName, False
         otherwise.
         """
-        return self.tree.tag_has(tagName, iid=iid)
+        if iid is not None:
+            return tagName in self._tags(self._model[iid])
+        return [
+            node.iid
+            for node in self._model.nodes.values()
+            if node is not self._model.root and tagName in self._tags(node)
+        ]
+
+    def _tags(self, node):
+        """The tags for an item, including the tag for its state."""
+        state = node.state
+        if state == "unchecked":
+            return node.tags
+        return (*node.tags, state)
+
+    def _update_placeholder(self, node):
+        """Add or remove the placeholder child of a closed branch in a lazy tree, as
+        needed after its children have changed.
 
+        Parameters
+        ----------
+        node : Node or None
+            The item whose children have changed, or None for a detached item.
+        """
+        if node is None or not node.shown or node.populated:
+            return
+        if len(node.children) > 0:
+            if node.iid not in self._placeholders:
+                self.tree.insert(node.iid, "end", iid=self._placeholder(node.iid))
+                self._placeholders.add(node.iid)
+        elif node.iid in self._placeholders:
+            self.tree.delete(self._placeholder(node.iid))
+            self._placeholders.discard(node.iid)
+
+    def _unfilter(self, node):
+        """Put back any items that the filter detached below an item in the Treeview.
+
+        This is needed before deleting the item from the Treeview, because detached
+        items are not deleted with it.
 
-if __name__ == "__main__":  # pragma: no cover
-    import pprint  # noqa: F401
+        Parameters
+        ----------
+        node : Node
+            The item.
+        """
+        if len(self._filtered) == 0:
+            return
+        branches = []
+        stack = [node]
+        while len(stack) > 0:
+            node = stack.pop()
+            if node in self._filtered:
+                branches.append(node)
+                self._filtered.discard(node)
+            if node.populated:
+                stack.extend(node.children)
+        for_each(
+            self.tree,
+            "iid children",
+            "$w children $iid $children",
+            [
+                (node.iid, [child.iid for child in node.children])
+                for node in branches
+                if node.shown and node.populated
+            ],
+        )
 
-    # logging.basicConfig(level="INFO")
+    def _update_filter(self, changed=(), removed=()):
+        """Update the search index after items change, and reapply any filter.
 
-    def load_dict(tree, parent, metadata):
-        """Custom code to load the dictionary in the test.
-        NB. the 'state=False' argument prevents insert from working out the
-        state of the parent nodes every time an item is inserted. This is done
-        at the end with 'tree.state()'
+        Parameters
+        ----------
+        changed : iterable of Node
+            Items that were added or whose text or values changed.
+        removed : iterable of Node
+            Items that were deleted.
+        """
+        if self._index is None:
+            return
+        for node in removed:
+            self._index.remove(node.iid)
+        self._index.add_many((node.iid, self._search_text(node)) for node in changed)
+        if self._filter is not None:
+            self.filter(self._filter)
+
+    def _update_items(self):
+        """Update the image and tags in the Treeview of items whose state changed.
+
+        Items that are not in the Treeview are skipped; they get the correct image
+        when they are inserted. The changes are sent to Tk in a single call.
         """
-        for key, value in metadata.items():
-            # Get any data in the columns
-            checked = value.get("checked", False)
+        self._notify_later()
+        dirty = self._model.dirty
+        if len(dirty) == 0:
+            return
+        nodes = [self._model[iid] for iid in dirty]
+        dirty.clear()
+        nodes = [node for node in nodes if node.shown]
+        for_each(
+            self.tree,
+            "iid image tags",
+            "$w item $iid -image $image -tags $tags",
+            [(node.iid, self._images[node.state], self._tags(node)) for node in nodes],
+        )
 
-            tree.insert(
-                parent,
-                "end",
-                iid=key,
-                text=key,
-                selected=checked,
-                state=False,
-                open="open" in value and value["open"],
-                values=[value["description"] if "description" in value else ""],
-            )
-            # Recurse if a branch node
-            if "items" in value:
-                load_dict(tree, key, value["items"])
 
-        # Set the state of intermediate nodes
-        tree.state()
+if __name__ == "__main__":  # pragma: no cover
+    import pprint  # noqa: F401
+
+    # logging.basicConfig(level="INFO")
 
     root = tk.Tk()
     root.title("Search Criteria")
@@ -813,9 +1391,9 @@ if __name__ == "__main__":  # pragma: no cover
         tmp = metadata["2-D"]["items"]
         for i in range(20):
             tmp[f"E{i}"] = {"description": f"And a super E{i} thingamajig"}
-        load_dict(tree, "", metadata)
+        tree.load(metadata)
     else:
-        load_dict(tree, "", metadata)
+        tree.load(metadata)
         twoD = tree.insert("", "end", text="2-D", values=["Two dimensional features"])
         print(f"{twoD=}")
         for i in range(20):
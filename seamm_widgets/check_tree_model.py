@@ -0,0 +1,668 @@
+# -*- coding: utf-8 -*-
+
+"""The Python-side model of the items in a CheckTree.
+
+The model mirrors the items in the Tk tree, holding the parent and children of each
+item and whether it is checked. Each branch keeps counts of its checked and unchecked
+children, so its state -- "checked", "unchecked" or "mixed" -- is known without
+looking at the children. Changing an item therefore only has to walk up through its
+ancestors, stopping as soon as an ancestor's state does not change.
+
+The items whose state changed are collected in `dirty` so that the widget can update
+their images and tags in Tk in one batch.
+
+The model also holds the text, column values and open state of each item, so that the
+widget can create items in Tk when they are needed, e.g. when a branch is first
+opened, rather than all at once.
+
+The checked leaves are kept in a set, so that the selected items can be found without
+looking at the whole tree. To return them in the order of the tree, the items are
+numbered in tree order. The numbering is redone, when next needed, after items are
+added or moved, except when items are simply added at the end of the tree.
+
+The iids of leaves that are added to or removed from the checked leaves are collected
+in `added` and `removed`, so that the widget can tell listeners what changed. An item
+that is added and then removed again, or vice versa, is in neither.
+"""
+
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Node(object):
+    """An item in the CheckTree model."""
+
+    __slots__ = (
+        "iid",
+        "parent",
+        "children",
+        "checked",
+        "n_checked",
+        "n_unchecked",
+        "tags",
+        "text",
+        "values",
+        "open",
+        "shown",
+        "populated",
+        "seq",
+        "last",
+    )
+
+    def __init__(
+        self,
+        iid,
+        parent=None,
+        checked=False,
+        tags=("_node_",),
+        text="",
+        values=(),
+        open=False,
+    ):
+        self.iid = iid
+        self.parent = parent
+        self.children = []
+        self.checked = checked
+        self.n_checked = 0
+        self.n_unchecked = 0
+        self.tags = tuple(tags)
+        self.text = text
+        self.values = values
+        self.open = open
+        # Whether the item exists in Tk, and whether its children do
+        self.shown = False
+        self.populated = False
+        # The position in tree order, and the last position in the subtree
+        self.seq = 0
+        self.last = 0
+
+    def __repr__(self):
+        return f"Node({self.iid!r}, state={self.state!r})"
+
+    @property
+    def state(self):
+        """The state of the item: "checked", "unchecked" or "mixed"."""
+        n = len(self.children)
+        if n == 0:
+            return "checked" if self.checked else "unchecked"
+        if self.n_checked == n:
+            return "checked"
+        if self.n_unchecked == n:
+            return "unchecked"
+        return "mixed"
+
+
+class CheckTreeModel(object):
+    """The tree of items, with the state of each item.
+
+    The root of the tree is an item with the iid "", like the root of a
+    ttk.Treeview.
+    """
+
+    def __init__(self):
+        self.root = Node("", open=True)
+        self.root.shown = True
+        self.root.populated = True
+        self.nodes = {"": self.root}
+        self.dirty = set()
+        self.checked = set()
+        self.added = set()
+        self.removed = set()
+        self._ordered = True
+        self._branches = {}
+
+    def __contains__(self, iid):
+        return iid in self.nodes
+
+    def __getitem__(self, iid):
+        return self.nodes[iid]
+
+    def __len__(self):
+        return len(self.nodes) - 1
+
+    def add(
+        self,
+        parent,
+        index,
+        iid,
+        checked=False,
+        tags=("_node_",),
+        text="",
+        values=(),
+        open=False,
+    ):
+        """Add an item to the tree.
+
+        Parameters
+        ----------
+        parent : str
+            The iid of the parent, "" for a top-level item.
+        index : int or "end"
+            The position of the new item among the children of the parent.
+        iid : str
+            The iid of the new item.
+        checked : bool = False
+            Whether the new item is checked.
+        tags : [str]
+            The tags of the item, other than the ones giving its state.
+        text : str = ""
+            The text of the item.
+        values : [str] = ()
+            The values of the item in the columns.
+        open : bool = False
+            Whether the item is open, showing its children.
+
+        Returns
+        -------
+        Node
+            The new item.
+        """
+        if iid in self.nodes:
+            raise KeyError(f"Item '{iid}' already exists")
+        parent_node = self.nodes[parent]
+        node = Node(
+            iid,
+            parent_node,
+            checked=checked,
+            tags=tags,
+            text=text,
+            values=values,
+            open=open,
+        )
+        self.nodes[iid] = node
+
+        old = parent_node.state
+        self._insert_child(parent_node, index, node)
+        self._count(parent_node, node.state, 1)
+        self._propagate(parent_node, old)
+
+        if self._attached(parent_node):
+            if checked:
+                self._add_checked((node,))
+            if len(parent_node.children) == 1:
+                self._remove_checked((parent_node,))
+        self._branches = {}
+        if parent_node is self.root and index == "end":
+            self._number([node])
+        else:
+            self._ordered = False
+        return node
+
+    def add_many(self, parent, items):
+        """Add many items at once, working out the state of the branches in a single
+        pass from the bottom up.
+
+        Parameters
+        ----------
+        parent : str
+            The iid of the item that the new items are added to, "" for the top level.
+        items : [(str, str, bool, [str], str, [str], bool)]
+            The parent iid, iid, whether checked, tags, text, column values and
+            whether open for each item, each item after its parent. The new items
+            are appended to the children of their parent. Adding them depth-first,
+            each item followed by its descendants, saves numbering the tree again.
+
+        Returns
+        -------
+        [Node]
+            The new items, in the same order.
+        """
+        new = set()
+        for parent_iid, iid, *_ in items:
+            if parent_iid != parent and parent_iid not in new:
+                raise KeyError(f"The parent '{parent_iid}' of '{iid}' is not known")
+            if iid in self.nodes or iid in new:
+                raise KeyError(f"Item '{iid}' already exists")
+            new.add(iid)
+
+        top = self.nodes[parent]
+        if len(new) == 0:
+            # Nothing to add, and a leaf parent must stay a leaf
+            return []
+        old = top.state
+        nodes = []
+        for parent_iid, iid, checked, tags, text, values, open in items:
+            parent_node = self.nodes[parent_iid]
+            node = Node(iid, parent_node, checked, tags, text, values, open)
+            parent_node.children.append(node)
+            self.nodes[iid] = node
+            nodes.append(node)
+
+        # Children come after their parents, so going backwards each item is done
+        # before its parent is.
+        for node in reversed(nodes):
+            state = node.state
+            if len(node.children) > 0:
+                node.checked = state == "checked"
+            self._count(node.parent, state, 1)
+
+        self._propagate(top, old)
+
+        if self._attached(top):
+            self._add_checked(
+                node for node in nodes if node.checked and len(node.children) == 0
+            )
+            self._remove_checked((top,))
+        self._branches = {}
+        if top is self.root:
+            self._number(nodes)
+        else:
+            self._ordered = False
+        return nodes
+
+    def branches(self, iid=""):
+        """The children of an item that are branches, i.e. have children.
+
+        These are cached until items are next added, moved or removed.
+
+        Parameters
+        ----------
+        iid : str = ""
+            The item.
+
+        Returns
+        -------
+        [Node]
+            The branches, in order.
+        """
+        if iid not in self._branches:
+            self._branches[iid] = [
+                child for child in self.nodes[iid].children if len(child.children) > 0
+            ]
+        return self._branches[iid]
+
+    def checked_leaves(self, iid=""):
+        """The checked leaves in the subtree of an item, in tree order.
+
+        Parameters
+        ----------
+        iid : str = ""
+            The item, by default the whole tree.
+
+        Returns
+        -------
+        [Node]
+            The checked leaves.
+        """
+        node = self.nodes[iid]
+        if not self._attached(node):
+            # Detached items are not numbered, so look at the subtree.
+            result = []
+            stack = [node]
+            while len(stack) > 0:
+                item = stack.pop()
+                if len(item.children) == 0:
+                    if item.checked and item is not node:
+                        result.append(item)
+                else:
+                    stack.extend(reversed(item.children))
+            return result
+
+        self._order()
+        if node is self.root:
+            leaves = self.checked
+        else:
+            first = node.seq
+            last = node.last
+            leaves = [leaf for leaf in self.checked if first < leaf.seq <= last]
+        return sorted(leaves, key=lambda leaf: leaf.seq)
+
+    def count_checked(self, iid=""):
+        """The number of checked leaves in the subtree of an item.
+
+        Parameters
+        ----------
+        iid : str = ""
+            The item, by default the whole tree.
+
+        Returns
+        -------
+        int
+        """
+        node = self.nodes[iid]
+        if node is self.root:
+            return len(self.checked)
+        if not self._attached(node):
+            return len(self.checked_leaves(iid))
+        self._order()
+        first = node.seq
+        last = node.last
+        return sum(1 for leaf in self.checked if first < leaf.seq <= last)
+
+    def detach(self, iid):
+        """Remove an item and its descendants from its parent, without deleting it.
+
+        The item can be put back in the tree with `move`.
+
+        Parameters
+        ----------
+        iid : str
+            The iid of the item.
+        """
+        node = self.nodes[iid]
+        parent = node.parent
+        if parent is None:
+            return
+        if self._attached(parent):
+            self._remove_checked(self._leaves(node))
+            if len(parent.children) == 1 and parent.checked and parent is not self.root:
+                self._add_checked((parent,))
+        self._branches = {}
+
+        old = parent.state
+        parent.children.remove(node)
+        node.parent = None
+        self._count(parent, node.state, -1)
+        self._propagate(parent, old)
+
+    def move(self, iid, parent, index):
+        """Move an item, with its descendants, to a new parent and/or position.
+
+        Parameters
+        ----------
+        iid : str
+            The iid of the item.
+        parent : str
+            The iid of the new parent.
+        index : int or "end"
+            The new position among the children of the parent.
+        """
+        node = self.nodes[iid]
+        parent_node = self.nodes[parent]
+        ancestor = parent_node
+        while ancestor is not None:
+            if ancestor is node:
+                raise ValueError(f"Cannot move '{iid}' into its own descendant")
+            ancestor = ancestor.parent
+        self.detach(iid)
+        node.parent = parent_node
+        old = parent_node.state
+        self._insert_child(parent_node, index, node)
+        self._count(parent_node, node.state, 1)
+        self._propagate(parent_node, old)
+
+        if self._attached(parent_node):
+            self._add_checked(leaf for leaf in self._leaves(node) if leaf.checked)
+            if len(parent_node.children) == 1:
+                self._remove_checked((parent_node,))
+        self._branches = {}
+        self._ordered = False
+
+    def remove(self, iid):
+        """Remove an item and all its descendants from the tree.
+
+        Parameters
+        ----------
+        iid : str
+            The iid of the item.
+
+        Returns
+        -------
+        [Node]
+            The items that were removed.
+        """
+        self.detach(iid)
+        removed = []
+        stack = [self.nodes[iid]]
+        while len(stack) > 0:
+            node = stack.pop()
+            stack.extend(node.children)
+            del self.nodes[node.iid]
+            self.dirty.discard(node.iid)
+            removed.append(node)
+        return removed
+
+    def set_checked(self, iid, checked, recursive=True):
+        """Check or uncheck an item, and optionally all its descendants.
+
+        Parameters
+        ----------
+        iid : str
+            The iid of the item.
+        checked : bool
+            True to check the item, False to uncheck it.
+        recursive : bool = True
+            Whether to also change all the descendants of the item. If False,
+            branches are not changed since their state comes from their children.
+        """
+        node = self.nodes[iid]
+        old = node.state
+        attached = self._attached(node)
+        if recursive:
+            stack = [node]
+            while len(stack) > 0:
+                item = stack.pop()
+                before = item.state
+                item.checked = checked
+                n = len(item.children)
+                if n > 0:
+                    item.n_checked = n if checked else 0
+                    item.n_unchecked = 0 if checked else n
+                    stack.extend(item.children)
+                elif attached and item.state != before:
+                    if checked:
+                        self._add_checked((item,))
+                    else:
+                        self._remove_checked((item,))
+                if item.state != before:
+                    self._changed(item)
+        elif len(node.children) == 0:
+            # The state of a branch comes from its children, so only leaves change
+            node.checked = checked
+            if attached:
+                if checked:
+                    self._add_checked((node,))
+                else:
+                    self._remove_checked((node,))
+        self._propagate(node, old)
+
+    def set_checked_leaves(self, iid, leaves):
+        """Check exactly the given leaves below an item, unchecking all others.
+
+        The state of all the items below the item is worked out in one pass from the
+        bottom up, and the change is then propagated up from the item once.
+
+        Parameters
+        ----------
+        iid : str
+            The iid of the item.
+        leaves : iterable of Node
+            The leaves to check, which should be below the item.
+        """
+        node = self.nodes[iid]
+        old = node.state
+        attached = self._attached(node)
+        wanted = set(leaves)
+
+        order = []
+        stack = [*node.children]
+        while len(stack) > 0:
+            item = stack.pop()
+            order.append(item)
+            stack.extend(item.children)
+
+        # Children come after their parents, so going backwards each item is done
+        # before its parent is.
+        for item in reversed(order):
+            before = item.state
+            if len(item.children) == 0:
+                was = item.checked
+                item.checked = item in wanted
+                if attached and item.checked != was:
+                    if item.checked:
+                        self._add_checked((item,))
+                    else:
+                        self._remove_checked((item,))
+            else:
+                states = [child.state for child in item.children]
+                item.n_checked = states.count("checked")
+                item.n_unchecked = states.count("unchecked")
+                item.checked = item.state == "checked"
+            if item.state != before:
+                self._changed(item)
+
+        if len(node.children) > 0:
+            states = [child.state for child in node.children]
+            node.n_checked = states.count("checked")
+            node.n_unchecked = states.count("unchecked")
+        self._propagate(node, old)
+
+    def shape(self, iid=""):
+        """A hash of the shape of the tree below an item, and its leaves in order.
+
+        The hash covers the iids of the items and how they are nested, so it changes
+        if items are added, removed or moved.
+
+        Parameters
+        ----------
+        iid : str
+            The iid of the item.
+
+        Returns
+        -------
+        str, [Node]
+            The hash, as a hexadecimal string, and the leaves below the item in tree
+            order.
+        """
+        digest = hashlib.sha1()
+        leaves = []
+        stack = [(child, 0) for child in reversed(self.nodes[iid].children)]
+        while len(stack) > 0:
+            node, depth = stack.pop()
+            digest.update(f"{depth} {node.iid}\0".encode())
+            if len(node.children) == 0:
+                leaves.append(node)
+            else:
+                stack.extend((child, depth + 1) for child in reversed(node.children))
+        return digest.hexdigest(), leaves
+
+    def _add_checked(self, leaves):
+        """Add leaves to the checked leaves, noting the ones that were not there."""
+        for leaf in leaves:
+            if leaf not in self.checked:
+                self.checked.add(leaf)
+                if leaf.iid in self.removed:
+                    self.removed.discard(leaf.iid)
+                else:
+                    self.added.add(leaf.iid)
+
+    def _attached(self, node):
+        """Whether the item is in the tree, i.e. not detached."""
+        while node.parent is not None:
+            node = node.parent
+        return node is self.root
+
+    def _changed(self, node):
+        """Note that the state of the item has changed."""
+        if node is not self.root:
+            self.dirty.add(node.iid)
+
+    def _count(self, node, state, delta):
+        """Add delta to the count of children in the given state."""
+        if state == "checked":
+            node.n_checked += delta
+        elif state == "unchecked":
+            node.n_unchecked += delta
+
+    def _insert_child(self, parent, index, node):
+        """Put the node in the list of children of the parent."""
+        if index == "end":
+            parent.children.append(node)
+        else:
+            parent.children.insert(int(index), node)
+
+    def _leaves(self, node):
+        """The leaves in the subtree of the item, including the item if a leaf."""
+        result = []
+        stack = [node]
+        while len(stack) > 0:
+            node = stack.pop()
+            if len(node.children) == 0:
+                result.append(node)
+            else:
+                stack.extend(node.children)
+        return result
+
+    def _number(self, nodes):
+        """Number new items added at the end of the tree, in tree order.
+
+        If the items are not in tree order, i.e. each item followed by all its
+        descendants, the whole tree is numbered again when next needed.
+
+        Parameters
+        ----------
+        nodes : [Node]
+            The new items, added at the top level with their descendants.
+        """
+        if not self._ordered:
+            return
+        # Check the order: each item's parent must be on the path to the last item
+        path = []
+        for node in nodes:
+            while len(path) > 0 and path[-1] is not node.parent:
+                path.pop()
+            if len(path) == 0 and node.parent is not self.root:
+                self._ordered = False
+                return
+            path.append(node)
+        seq = self.root.last
+        for node in nodes:
+            seq += 1
+            node.seq = seq
+        self.root.last = seq
+        for node in reversed(nodes):
+            node.last = node.children[-1].last if len(node.children) > 0 else node.seq
+
+    def _order(self):
+        """Number the items in tree order, if needed."""
+        if self._ordered:
+            return
+        seq = 0
+        stack = [(self.root, False)]
+        while len(stack) > 0:
+            node, done = stack.pop()
+            if done:
+                node.last = seq
+            else:
+                seq += 1
+                node.seq = seq
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(node.children))
+        self._ordered = True
+
+    def _propagate(self, node, old):
+        """Carry a change in the state of an item up through its ancestors.
+
+        Parameters
+        ----------
+        node : Node
+            The item that may have changed.
+        old : str
+            The state of the item before the change.
+        """
+        while True:
+            new = node.state
+            if new == old:
+                return
+            self._changed(node)
+            if len(node.children) > 0:
+                node.checked = new == "checked"
+            parent = node.parent
+            if parent is None:
+                return
+            old_parent = parent.state
+            self._count(parent, old, -1)
+            self._count(parent, new, 1)
+            node, old = parent, old_parent
+
+    def _remove_checked(self, leaves):
+        """Remove leaves from the checked leaves, noting the ones that were there."""
+        for leaf in leaves:
+            if leaf in self.checked:
+                self.checked.discard(leaf)
+                if leaf.iid in self.added:
+                    self.added.discard(leaf.iid)
+                else:
+                    self.removed.add(leaf.iid)
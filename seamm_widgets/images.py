@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+"""A registry of the images used by the widgets, shared by all the widgets.
+
+Images are loaded from the data directory of a package the first time they are
+needed and kept for the life of the Tk interpreter, so that e.g. many CheckTrees share
+the same three checkbox images rather than each reading and decoding their own copy.
+Images belong to a Tk interpreter, so they are keyed by the interpreter as well as the
+name.
+
+Applications can load the images up front, e.g. at startup, with `preload_images`.
+"""
+
+import importlib
+import logging
+
+from PIL import ImageTk, Image
+
+logger = logging.getLogger(__name__)
+
+# The images, keyed by (package, name, Tk interpreter)
+_images = {}
+
+
+def get_image(name, master, package="seamm_widgets"):
+    """Get an image, loading it if it is not already in the registry.
+
+    Parameters
+    ----------
+    name : str
+        The name of the image file in the data directory of the package, e.g.
+        "checked.png"
+    master : tkinter.Misc
+        A widget in the Tk interpreter where the image will be used.
+    package : str
+        The package containing the image, by default seamm_widgets.
+
+    Returns
+    -------
+    ImageTk.PhotoImage
+        The image.
+    """
+    key = (package, name, master.tk)
+    if key not in _images:
+        path = importlib.resources.files(package) / "data" / name
+        logger.debug(f"Loading the image {path}")
+        with Image.open(path) as image:
+            _images[key] = ImageTk.PhotoImage(image, master=master)
+    return _images[key]
+
+
+def preload_images(master, names=None, package="seamm_widgets"):
+    """Load images into the registry ahead of when they are needed.
+
+    Parameters
+    ----------
+    master : tkinter.Misc
+        A widget in the Tk interpreter where the images will be used.
+    names : [str]
+        The names of the image files. The default is all the PNG files in the data
+        directory of the package.
+    package : str
+        The package containing the images, by default seamm_widgets.
+
+    Returns
+    -------
+    None
+    """
+    if names is None:
+        path = importlib.resources.files(package) / "data"
+        names = sorted(p.name for p in path.iterdir() if p.name.endswith(".png"))
+    for name in names:
+        get_image(name, master, package=package)
+
+
+def forget_images(master):
+    """Remove the images of a Tk interpreter from the registry, e.g. when it is
+    destroyed.
+
+    Parameters
+    ----------
+    master : tkinter.Misc
+        A widget in the Tk interpreter.
+
+    Returns
+    -------
+    None
+    """
+    interpreter = master.tk
+    for key in [key for key in _images if key[2] is interpreter]:
+        del _images[key]
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+
+"""A dialog for browsing and searching the keywords in metadata.
+
+Typing in the search field narrows the list to the keywords whose name or
+description contains the text. Keyword sets can have thousands of entries, so the
+list is filled a page at a time as the user scrolls down rather than all at once.
+
+The dialog for a metadata dictionary is created once and shared by all the Keywords
+widgets using that metadata, so opening it a second time, from any of them, is
+immediate. Use `KeywordBrowser.for_metadata` to get it. The dialog is forgotten
+when it is destroyed, e.g. with the main window.
+"""
+
+import logging
+import tkinter as tk
+from tkinter import ttk
+
+import Pmw
+
+from seamm_widgets.metadata_cache import SharedByMetadata
+from seamm_widgets.text_index import TextIndex
+
+module_logger = logging.getLogger(__name__)
+
+
+class KeywordBrowser(SharedByMetadata, weak=False):
+    """A modal dialog for choosing keywords from metadata.
+
+    Parameters
+    ----------
+    master : tkinter.Misc
+        The parent of the dialog.
+    metadata : dict(str: dict)
+        The metadata for the keywords, keyed by keyword, each with a "description".
+    title : str
+        The title of the dialog.
+    page_size : int
+        The number of keywords added to the list at a time.
+    """
+
+    def __init__(
+        self,
+        master,
+        metadata,
+        title="Add keywords",
+        page_size=100,
+        logger=module_logger,
+    ):
+        super().__init__(metadata)
+        self.logger = logger
+        self.page_size = page_size
+        self._keywords = sorted(metadata)
+        self._matches = self._keywords
+        self._n_shown = 0
+        self._index = None
+        self._search_id = None
+        self._more_id = None
+        self._result = []
+
+        self.dialog = Pmw.Dialog(
+            master,
+            buttons=("OK", "Cancel"),
+            defaultbutton="OK",
+            title=title,
+            command=self._handle,
+        )
+        self.dialog.withdraw()
+        interior = self.dialog.interior()
+        interior.bind("<Destroy>", lambda event: self._destroyed())
+
+        ttk.Label(interior, text="Search:").grid(row=0, column=0, sticky=tk.E)
+        self._search = tk.StringVar()
+        self._search.trace_add("write", lambda *args: self._search_later())
+        self._entry = ttk.Entry(interior, textvariable=self._search, width=30)
+        self._entry.grid(row=0, column=1, sticky=tk.W, padx=5, pady=2)
+
+        frame = ttk.Frame(interior)
+        frame.grid(row=1, column=0, columnspan=2, sticky=tk.NSEW, padx=5, pady=5)
+        self._tree = ttk.Treeview(
+            frame, columns=("Keyword", "Description"), show="headings"
+        )
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self._tree.yview)
+        self._scrollbar = scrollbar
+        self._tree.configure(yscrollcommand=self._yscroll)
+        self._tree.grid(row=0, column=0, sticky=tk.NSEW)
+        scrollbar.grid(row=0, column=1, sticky=tk.NS)
+        self._tree.bind("<Double-Button-1>", lambda event: self._handle("OK"))
+
+        self._tree.heading("Keyword", text="Keyword")
+        self._tree.heading("Description", text="Description")
+        self._tree.column("Keyword", width=100, stretch=False)
+
+        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(0, weight=1)
+        interior.columnconfigure(1, weight=1)
+        interior.rowconfigure(1, weight=1)
+
+        self._show_more()
+
+    @classmethod
+    def for_metadata(cls, metadata, master, **kwargs):
+        """The browser for metadata, shared with any other users of the same
+        metadata.
+
+        A new browser is created if there is none yet for the metadata in this Tk
+        interpreter, or if keywords have been added to, removed from or renamed in
+        the metadata, in which case the old dialog is destroyed.
+
+        Parameters
+        ----------
+        metadata : dict(str: dict)
+            The metadata for the keywords.
+        master : tkinter.Misc
+            A widget in the Tk interpreter. The dialog belongs to the main window, so
+            that it outlives the widget.
+        kwargs : dict
+            Any other arguments for a new browser.
+
+        Returns
+        -------
+        KeywordBrowser
+        """
+        browser = cls._shared(metadata, master.tk)
+        if browser is None:
+            old = cls._cache.get((id(metadata), master.tk))
+            if old is not None:
+                old.destroy()
+            browser = cls(master._root(), metadata, **kwargs)
+            browser._share(master.tk)
+        return browser
+
+    def destroy(self):
+        """Destroy the dialog, forgetting it."""
+        self._destroyed()
+        if self.dialog.winfo_exists():
+            self.dialog.destroy()
+
+    def ask(self):
+        """Show the dialog modally and return the keywords chosen.
+
+        Returns
+        -------
+        [str]
+            The keywords selected, in sorted order, or an empty list if cancelled.
+        """
+        self._tree.selection_set(())
+        self._result = []
+        self._entry.focus_set()
+        self.dialog.activate(geometry="centerscreenfirst")
+        return self._result
+
+    def search(self, text):
+        """Show only the keywords whose name or description contains the text.
+
+        Parameters
+        ----------
+        text : str
+            The text to search for, ignoring case. An empty string shows all the
+            keywords.
+        """
+        if text == "":
+            self._matches = self._keywords
+        else:
+            if self._index is None:
+                self._index = TextIndex(
+                    (keyword, f"{keyword}\n{data.get('description', '')}")
+                    for keyword, data in self.metadata.items()
+                )
+            found = self._index.search(text)
+            self._matches = [keyword for keyword in self._keywords if keyword in found]
+
+        tree = self._tree
+        tree.delete(*tree.get_children())
+        self._n_shown = 0
+        self._show_more()
+        tree.yview_moveto(0)
+
+    def _destroyed(self):
+        """Forget the dialog and cancel any updates, once it is destroyed."""
+        self._unshare()
+        for after_id in (self._search_id, self._more_id):
+            if after_id is not None:
+                self._tree.after_cancel(after_id)
+        self._search_id = None
+        self._more_id = None
+
+    def _invalidate(self):
+        """Destroy the dialog because its metadata has changed."""
+        self.destroy()
+
+    def _handle(self, result):
+        if result == "OK":
+            self._result = sorted(self._tree.selection())
+        else:
+            self._result = []
+        self.dialog.deactivate(result)
+
+    def _search_later(self):
+        """Search once the user pauses typing, i.e. when Tk is next idle."""
+        if self._search_id is None:
+            self._search_id = self._tree.after_idle(self._search_now)
+
+    def _search_now(self):
+        self._search_id = None
+        self.search(self._search.get().strip())
+
+    def _show_more(self):
+        """Add the next page of matching keywords to the list."""
+        self._more_id = None
+        start = self._n_shown
+        end = min(start + self.page_size, len(self._matches))
+        for keyword in self._matches[start:end]:
+            description = self.metadata[keyword].get("description", "")
+            self._tree.insert("", "end", iid=keyword, values=(keyword, description))
+        self._n_shown = end
+
+    def _yscroll(self, first, last):
+        """Update the scrollbar and add more keywords when near the end."""
+        self._scrollbar.set(first, last)
+        if (
+            float(last) > 0.9
+            and self._n_shown < len(self._matches)
+            and self._more_id is None
+        ):
+            self._more_id = self._tree.after_idle(self._show_more)
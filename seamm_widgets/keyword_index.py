@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+
+"""An index of the keywords in metadata, for completing and resolving prefixes.
+
+The keywords are kept sorted, with a trie over them in which each node holds the range
+of sorted keywords starting with its prefix. Finding the keywords that start with a
+prefix, whether a prefix is unique, and the longest common prefix of the matches all
+take time proportional to the length of the prefix, not the number of keywords.
+
+For tab completion the index can also rank the keywords matching what the user typed,
+roughly as they would expect: keywords starting with the text, then keywords
+containing its characters in order, then keywords whose description has a word
+starting with it. Case and punctuation are ignored. The forms needed for this are
+computed the first time they are used.
+
+Keyword sets such as those for MOPAC or Gaussian are large and shared by many
+widgets, so the index for a metadata dictionary is built once and shared. Use
+`KeywordIndex.for_metadata` to get it.
+"""
+
+from bisect import bisect_left
+import heapq
+from itertools import takewhile
+import logging
+import re
+
+from seamm_widgets.metadata_cache import SharedByMetadata
+
+logger = logging.getLogger(__name__)
+
+# Past any character that can follow a prefix, for the end of a range of prefixes
+_last_character = chr(0x10FFFF)
+
+
+def lcp(*s):
+    """Longest common prefix of strings"""
+    return "".join(a for a, b in takewhile(lambda x: x[0] == x[1], zip(min(s), max(s))))
+
+
+class KeywordIndex(SharedByMetadata):
+    """A prefix index of the keywords in metadata.
+
+    Parameters
+    ----------
+    metadata : dict(str: dict)
+        The metadata for the keywords, keyed by keyword.
+    """
+
+    def __init__(self, metadata):
+        super().__init__(metadata)
+        self._keywords = sorted(metadata)
+        self.max_length = max((len(keyword) for keyword in self._keywords), default=0)
+
+        # Each node of the trie is [children, first, last], where children is a
+        # dictionary of the child nodes keyed by the next character, and
+        # first:last is the range of keywords starting with the node's prefix.
+        self._root = [{}, 0, len(self._keywords)]
+        # The normalized forms, made when first completing
+        self._normalized = None
+        self._tokens = None
+        self._token_keywords = None
+        for i, keyword in enumerate(self._keywords):
+            node = self._root
+            for character in keyword:
+                child = node[0].get(character)
+                if child is None:
+                    child = node[0][character] = [{}, i, i + 1]
+                else:
+                    child[2] = i + 1
+                node = child
+
+    def __contains__(self, keyword):
+        return keyword in self.metadata
+
+    def __len__(self):
+        return len(self._keywords)
+
+    @classmethod
+    def for_metadata(cls, metadata):
+        """The index for metadata, shared with any other users of the same metadata.
+
+        The index is rebuilt if keywords have been added to, removed from or renamed
+        in the metadata since it was built.
+
+        Parameters
+        ----------
+        metadata : dict(str: dict)
+            The metadata for the keywords.
+
+        Returns
+        -------
+        KeywordIndex
+        """
+        index = cls._shared(metadata)
+        if index is None:
+            index = cls(metadata)
+            index._share()
+        return index
+
+    def complete(self, text, n=10):
+        """The best n completions of text, best first.
+
+        The keywords starting with the text come first, shortest first, then those
+        with the same first character that contain all the characters of the text in
+        order, the most compact matches first, and finally those with a word in their
+        description starting with the text. Case and punctuation are ignored.
+
+        Parameters
+        ----------
+        text : str
+            The text typed so far.
+        n : int
+            The maximum number of completions.
+
+        Returns
+        -------
+        [str]
+            The keywords.
+        """
+        if self._normalized is None:
+            self._prepare()
+        query = self.normalize(text)
+        if query == "" or n <= 0:
+            return []
+
+        result = []
+        seen = set()
+
+        def take(keywords):
+            """Add keywords to the result, returning True once there are n."""
+            for keyword in keywords:
+                if keyword not in seen:
+                    seen.add(keyword)
+                    result.append(keyword)
+                    if len(result) >= n:
+                        return True
+            return False
+
+        # Keywords starting with the text
+        normalized = self._normalized
+        first = bisect_left(normalized, (query,))
+        last = bisect_left(normalized, (query + _last_character,))
+        prefixed = [keyword for _, keyword in normalized[first:last]]
+        if take(heapq.nsmallest(n, prefixed, key=lambda k: (len(k), k))):
+            return result
+
+        # Keywords with the same first character and the rest of the text in order
+        first = bisect_left(normalized, (query[0],))
+        last = bisect_left(normalized, (query[0] + _last_character,))
+        scored = []
+        for form, keyword in normalized[first:last]:
+            if keyword in seen:
+                continue
+            position = 0
+            for character in query[1:]:
+                position = form.find(character, position + 1)
+                if position < 0:
+                    break
+            else:
+                scored.append((position, len(form), keyword))
+        if take(keyword for *_, keyword in heapq.nsmallest(n, scored)):
+            return result
+
+        # Keywords with a word in the description starting with the text
+        tokens = self._tokens
+        first = bisect_left(tokens, query)
+        last = bisect_left(tokens, query + _last_character)
+        described = set()
+        for token in tokens[first:last]:
+            described.update(self._token_keywords[token])
+        described.difference_update(seen)
+        take(heapq.nsmallest(n, described, key=lambda k: (len(k), k)))
+        return result
+
+    def count(self, prefix):
+        """The number of keywords starting with the prefix.
+
+        Parameters
+        ----------
+        prefix : str
+            The prefix.
+
+        Returns
+        -------
+        int
+        """
+        node = self._find(prefix)
+        return 0 if node is None else node[2] - node[1]
+
+    def _find(self, prefix):
+        """The node of the trie for a prefix, or None if no keywords start with it."""
+        node = self._root
+        for character in prefix:
+            node = node[0].get(character)
+            if node is None:
+                return None
+        return node
+
+    def lcp(self, prefix):
+        """The longest common prefix of the keywords starting with the prefix.
+
+        Parameters
+        ----------
+        prefix : str
+            The prefix.
+
+        Returns
+        -------
+        str or None
+            The longest common prefix, or None if no keywords start with the prefix.
+        """
+        node = self._find(prefix)
+        if node is None:
+            return None
+        return lcp(self._keywords[node[1]], self._keywords[node[2] - 1])
+
+    def matches(self, prefix):
+        """The keywords starting with the prefix, in sorted order.
+
+        Parameters
+        ----------
+        prefix : str
+            The prefix.
+
+        Returns
+        -------
+        [str]
+        """
+        node = self._find(prefix)
+        if node is None:
+            return []
+        return self._keywords[node[1] : node[2]]
+
+    @staticmethod
+    def normalize(text):
+        """The form of text used for completion: lower case, letters and digits."""
+        return "".join(
+            character for character in text.casefold() if character.isalnum()
+        )
+
+    def resolve(self, keyword):
+        """The full keyword given a keyword or a unique prefix of one.
+
+        Parameters
+        ----------
+        keyword : str
+            The keyword or prefix.
+
+        Returns
+        -------
+        str or None
+            The keyword, or None if it is not a keyword and is the prefix of none or
+            several keywords.
+        """
+        if keyword in self.metadata:
+            return keyword
+        node = self._find(keyword)
+        if node is None or node[2] - node[1] != 1:
+            return None
+        return self._keywords[node[1]]
+
+    def _prepare(self):
+        """Make the normalized keywords and the index of the words in descriptions."""
+        self._normalized = sorted(
+            (self.normalize(keyword), keyword) for keyword in self._keywords
+        )
+        token_keywords = {}
+        for keyword, data in self.metadata.items():
+            description = data.get("description", "")
+            for token in set(re.findall(r"[^\W_]+", description.casefold())):
+                token_keywords.setdefault(token, []).append(keyword)
+        self._token_keywords = token_keywords
+        self._tokens = sorted(token_keywords)
@@ -0,0 +1,414 @@
+# -*- coding: utf-8 -*-
+
+"""The metadata for keywords compiled into records for fast validation and output.
+
+The metadata for a keyword is a dictionary which may contain
+
+    description : str
+        What the keyword does.
+    takes values : int
+        Present if the keyword takes a value.
+    default : str
+        The default value.
+    format : str
+        The format for the keyword with a value, e.g. "{}({})", given the keyword and
+        value. The default is "{}={}".
+    type : str
+        The type of the value: "integer", "float" or "string" (the default).
+    minimum, maximum : int or float
+        The range of numerical values.
+    enumeration : [str]
+        The allowed values.
+
+Checking a value against this on every keystroke, and formatting the keywords,
+would otherwise mean a series of dictionary lookups per keyword each time, so each
+keyword's metadata is compiled once into a `KeywordRecord`. The records for a
+metadata dictionary are shared by all the widgets using it; use
+`KeywordSchema.for_metadata` to get them.
+
+The schema also parses lines of keywords, such as those in MOPAC input, understanding
+the format strings, so that formatting the keywords and parsing them again gives the
+same keywords and values.
+"""
+
+import logging
+import re
+import string
+
+from seamm_widgets.metadata_cache import SharedByMetadata
+
+logger = logging.getLogger(__name__)
+
+# A keyword in a line: text up to a space, where quoted or bracketed text may
+# contain spaces. Quotes only start quoted text at the start of a keyword or value,
+# so that e.g. the apostrophe in "don't" is an ordinary character, as is any quote or
+# bracket without a partner to close it.
+_quoted_or_bracketed = (
+    r"""(?<![^\s=,(\[{])"[^"]*"|(?<![^\s=,(\[{])'[^']*'"""
+    r"""|\([^)]*\)|\[[^\]]*\]|\{[^}]*\}"""
+)
+_token_re = re.compile(rf"(?:{_quoted_or_bracketed}|\S)+")
+# The pieces of text: quoted or bracketed text, or single characters
+_piece_re = re.compile(rf"{_quoted_or_bracketed}|.", re.DOTALL)
+# A character that starts quoted or bracketed text if it is closed
+_opening_re = re.compile(r"""[(\[{]|(?<![^\s=,(\[{])["']""")
+
+# The converters for the types of values
+_types = {
+    "integer": int,
+    "int": int,
+    "float": float,
+    "real": float,
+    "string": None,
+    "str": None,
+}
+
+
+def tokenize(line):
+    """Split a line into the text of the keywords.
+
+    Keywords are separated by spaces, except for spaces in quotes, parentheses,
+    brackets or braces, e.g. 'METAL=(Zn, Cu)' is one keyword. A quote or bracket
+    that is not closed is kept as an ordinary character.
+
+    Parameters
+    ----------
+    line : str
+        The line of keywords.
+
+    Returns
+    -------
+    [str]
+    """
+    return _token_re.findall(line)
+
+
+def quote(value):
+    """A value, quoted if needed for it to be read back as the same value.
+
+    Values are quoted if they have spaces, start and end with the same quote, or
+    have a quote or bracket that is not closed, since it would be closed by one in
+    the following keywords. A value with spaces and both kinds of quotes cannot be
+    quoted reliably.
+
+    Parameters
+    ----------
+    value : str
+        The value.
+
+    Returns
+    -------
+    str
+    """
+    if tokenize(value) == [value] and unquote(value) == value and not unclosed(value):
+        return value
+    return f"'{value}'" if '"' in value else f'"{value}"'
+
+
+def unclosed(text):
+    """Whether text has a quote or bracket that starts quoted or bracketed text,
+    but is not closed.
+
+    Parameters
+    ----------
+    text : str
+        The text.
+
+    Returns
+    -------
+    bool
+    """
+    for match in _piece_re.finditer(text):
+        if len(match.group()) == 1 and _opening_re.match(text, match.start()):
+            return True
+    return False
+
+
+def unquote(value):
+    """A value without the quotes around it, if it is quoted.
+
+    Parameters
+    ----------
+    value : str
+        The value.
+
+    Returns
+    -------
+    str
+    """
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+
+def _format_pattern(format_string):
+    """A regular expression matching the output of a format string for a keyword.
+
+    Parameters
+    ----------
+    format_string : str
+        The format, given the keyword and value as the first and second arguments.
+
+    Returns
+    -------
+    re.Pattern or None
+        The pattern with groups 'keyword' and 'value', or None if the format is not
+        understood.
+    """
+    parts = []
+    seen = set()
+    position = 0
+    try:
+        for literal, field, _, _ in string.Formatter().parse(format_string):
+            parts.append(re.escape(literal))
+            if field is None:
+                continue
+            if field == "":
+                index = position
+                position += 1
+            else:
+                index = int(field)
+            name = "keyword" if index == 0 else "value"
+            if name in seen:
+                parts.append(f"(?P={name})")
+            else:
+                seen.add(name)
+                parts.append(f"(?P<{name}>.+?)" if index == 0 else f"(?P<{name}>.*?)")
+    except ValueError:
+        return None
+    if seen != {"keyword", "value"}:
+        return None
+    return re.compile("".join(parts))
+
+
+class KeywordRecord(object):
+    """The compiled metadata for one keyword.
+
+    Parameters
+    ----------
+    keyword : str
+        The keyword.
+    definition : dict
+        The metadata for the keyword.
+    """
+
+    __slots__ = (
+        "choices",
+        "default",
+        "description",
+        "format_string",
+        "formatter",
+        "keyword",
+        "maximum",
+        "minimum",
+        "takes_values",
+        "type",
+    )
+
+    def __init__(self, keyword, definition):
+        self.keyword = keyword
+        self.description = definition.get("description", "")
+        self.takes_values = "takes values" in definition
+        self.default = definition.get("default", "")
+        self.format_string = definition.get("format", "{}={}")
+        self.formatter = self.format_string.format
+
+        type_ = definition.get("type", "string")
+        if type_ not in _types:
+            logger.warning(f"Unknown type '{type_}' for the keyword {keyword}")
+        self.type = _types.get(type_)
+        self.minimum = definition.get("minimum")
+        self.maximum = definition.get("maximum")
+        if "enumeration" in definition:
+            self.choices = frozenset(str(value) for value in definition["enumeration"])
+        else:
+            self.choices = None
+
+    def __repr__(self):
+        return f"KeywordRecord({self.keyword!r})"
+
+    def format(self, value):
+        """The keyword with a value, as text.
+
+        Parameters
+        ----------
+        value : str
+            The value.
+
+        Returns
+        -------
+        str
+        """
+        return self.formatter(self.keyword, value)
+
+    def is_valid(self, value):
+        """Whether a value is acceptable for the keyword.
+
+        An empty value is valid, meaning the keyword is given without a value.
+
+        Parameters
+        ----------
+        value : str
+            The value as text.
+
+        Returns
+        -------
+        bool
+        """
+        value = value.strip()
+        if value == "":
+            return True
+        if self.choices is not None and value not in self.choices:
+            return False
+        if self.type is None:
+            return True
+        try:
+            number = self.type(value)
+        except ValueError:
+            return False
+        if self.minimum is not None and number < self.minimum:
+            return False
+        if self.maximum is not None and number > self.maximum:
+            return False
+        return True
+
+
+class KeywordSchema(SharedByMetadata):
+    """The compiled metadata for a set of keywords.
+
+    Parameters
+    ----------
+    metadata : dict(str: dict)
+        The metadata for the keywords, keyed by keyword.
+    """
+
+    def __init__(self, metadata):
+        super().__init__(metadata)
+        self.records = {
+            keyword: KeywordRecord(keyword, definition)
+            for keyword, definition in metadata.items()
+        }
+        # The patterns for parsing the formats other than the default
+        self._patterns = {}
+        for record in self.records.values():
+            format_string = record.format_string
+            if format_string != "{}={}" and format_string not in self._patterns:
+                pattern = _format_pattern(format_string)
+                if pattern is None:
+                    logger.warning(
+                        f"Cannot parse the format '{format_string}' for the keyword "
+                        f"{record.keyword}"
+                    )
+                self._patterns[format_string] = pattern
+
+    def __contains__(self, keyword):
+        return keyword in self.records
+
+    def __getitem__(self, keyword):
+        return self.records[keyword]
+
+    def __len__(self):
+        return len(self.records)
+
+    @classmethod
+    def for_metadata(cls, metadata):
+        """The schema for metadata, shared with any other users of the same metadata.
+
+        The schema is compiled again if keywords have been added to, removed from or
+        renamed in the metadata since it was compiled.
+
+        Parameters
+        ----------
+        metadata : dict(str: dict)
+            The metadata for the keywords.
+
+        Returns
+        -------
+        KeywordSchema
+        """
+        schema = cls._shared(metadata)
+        if schema is None:
+            schema = cls(metadata)
+            schema._share()
+        return schema
+
+    def format(self, keyword, value):
+        """The keyword with a value, as text that parse_line() reads back.
+
+        The value is only quoted if it needs to be, so e.g. a value within the
+        parentheses of the format "{}({})" may contain spaces unquoted.
+
+        Parameters
+        ----------
+        keyword : str
+            The keyword, which need not be in the metadata.
+        value : str
+            The value.
+
+        Returns
+        -------
+        str
+        """
+        record = self.records.get(keyword)
+        formatter = "{}={}".format if record is None else record.formatter
+        text = formatter(keyword, value)
+        if not unclosed(text) and self.parse_line(text) == [(keyword, value)]:
+            return text
+        return formatter(keyword, quote(value))
+
+    def get(self, keyword, default=None):
+        """The record for a keyword, or the default if it is not a keyword."""
+        return self.records.get(keyword, default)
+
+    def parse(self, text):
+        """Split the text of a keyword into the keyword and its value.
+
+        Parameters
+        ----------
+        text : str
+            The keyword, possibly with a value, e.g. "CHARGE=1".
+
+        Returns
+        -------
+        str, str or None
+            The keyword and its value, or None if there is no value. Any quotes
+            around the value are removed.
+        """
+        records = self.records
+        if text in records:
+            return text, None
+
+        # Values may contain "=", so split on the first one
+        keyword, equals, value = text.partition("=")
+        if equals != "":
+            record = records.get(keyword)
+            if record is not None and record.format_string == "{}={}":
+                return keyword, unquote(value)
+
+        for format_string, pattern in self._patterns.items():
+            if pattern is None:
+                continue
+            match = pattern.fullmatch(text)
+            if match is not None:
+                record = records.get(match["keyword"])
+                if record is not None and record.format_string == format_string:
+                    return match["keyword"], unquote(match["value"])
+
+        if equals != "":
+            return keyword, unquote(value)
+        return text, None
+
+    def parse_line(self, line):
+        """Split a line into keywords and their values.
+
+        Parameters
+        ----------
+        line : str
+            The line of keywords, e.g. "AM1 CHARGE=1 EPS=78.4".
+
+        Returns
+        -------
+        [(str, str or None)]
+            The keywords and values, with None for keywords without a value.
+        """
+        return [self.parse(text) for text in tokenize(line)]
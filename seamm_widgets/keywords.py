@@ -7,21 +7,18 @@ delete. It provides tab completion as the user types, highlights incorrect
 keywords in red and generally helps the user find the keywords they wish.
 """
 
-from itertools import takewhile
 import logging
 import Pmw
 import seamm_widgets as sw
+from seamm_widgets.keyword_browser import KeywordBrowser
+from seamm_widgets.keyword_index import KeywordIndex, lcp  # noqa: F401
+from seamm_widgets.keyword_schema import KeywordSchema, tokenize
 import tkinter as tk
 import tkinter.ttk as ttk
 
 module_logger = logging.getLogger(__name__)
 
 
-def lcp(*s):
-    """Longest common prefix of strings"""
-    return "".join(a for a, b in takewhile(lambda x: x[0] == x[1], zip(min(s), max(s))))
-
-
 class Keywords(sw.ScrolledFrame):
     """A widget to handle manual input of keywords with optional values"""
 
@@ -41,20 +38,38 @@ class Keywords(sw.ScrolledFrame):
         background=None,
         logger=module_logger,
         default_number_values=None,
+        n_completions=10,
+        validation_delay=None,
         **kwargs,
     ):
-        """ """
+        """Create the widget.
+
+        Parameters
+        ----------
+        validation_delay : int
+            If None, keywords are checked on each keystroke. Otherwise the checking
+            is deferred and done once for all the keystrokes in the meantime: when
+            Tk is next idle if 0, or once there have been no keystrokes for this
+            many milliseconds.
+        """
         self.logger = logger
         self._keywords = ""
         self._max_width = 0
+        self._index = None
+        self._schema = None
         self._working_keywords = None
         self._add_widget = None
-        self._dialog = None
+        self._pool = []
+        self._value_pool = []
         self.keyword_cb = None
         self.value_cb = None
         self.set_keyword_cb = None
         self.popup_menu = None
         self.default_number_values = default_number_values
+        self.n_completions = n_completions
+        self.validation_delay = validation_delay
+        self._pending = {}
+        self._validation_id = None
 
         class_ = kwargs.pop("class_", "MKeywords")
 
@@ -93,18 +108,17 @@ class Keywords(sw.ScrolledFrame):
     @keywords.setter
     def keywords(self, value):
         self.logger.debug("Keywords::keywords: " + str(value))
-        self.clear()
-        self._working_keywords = []
         self._keywords = value
+        self._check_metadata()
+        rows = []
         if value is not None:
-            for keyword in value:
-                if "=" in keyword:
-                    keyword, value = keyword.split("=")
-                    self._working_keywords.append({"keyword": keyword, "value": value})
+            for text in value:
+                keyword, text = self._parse(text)
+                if text is None:
+                    rows.append({"keyword": keyword})
                 else:
-                    self._working_keywords.append({"keyword": keyword})
-        self.logger.debug("  keywords.setter call layout_keywords")
-        self.layout_keywords()
+                    rows.append({"keyword": keyword, "value": text})
+        self._set_rows(rows)
 
     @property
     def metadata(self):
@@ -115,22 +129,20 @@ class Keywords(sw.ScrolledFrame):
     def metadata(self, value):
         self._metadata = value
         self._max_width = 0
-        if value is not None:
-            for keyword in self._metadata.keys():
-                width = len(keyword)
-                if width > self._max_width:
-                    self._max_width = width
-            self._max_width += 3  # a little padding...
+        if value is None:
+            self._index = None
+            self._schema = None
+        else:
+            self._update_metadata()
             self.keywords = self._keywords
 
     def clear(self):
-        """Remove the widgets."""
+        """Remove the widgets, keeping them to reuse for the next keywords."""
+        self._pending = {}
         if self._working_keywords is not None:
             for d in self._working_keywords:
                 if "widgets" in d:
-                    for widget in d["widgets"].values():
-                        widget.destroy()
-                    del d["widgets"]
+                    self._release_widgets(d.pop("widgets"))
 
     def reset(self):
         """Remove any changes made in the dialog."""
@@ -142,188 +154,187 @@ class Keywords(sw.ScrolledFrame):
         self.logger.debug("Keywords::layout_keywords")
 
         frame = self.innerframe
+        self._check_metadata()
 
         # Unpack any widgets
         for slave in frame.grid_slaves():
             slave.grid_forget()
 
-        # Callbacks
-        if self.keyword_cb is None:
-            self.keyword_cb = frame.register(self.handle_keyword)
-        if self.value_cb is None:
-            self.value_cb = frame.register(self.validate_keyword_value)
-        if self.set_keyword_cb is None:
-            self.set_keyword_cb = frame.register(self.set_keyword)
+        for row in range(len(self._working_keywords)):
+            self.layout_row(row)
 
-        row = -1
-        for d in self._working_keywords:
-            self.logger.debug(d)
-            row += 1
-            keyword = d["keyword"]
-            if "widgets" not in d:
-                widgets = d["widgets"] = {}
-            else:
-                widgets = d["widgets"]
+        self._grid_add_widget()
 
-            # The button to remove a row...
-            if "remove" in widgets:
-                widgets["remove"].configure(
-                    command=lambda row=row: self.remove_keyword(row)
-                )
-            else:
-                widgets["remove"] = ttk.Button(
-                    frame,
-                    text="-",
-                    width=2,
-                    command=lambda row=row: self.remove_keyword(row),
-                    takefocus=True,
-                )
+        frame.grid_columnconfigure(2, weight=1)
 
-            if "entry" in widgets:
-                widgets["entry"].configure(
-                    validatecommand=(
-                        self.keyword_cb,
-                        keyword,
-                        row,
-                        "%W",
-                        "%P",
-                        "%s",
-                        "%d",
-                        "%S",
-                    )
-                )
-            else:
-                # the name of the keyword
-                widgets["entry"] = ttk.Entry(
-                    frame,
-                    width=self._max_width,
-                    validate="key",
-                    validatecommand=(
-                        self.keyword_cb,
-                        keyword,
-                        row,
-                        "%W",
-                        "%P",
-                        "%s",
-                        "%d",
-                        "%S",
-                    ),
-                    takefocus=True,
-                    style="Red.TEntry",
-                )
-                widgets["entry"].insert("end", keyword)
-            widgets["entry"].bind(
-                "<KeyPress-Tab>",
-                lambda event=None, row=row: self.handle_tab(event, row),
+    def layout_row(self, row):
+        """Create or update the widgets for one row of the table and grid them.
+
+        Only the widgets of the row are touched, so this is used when a keyword is
+        added or changed, rather than laying out the whole table again.
+
+        Parameters
+        ----------
+        row : int
+            The row, i.e. the index of the keyword.
+        """
+        self.logger.debug(f"Keywords::layout_row {row}")
+
+        frame = self.innerframe
+        self._register_callbacks()
+
+        d = self._working_keywords[row]
+        self.logger.debug(d)
+        keyword = d["keyword"]
+        if "widgets" in d:
+            widgets = d["widgets"]
+        elif len(self._pool) > 0:
+            # Reuse the widgets of a row that was cleared or removed
+            widgets = d["widgets"] = self._pool.pop()
+            entry = widgets["entry"]
+            entry.configure(
+                width=self._max_width,
+                style="TEntry" if keyword in self._metadata else "Red.TEntry",
             )
+            self._set_text(entry, keyword)
+        else:
+            widgets = d["widgets"] = {}
 
-            self.logger.debug("  widgets: " + str(widgets))
-            widgets["remove"].grid(row=row, column=0, sticky=tk.W)
-            col = 1
-            widgets["entry"].grid(row=row, column=col, stick=tk.EW)
-            col += 1
+        # The button to remove a row...
+        if "remove" not in widgets:
+            widgets["remove"] = ttk.Button(frame, text="-", width=2, takefocus=True)
 
-            if keyword == "" and self.default_number_values is None:
-                continue
+        if "entry" not in widgets:
+            # the name of the keyword. Validation is turned on after inserting the
+            # keyword, so that filling in the entry does not call back to here.
+            widgets["entry"] = ttk.Entry(
+                frame,
+                width=self._max_width,
+                validate="none",
+                takefocus=True,
+                style="TEntry" if keyword in self._metadata else "Red.TEntry",
+            )
+            widgets["entry"].insert("end", keyword)
+            widgets["entry"].configure(validate="key")
 
-            if keyword not in self._metadata:
-                # See if it is a unique prefix
-                possible_keywords = []
-                for trial in self._metadata:
-                    if trial.startswith(keyword):
-                        possible_keywords.append(trial)
-                if len(possible_keywords) == 1:
-                    keyword = possible_keywords[0]
-
-            if "value" in d:
-                value = d["value"]
-            else:
-                value = ""
-            if keyword not in self._metadata:
-                if self.default_number_values is None:
-                    continue
+        self._grid_row(row)
+
+        if keyword == "" and self.default_number_values is None:
+            self._forget_value(widgets)
+            return
+
+        if keyword not in self._metadata:
+            # See if it is a unique prefix
+            full_keyword = self._index.resolve(keyword)
+            if full_keyword is not None:
+                keyword = full_keyword
+
+        if "value" in d:
+            value = d["value"]
+        else:
+            value = ""
+        if keyword not in self._metadata:
+            if self.default_number_values is None:
+                self._forget_value(widgets)
+                return
+        else:
+            record = self._record(keyword)
+            if not record.takes_values and self.default_number_values is None:
+                self._forget_value(widgets)
+                return
+            if "value" not in d:
+                value = record.default
+        d["value"] = value
+        if "value" not in widgets:
+            validatecommand = (
+                self.value_cb,
+                keyword,
+                "%W",
+                "%P",
+                "%s",
+                "%d",
+                "%S",
+            )
+            if len(self._value_pool) > 0:
+                widgets["value"] = self._value_pool.pop()
+                widgets["value"].configure(validatecommand=validatecommand)
+                self._set_text(widgets["value"], value)
+                record = self._schema.get(keyword)
+                valid = record is None or record.is_valid(value)
+                widgets["value"].configure(style="TEntry" if valid else "Red.TEntry")
             else:
-                definition = self._metadata[keyword]
-                if (
-                    "takes values" not in definition
-                    and self.default_number_values is None
-                ):
-                    continue
-                if "value" not in d:
-                    value = definition["default"]
-            d["value"] = value
-            if "value" not in widgets:
                 widgets["value"] = ttk.Entry(
                     frame,
                     width=20,
                     validate="key",
-                    validatecommand=(
-                        self.value_cb,
-                        keyword,
-                        "%W",
-                        "%P",
-                        "%s",
-                        "%d",
-                        "%S",
-                    ),
+                    validatecommand=validatecommand,
                     takefocus=True,
                 )
                 widgets["value"].insert("end", value)
-            widgets["value"].focus_set()
-
-            widgets["value"].grid(row=row, column=col, sticky=tk.EW)
-
-        # The button to add a row...
-        row += 1
-        if self._add_widget is None:
-            self._add_widget = ttk.Button(
-                frame,
-                text="+",
-                width=5,
-                command=self.add_keyword,
-                takefocus=True,
-            )
-            self._add_widget.focus_set()
-        self._add_widget.lift()
-        self._add_widget.grid(row=row, column=0, columnspan=3, sticky=tk.W)
-
-        frame.grid_columnconfigure(2, weight=1)
+        widgets["value"].focus_set()
+
+        widgets["value"].grid(row=row, column=2, sticky=tk.EW)
+
+    def destroy(self):
+        """Cancel any pending check of the keywords, then destroy the widget."""
+        if self._validation_id is not None:
+            self.after_cancel(self._validation_id)
+            self._validation_id = None
+        super().destroy()
+
+    def flush_validation(self):
+        """Check any keywords whose checking was deferred."""
+        if self._validation_id is not None:
+            self.after_cancel(self._validation_id)
+            self._validation_id = None
+        if len(self._pending) == 0:
+            return
+        pending = self._pending
+        self._pending = {}
+        for row, d in enumerate(self._working_keywords):
+            if id(d) in pending:
+                self._check_keyword(row, d["widgets"]["entry"])
 
     def get_keywords(self):
         """Get the values of the keywords from the widgets"""
         self.logger.debug("Keywords::get_keywords")
+        return self._get_keywords()
 
-        keywords = []
-        for d in self._working_keywords:
-            widgets = d["widgets"]
-            keyword = widgets["entry"].get()
+    def get_text(self):
+        """The keywords and their values as a line of text.
 
-            if keyword not in self._metadata:
-                # See if it is a unique prefix
-                possible_keywords = []
-                for trial in self._metadata:
-                    if trial.startswith(keyword):
-                        possible_keywords.append(trial)
-                if len(possible_keywords) == 1:
-                    keyword = possible_keywords[0]
-
-            if "value" in widgets:
-                value = widgets["value"].get().strip()
-                if value == "":
-                    keywords.append(keyword)
-                else:
-                    if (
-                        keyword in self._metadata
-                        and "format" in self._metadata[keyword]
-                    ):
-                        definition = self._metadata[keyword]
-                        result = definition["format"].format(keyword, value)
-                    else:
-                        result = f"{keyword}={value}"
-                    keywords.append(result)
-            else:
-                keywords.append(keyword)
-        return keywords
+        Values are quoted where needed, e.g. if they contain spaces, so that
+        set_text() gives back the same keywords and values.
+
+        Returns
+        -------
+        str
+        """
+        return " ".join(self._get_keywords(quoted=True))
+
+    def set_text(self, line):
+        """Set the keywords from a line of text, such as MOPAC input.
+
+        The keywords are separated by spaces, except within quotes or brackets, and
+        may have values in the form given by the "format" in the metadata, by default
+        KEYWORD=value. Keywords that take values but have none in the line are left
+        without a value, rather than given the default, so that get_text() gives back
+        the same line.
+
+        Parameters
+        ----------
+        line : str
+            The keywords.
+        """
+        self.logger.debug("Keywords::set_text: " + line)
+        texts = tokenize(line)
+        self._keywords = texts
+        self._check_metadata()
+        rows = []
+        for text in texts:
+            keyword, value = self._parse(text)
+            rows.append({"keyword": keyword, "value": "" if value is None else value})
+        self._set_rows(rows)
 
     def handle_keyword(self, keyword, row, w_name, value, before, action, changed):
         """Handle typing in a combobox for the keyword
@@ -354,11 +365,20 @@ class Keywords(sw.ScrolledFrame):
         self.logger.debug("\tmetadata: " + str(d))
         d["keyword"] = value
 
-        if value in self._metadata:
-            w.configure(style="TEntry")
-            self.layout_keywords()
+        if self.validation_delay is None:
+            self._check_keyword(int(row), w)
         else:
-            w.configure(style="Red.TEntry")
+            # Remember the row and check it later, with any other keystrokes
+            self._pending[id(d)] = d
+            if self.validation_delay == 0:
+                if self._validation_id is None:
+                    self._validation_id = self.after_idle(self.flush_validation)
+            else:
+                if self._validation_id is not None:
+                    self.after_cancel(self._validation_id)
+                self._validation_id = self.after(
+                    self.validation_delay, self.flush_validation
+                )
 
         return True
 
@@ -371,13 +391,9 @@ class Keywords(sw.ScrolledFrame):
 
         w = self["keyword_" + str(row)]
         current = w.get().upper()
+        self._check_metadata()
 
-        keywords = []
-        for keyword in self._metadata:
-            if keyword.startswith(current):
-                keywords.append(keyword)
-
-        w.configure(values=sorted(keywords))
+        w.configure(values=self._index.matches(current))
 
     def set_keyword_cb(self, event, w, row=None):
         self.logger.debug("Keywords::set_keyword_cb")
@@ -389,61 +405,21 @@ class Keywords(sw.ScrolledFrame):
     def add_keyword(self, keyword=""):
         """Add a keyword to the input"""
         self._working_keywords.append({"keyword": keyword})
-        self.layout_keywords()
+        self.layout_row(len(self._working_keywords) - 1)
+        self._grid_add_widget()
         d = self._working_keywords[-1]
         d["widgets"]["entry"].focus_set()
 
     def post_keyword_dialog(self):
-        """Put up the dialog with the appropriate list of keywords"""
-        if self._dialog is None:
-            """Create the dialog!"""
-            self._dialog = Pmw.Dialog(
-                self.toplevel,
-                buttons=("OK", "Help", "Cancel"),
-                defaultbutton="OK",
-                master=self._dialog,
-                title="Add keyword",
-                command=self.handle_keyword_dialog,
-            )
-            self._dialog.withdraw()
-            frame = ttk.Frame(self._dialog.interior())
-            frame.pack(expand=tk.YES, fill=tk.BOTH)
-            self["keyword frame"] = frame
-
-            w = self["keyword tree"] = ttk.Treeview(
-                frame,
-                columns=("Keyword", "Description"),
-            )
-            w.pack(expand=tk.YES, fill=tk.BOTH)
-
-            w.heading("Keyword", text="Keyword")
-            w.heading("Description", text="Description")
-            w.column("#0", minwidth=1, width=1, stretch=False)
-            w.column("Keyword", width=100, stretch=False)
-
-            for keyword in self._metadata:
-                description = self._metadata[keyword]["description"]
-                w.insert("", "end", iid=keyword, values=(keyword, description))
-
-        self._dialog.activate(geometry="centerscreenfirst")
+        """Put up the dialog for browsing the keywords, and add those chosen.
 
-    def handle_keyword_dialog(self, result):
-        if result is None or result == "Cancel":
-            self._dialog.deactivate(result)
-            return
-
-        if result == "Help":
-            # display help!!!
-            return
-
-        if result != "OK":
-            self._dialog.deactivate(result)
-            raise RuntimeError("Don't recognize dialog result '{}'".format(result))
-
-        self._dialog.deactivate(result)
-
-        keyword = self["keyword tree"].selection()
-        self.logger.debug(keyword)
+        The dialog is shared with any other Keywords widgets using the same
+        metadata.
+        """
+        browser = KeywordBrowser.for_metadata(self._metadata, self)
+        for keyword in browser.ask():
+            self.logger.debug(f"Adding {keyword} from the dialog")
+            self.add_keyword(keyword)
 
     def validate_keyword_value(self, keyword, w_name, value, before, action, changed):
         """Handle typing in a combobox for the keyword
@@ -457,7 +433,6 @@ class Keywords(sw.ScrolledFrame):
             changed: the text being inserted or deleted
         """
 
-        # w = self._dialog.nametowidget(w_name)
         self.logger.debug("Validating the value of a keyword")
         self.logger.debug("\tkeyword: {}".format(keyword))
         self.logger.debug("\t  value: {}".format(value))
@@ -465,15 +440,26 @@ class Keywords(sw.ScrolledFrame):
         self.logger.debug("\t action: {}".format(action))
         self.logger.debug("\tchanged: {}".format(changed))
 
+        # Values that are not valid are shown in red rather than refused, since
+        # they may be on the way to a valid value, e.g. "-" or "1e".
+        record = self._schema.get(keyword)
+        if record is not None:
+            w = self.nametowidget(w_name)
+            w.configure(style="TEntry" if record.is_valid(value) else "Red.TEntry")
+
         return True
 
     def remove_keyword(self, row=None):
         """Remove a keyword from dd to input"""
         self.logger.debug("remove row {}".format(row))
-        for widget in self._working_keywords[row]["widgets"].values():
-            widget.destroy()
-        del self._working_keywords[row]
-        self.layout_keywords()
+        d = self._working_keywords.pop(row)
+        self._pending.pop(id(d), None)
+        self._release_widgets(d["widgets"])
+
+        # Only the rows below the one removed need to move up
+        for i in range(row, len(self._working_keywords)):
+            self._grid_row(i)
+        self._grid_add_widget()
 
     def handle_tab(self, event=None, row=None):
         """Handle a tab in a keyword entry field"""
@@ -487,16 +473,14 @@ class Keywords(sw.ScrolledFrame):
         if current == "":
             return "break"
 
+        self._check_metadata()
         defs = self._metadata
-        keywords = []
-        for keyword in defs:
-            if keyword.startswith(current):
-                keywords.append(keyword)
+        n_keywords = self._index.count(current)
 
-        if len(keywords) == 0:
-            return "break"
-
-        prefix = lcp(*keywords)
+        if n_keywords > 0:
+            prefix = self._index.lcp(current)
+        else:
+            prefix = current
         self.logger.debug('prefix = "{}", current = "{}"'.format(prefix, current))
 
         if prefix != current:
@@ -505,24 +489,28 @@ class Keywords(sw.ScrolledFrame):
             data["keyword"] = prefix
             if prefix in defs:
                 w.configure(style="TEntry")
-                self.layout_keywords()
+                self.layout_row(row)
                 w.tk_focusNext().focus()
+        elif n_keywords == 1:
+            w.tk_focusNext().focus()
         else:
-            if len(keywords) == 1:
-                w.tk_focusNext().focus()
-            else:
-                if self.popup_menu is not None:
-                    self.popup_menu.destroy()
-
-                self.popup_menu = tk.Menu(self.innerframe, tearoff=0)
-                for keyword in keywords:
-                    description = defs[keyword]["description"]
-                    self.popup_menu.add_command(
-                        label="{}: {}".format(keyword, description),
-                        command=(self.set_keyword_cb, w, keyword, row),
-                    )
-                    x, y = w.winfo_pointerxy()
-                self.popup_menu.tk_popup(x, y, 0)
+            # Offer the best few completions, which may not start with the text
+            completions = self._index.complete(current, self.n_completions)
+            if len(completions) == 0:
+                return "break"
+
+            if self.popup_menu is not None:
+                self.popup_menu.destroy()
+
+            self.popup_menu = tk.Menu(self.innerframe, tearoff=0)
+            for keyword in completions:
+                description = defs[keyword].get("description", "")
+                self.popup_menu.add_command(
+                    label="{}: {}".format(keyword, description),
+                    command=(self.set_keyword_cb, w, keyword, row),
+                )
+            x, y = w.winfo_pointerxy()
+            self.popup_menu.tk_popup(x, y, 0)
         return "break"
 
     def set_keyword(self, w_name, keyword, row):
@@ -533,9 +521,167 @@ class Keywords(sw.ScrolledFrame):
         d = self._working_keywords[int(row)]
         d["keyword"] = keyword
         w.configure(style="TEntry")
-        self.layout_keywords()
+        self.layout_row(int(row))
         w.tk_focusNext().focus()
 
+    def _check_keyword(self, row, w):
+        """Show whether the keyword in a row is valid, laying out the row if so."""
+        if self._working_keywords[row]["keyword"] in self._metadata:
+            w.configure(style="TEntry")
+            self.layout_row(row)
+        else:
+            w.configure(style="Red.TEntry")
+
+    def _check_metadata(self):
+        """Get the index and schema again if keywords were added, removed or
+        renamed."""
+        if self._schema is not None and (self._index.stale or self._schema.stale):
+            self._update_metadata()
+
+    def _forget_value(self, widgets):
+        """Ungrid the entry for the value of a keyword, if there is one."""
+        if "value" in widgets:
+            widgets["value"].grid_forget()
+
+    def _get_keywords(self, quoted=False):
+        """The keywords with their values from the widgets, optionally quoting values
+        that would otherwise not be read back as one keyword."""
+        self.flush_validation()
+        self._check_metadata()
+
+        records = self._schema.records
+        keywords = []
+        for d in self._working_keywords:
+            widgets = d["widgets"]
+            keyword = widgets["entry"].get()
+
+            record = records.get(keyword)
+            if record is None:
+                # See if it is a unique prefix
+                full_keyword = self._index.resolve(keyword)
+                if full_keyword is not None:
+                    keyword = full_keyword
+                    record = records[keyword]
+
+            value = widgets["value"].get().strip() if "value" in widgets else ""
+            if value == "":
+                keywords.append(keyword)
+                continue
+            if quoted:
+                keywords.append(self._schema.format(keyword, value))
+                continue
+            if record is None:
+                keywords.append(f"{keyword}={value}")
+            else:
+                keywords.append(record.format(value))
+        return keywords
+
+    def _grid_add_widget(self):
+        """Grid the button to add a row below the last keyword."""
+        if self._add_widget is None:
+            self._add_widget = ttk.Button(
+                self.innerframe,
+                text="+",
+                width=5,
+                command=self.add_keyword,
+                takefocus=True,
+            )
+            self._add_widget.focus_set()
+        self._add_widget.lift()
+        self._add_widget.grid(
+            row=len(self._working_keywords), column=0, columnspan=3, sticky=tk.W
+        )
+
+    def _grid_row(self, row):
+        """Grid the widgets of a row and point their callbacks at the row.
+
+        This is all that is needed when a row moves, e.g. because one above it was
+        removed.
+        """
+        d = self._working_keywords[row]
+        widgets = d["widgets"]
+
+        widgets["remove"].configure(command=lambda row=row: self.remove_keyword(row))
+        widgets["entry"].configure(
+            validatecommand=(
+                self.keyword_cb,
+                d["keyword"],
+                row,
+                "%W",
+                "%P",
+                "%s",
+                "%d",
+                "%S",
+            )
+        )
+        widgets["entry"].bind(
+            "<KeyPress-Tab>",
+            lambda event=None, row=row: self.handle_tab(event, row),
+        )
+
+        widgets["remove"].grid(row=row, column=0, sticky=tk.W)
+        widgets["entry"].grid(row=row, column=1, sticky=tk.EW)
+        if "value" in widgets and widgets["value"].winfo_manager() == "grid":
+            widgets["value"].grid(row=row, column=2, sticky=tk.EW)
+
+    def _release_widgets(self, widgets):
+        """Ungrid the widgets of a row and put them in the pool for reuse."""
+        for widget in widgets.values():
+            widget.grid_forget()
+        value = widgets.pop("value", None)
+        if value is not None:
+            self._value_pool.append(value)
+        self._pool.append(widgets)
+
+    def _parse(self, text):
+        """Split the text of a keyword into the keyword and its value, or None."""
+        if self._schema is not None:
+            return self._schema.parse(text)
+        keyword, equals, value = text.partition("=")
+        if equals == "":
+            return text, None
+        return keyword, value
+
+    def _record(self, keyword):
+        """The compiled metadata for a keyword that is in the metadata."""
+        record = self._schema.get(keyword)
+        if record is None:
+            # The keyword was added or renamed since the schema was compiled
+            self._update_metadata()
+            record = self._schema[keyword]
+        return record
+
+    def _register_callbacks(self):
+        """Register the callbacks for the entries with Tcl, if not already done."""
+        frame = self.innerframe
+        if self.keyword_cb is None:
+            self.keyword_cb = frame.register(self.handle_keyword)
+        if self.value_cb is None:
+            self.value_cb = frame.register(self.validate_keyword_value)
+        if self.set_keyword_cb is None:
+            self.set_keyword_cb = frame.register(self.set_keyword)
+
+    def _set_rows(self, rows):
+        """Replace the keywords with new rows and lay them out in one pass."""
+        self.clear()
+        self._working_keywords = rows
+        self.logger.debug("  _set_rows call layout_keywords")
+        self.layout_keywords()
+
+    def _set_text(self, entry, text):
+        """Replace the text in an entry without validating it."""
+        validate = entry.cget("validate")
+        entry.configure(validate="none")
+        entry.delete(0, "end")
+        entry.insert("end", text)
+        entry.configure(validate=validate)
+
+    def _update_metadata(self):
+        """Get the index and schema for the metadata, shared with other widgets."""
+        self._index = KeywordIndex.for_metadata(self._metadata)
+        self._schema = KeywordSchema.for_metadata(self._metadata)
+        self._max_width = self._index.max_length + 3  # a little padding...
+
 
 if __name__ == "__main__":  # pragma: no cover
     import sys
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+"""Sharing the objects built from metadata by all the widgets using the metadata.
+
+Keyword sets such as those for MOPAC or Gaussian are large, and the indices, schemas
+and dialogs built from them are the same for every widget using the same metadata,
+so each is built once and shared. `SharedByMetadata` is the base class for these
+objects, keeping a cache for each subclass keyed by the id of the metadata.
+
+A cached object is built again if keywords have been added to, removed from or
+renamed in the metadata. Changes to the definitions of existing keywords, e.g. their
+descriptions, are not noticed; call `invalidate` after making them, which marks the
+objects as stale so that the widgets using them get new ones.
+
+By default the cache holds its objects weakly, so an object is dropped once no widget
+uses it, and the id of the metadata cannot be reused by another dictionary while the
+object is cached since the object refers to the metadata.
+"""
+
+import logging
+import weakref
+
+logger = logging.getLogger(__name__)
+
+# The caches of all the subclasses of SharedByMetadata
+_caches = []
+
+
+def invalidate(metadata):
+    """Forget the objects built from metadata, so they are built again when next used.
+
+    Parameters
+    ----------
+    metadata : dict(str: dict)
+        The metadata, which has been changed.
+    """
+    for cache in _caches:
+        for key in [key for key in cache if key[0] == id(metadata)]:
+            shared = cache.get(key)
+            if shared is not None:
+                shared._invalidate()
+
+
+class SharedByMetadata(object):
+    """A base class for objects built from metadata and shared by its users.
+
+    Subclasses are given their own cache, which holds the objects weakly unless the
+    subclass is declared with `weak=False`, in which case it must remove objects
+    itself with `_unshare` when they are no longer useful.
+
+    Parameters
+    ----------
+    metadata : dict(str: dict)
+        The metadata for the keywords, keyed by keyword.
+    """
+
+    # The shared objects, keyed by the id of the metadata and any other key
+    _cache = {}
+
+    def __init_subclass__(cls, weak=True, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._cache = weakref.WeakValueDictionary() if weak else {}
+        _caches.append(cls._cache)
+
+    def __init__(self, metadata):
+        self.metadata = metadata
+        self._keywords_seen = frozenset(metadata)
+        self._invalidated = False
+        self._cache_key = None
+
+    @classmethod
+    def _shared(cls, metadata, *key):
+        """The shared object for metadata, or None if there is none or it is stale."""
+        shared = cls._cache.get((id(metadata), *key))
+        if shared is None or shared.metadata is not metadata or shared.stale:
+            return None
+        return shared
+
+    def _share(self, *key):
+        """Share this object with other users of its metadata."""
+        self._cache_key = (id(self.metadata), *key)
+        self._cache[self._cache_key] = self
+
+    def _invalidate(self):
+        """Stop sharing this object, and mark it stale, because its metadata has
+        changed."""
+        self._invalidated = True
+        self._unshare()
+
+    def _unshare(self):
+        """Remove this object from the cache, if it is there."""
+        if self._cache.get(self._cache_key) is self:
+            del self._cache[self._cache_key]
+
+    @property
+    def stale(self):
+        """Whether keywords have been added to, removed from or renamed in the
+        metadata, or the metadata has been invalidated."""
+        return self._invalidated or self.metadata.keys() != self._keywords_seen
@@ -49,6 +49,12 @@ class MousewheelSupport(object):
         else:
             raise Exception("Horizontal factor must be an integer.")
 
+        # Bind the wheel only once in each Tk interpreter, however many widgets use
+        # the support
+        if root.tk.call("info", "exists", "::seamm_widgets_mousewheel"):
+            return
+        root.tk.call("set", "::seamm_widgets_mousewheel", 1)
+
         if OS == "Linux":
             root.bind_all("<4>", self._on_mousewheel, add="+")
             root.bind_all("<5>", self._on_mousewheel, add="+")
@@ -118,6 +124,34 @@ class MousewheelSupport(object):
 
                 widget.onMouseWheel = main_scrollbar.onMouseWheel
 
+    def scroll_handler(self, widget, orient="y", factor=None, what="units"):
+        """A handler for the mouse wheel that scrolls a widget.
+
+        Set it as the onMouseWheel of a widget given to add_support_to, e.g. to
+        scroll something other than the widget itself.
+
+        Parameters
+        ----------
+        widget : tkinter.Misc
+            The widget to scroll, with an xview or yview method.
+        orient : str = "y"
+            "x" to scroll horizontally, "y" vertically.
+        factor : int = None
+            The number of units to scroll per step of the wheel, by default the
+            horizontal or vertical factor.
+        what : str = "units"
+            The units to scroll, "units" or "pages".
+
+        Returns
+        -------
+        callable
+        """
+        if factor is None:
+            factor = self.horizontal_factor if orient == "x" else self.vertical_factor
+        return self._make_mouse_wheel_handler(
+            widget, orient, factor, what, self.natural_scroll_direction
+        )
+
     @staticmethod
     def _make_mouse_wheel_handler(
         widget, orient, factor=1, what="units", natural_scroll_direction=True
@@ -10,6 +10,7 @@ from itertools import takewhile
 import logging
 import Pmw
 import seamm_widgets as sw
+from seamm_widgets.search_picker import SearchPicker
 import tkinter as tk
 import tkinter.ttk as ttk
 
@@ -40,7 +41,7 @@ class PropertyTable(sw.ScrolledFrame):
         self._working_properties = None
         self._add_widget = None
         self._dialog = None
-        self._set_property_cb = None
+        self._picker = None
         self._labeltext = labeltext
         self.popup_menu = None
 
@@ -98,16 +99,15 @@ class PropertyTable(sw.ScrolledFrame):
                 if width > self._max_width:
                     self._max_width = width
             self._max_width += 3  # a little padding...
+            if self._picker is not None:
+                self._picker.set_items(self._picker_items())
             self.properties = self._properties
 
     def clear(self):
         """Remove the widgets."""
         if self._working_properties is not None:
             for d in self._working_properties:
-                if "widgets" in d:
-                    for widget in d["widgets"].values():
-                        widget.destroy()
-                    del d["widgets"]
+                self._release_row(d)
 
     def reset(self):
         """Remove any changes made in the dialog."""
@@ -124,85 +124,79 @@ class PropertyTable(sw.ScrolledFrame):
         for slave in frame.grid_slaves():
             slave.grid_forget()
 
-        # Callbacks
-        if self._set_property_cb is None:
-            self._set_property_cb = frame.register(self.set_property_cb)
+        for row in range(len(self._working_properties)):
+            self.layout_row(row)
 
-        row = -1
-        for d in self._working_properties:
-            self.logger.debug(d)
-            row += 1
-            _property = d["property"]
-            if "widgets" not in d:
-                widgets = d["widgets"] = {}
-            else:
-                widgets = d["widgets"]
-
-            if "remove" not in widgets:
-                # The button to remove a row...
-                widgets["remove"] = ttk.Button(
-                    frame,
-                    text="-",
-                    width=2,
-                    command=lambda row=row: self.remove_property(row),
-                    takefocus=True,
-                )
+        self._grid_add_widget()
 
-            if "name" not in widgets:
-                # the name of the property
-                widgets["name"] = ttk.Label(
-                    frame, width=self._max_width, text=_property
-                )
-                widgets["plusminus"] = ttk.Label(frame, text="±")
-                # and desired accuracy
-                widgets["accuracy"] = sw.UnitEntry(frame)
-                if "accuracy" in d:
-                    accuracy, units = d["accuracy"]
+        frame.grid_columnconfigure(2, weight=1)
+
+    def layout_row(self, row):
+        """Create the widgets for one row of the table if needed, and grid them.
+
+        Only the widgets of the row are touched, so this is used when a property is
+        added rather than laying out the whole table again.
+
+        Parameters
+        ----------
+        row : int
+            The row, i.e. the index of the property.
+        """
+        frame = self.innerframe
+
+        d = self._working_properties[row]
+        self.logger.debug(d)
+        _property = d["property"]
+        if "widgets" not in d:
+            widgets = d["widgets"] = {}
+        else:
+            widgets = d["widgets"]
+
+        if "remove" not in widgets:
+            # The button to remove a row...
+            widgets["remove"] = ttk.Button(frame, text="-", width=2, takefocus=True)
+
+        if "name" not in widgets:
+            # the name of the property
+            widgets["name"] = ttk.Label(frame, width=self._max_width, text=_property)
+            widgets["plusminus"] = ttk.Label(frame, text="±")
+            # and desired accuracy
+            widgets["accuracy"] = sw.UnitEntry(frame)
+            if "accuracy" in d:
+                accuracy, units = d["accuracy"]
+            else:
+                units = self._metadata[_property]["units"]
+                if "accuracy" in self._metadata[_property]:
+                    accuracy = self._metadata[_property]["accuracy"]
                 else:
-                    units = self._metadata[_property]["units"]
-                    if "accuracy" in self._metadata[_property]:
-                        accuracy = self._metadata[_property]["accuracy"]
-                    else:
-                        accuracy = "0.1%"
-                widgets["accuracy"].set(accuracy, units)
-
-            self.logger.debug("  widgets: " + str(widgets))
-            widgets["remove"].grid(row=row, column=0, sticky=tk.W)
-            col = 1
-            widgets["name"].grid(row=row, column=col, stick=tk.EW)
-            col += 1
-            widgets["plusminus"].grid(row=row, column=col, stick=tk.EW)
-            col += 1
-            widgets["accuracy"].grid(row=row, column=col, stick=tk.EW)
-            col += 1
-
-        # The button to add a row...
-        row += 1
-        if self._add_widget is None:
-            self._add_widget = ttk.Button(
-                frame,
-                text="+",
-                width=5,
-                command=self.add_property,
-                takefocus=True,
-            )
-            self._add_widget.focus_set()
-        self._add_widget.lift()
-        self._add_widget.grid(row=row, column=0, columnspan=3, sticky=tk.W)
+                    accuracy = "0.1%"
 
-        frame.grid_columnconfigure(2, weight=1)
+            # The entries update the accuracy in d as they are edited
+            variables = d["variables"] = (tk.StringVar(frame), tk.StringVar(frame))
+            for variable in variables:
+                variable.trace_add("write", lambda *args, d=d: self._update_accuracy(d))
+            widgets["accuracy"].entry.configure(textvariable=variables[0])
+            widgets["accuracy"].units.configure(textvariable=variables[1])
+            widgets["accuracy"].set(accuracy, units)
+
+        self.logger.debug("  widgets: " + str(widgets))
+        self._grid_row(row)
 
     def get(self):
-        """Get the values of the properties from the widgets"""
+        """Get the properties and their accuracies.
+
+        The accuracies are kept up to date as the entries are edited, so this does
+        not need to query the widgets.
+        """
         self.logger.debug("Properties::get_properties")
 
         properties = []
         for d in self._working_properties:
-            widgets = d["widgets"]
-            _property = widgets["name"].cget("text")
-            accuracy = widgets["accuracy"].get()
-
-            properties.append((_property, accuracy))
+            value, units = d["accuracy"]
+            if units == "":
+                properties.append((d["property"], value))
+            else:
+                properties.append((d["property"], (value, units)))
 
         return properties
 
@@ -211,33 +205,87 @@ class PropertyTable(sw.ScrolledFrame):
         self.logger.debug(_property)
 
         self._working_properties.append({"property": _property})
-        self.layout_properties()
+        self.layout_row(len(self._working_properties) - 1)
+        self._grid_add_widget()
 
     def add_property(self, _property=""):
-        """Add a property to the input"""
-        # Post a menu with the choices
-        popup_menu = tk.Menu(self.innerframe, tearoff=0)
-        current = []
-        for d, _ in self.properties:
-            current.append(d)
-
-        for _property in self._metadata:
-            if _property not in current:
-                description = self._metadata[_property]["description"]
-                popup_menu.add_command(
-                    label="{}: {}".format(_property, description),
-                    command=(self._set_property_cb, _property),
-                )
+        """Add a property to the input, letting the user pick it if not given."""
+        if _property != "":
+            self.set_property_cb(_property)
+            return
+
+        # Post a picker with the choices, less those already in the table
+        if self._picker is None:
+            self._picker = SearchPicker(
+                self.innerframe,
+                self._picker_items(),
+                command=self.set_property_cb,
+                title="Add property",
+            )
+        current = {d["property"] for d in self._working_properties}
         x, y = self.winfo_pointerxy()
-        popup_menu.tk_popup(x, y, 0)
+        self._picker.post(x, y, exclude=current)
+
+    def _picker_items(self):
+        """The names and descriptions of the properties, for the picker."""
+        return (
+            (_property, data["description"])
+            for _property, data in self._metadata.items()
+        )
 
     def remove_property(self, row=None):
         """Remove a property from dd to input"""
         self.logger.debug("remove row {}".format(row))
-        for widget in self._working_properties[row]["widgets"].values():
-            widget.destroy()
-        del self._working_properties[row]
-        self.layout_properties()
+        self._release_row(self._working_properties.pop(row))
+
+        # Only the rows below the one removed need to move up
+        for i in range(row, len(self._working_properties)):
+            self._grid_row(i)
+        self._grid_add_widget()
+
+    def _grid_add_widget(self):
+        """Grid the button to add a row below the last property."""
+        if self._add_widget is None:
+            self._add_widget = ttk.Button(
+                self.innerframe,
+                text="+",
+                width=5,
+                command=self.add_property,
+                takefocus=True,
+            )
+            self._add_widget.focus_set()
+        self._add_widget.lift()
+        self._add_widget.grid(
+            row=len(self._working_properties), column=0, columnspan=3, sticky=tk.W
+        )
+
+    def _release_row(self, d):
+        """Destroy the widgets of a row and stop tracing its entries."""
+        if "widgets" in d:
+            for widget in d.pop("widgets").values():
+                widget.destroy()
+        if "variables" in d:
+            for variable in d.pop("variables"):
+                for mode, callback in variable.trace_info():
+                    variable.trace_remove(mode, callback)
+
+    def _update_accuracy(self, d):
+        """Copy the accuracy and units for a row from its entries."""
+        value, units = d["variables"]
+        d["accuracy"] = (value.get(), units.get())
+
+    def _grid_row(self, row):
+        """Grid the widgets of a row and point the remove button at the row.
+
+        This is all that is needed when a row moves, e.g. because one above it was
+        removed.
+        """
+        widgets = self._working_properties[row]["widgets"]
+        widgets["remove"].configure(command=lambda row=row: self.remove_property(row))
+        widgets["remove"].grid(row=row, column=0, sticky=tk.W)
+        widgets["name"].grid(row=row, column=1, sticky=tk.EW)
+        widgets["plusminus"].grid(row=row, column=2, sticky=tk.EW)
+        widgets["accuracy"].grid(row=row, column=3, sticky=tk.EW)
 
 
 if __name__ == "__main__":  # pragma: no cover
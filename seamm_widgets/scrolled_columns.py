@@ -4,13 +4,67 @@
 
 This widgets has two areas: a row of titles across the top and a scrolled frame
 below it. It is used to make a table of widgets with fixed column headers.
+
+For large tables the widget can also show rows from a data source, creating widgets
+only for the rows that fit in the window and reusing them as the table is scrolled.
+See `virtualize`.
 """
 
 import seamm_widgets as sw
+from seamm_widgets.tcl_script import for_each, map_each
 import tkinter as tk
 from tkinter import ttk
 
 
+def _destroy(widgets):
+    """Destroy widgets, with a single call to Tk's destroy where possible.
+
+    Widgets with children, or whose class has its own destroy(), e.g. to cancel
+    callbacks, are destroyed one by one with their destroy() method.
+
+    Parameters
+    ----------
+    widgets : [tkinter.Misc]
+        The widgets to destroy.
+    """
+    batch = []
+    for widget in widgets:
+        if type(widget).destroy is tk.BaseWidget.destroy and len(widget.children) == 0:
+            batch.append(widget)
+        else:
+            widget.destroy()
+    if len(batch) == 0:
+        return
+
+    batch[0].tk.call("destroy", *[str(widget) for widget in batch])
+    # Tk ignores windows that are already destroyed, so this just tidies up the
+    # Python side of the widgets
+    for widget in batch:
+        widget.destroy()
+
+
+def label_cell(parent, value, widget=None):
+    """The default cell factory for virtual tables: a label showing the value.
+
+    Parameters
+    ----------
+    parent : tkinter.Misc
+        The parent for a new widget.
+    value : object
+        The value to show.
+    widget : ttk.Label
+        A label made previously by this factory, to reuse, or None.
+
+    Returns
+    -------
+    ttk.Label
+    """
+    if widget is None:
+        return ttk.Label(parent, text=value)
+    widget.configure(text=value)
+    return widget
+
+
 class ScrolledColumns(ttk.Frame):
     def __init__(self, parent, *args, **kwargs):
         """Initialize the widget"""
@@ -21,6 +75,7 @@ class ScrolledColumns(ttk.Frame):
         columns = kwargs.pop("columns", [])
         self.min_sizes = kwargs.pop("minsize", [])
         self._after_id = None
+        self._compact_id = None
 
         # list (vector) of the header widgets, _ncolumns long
         self._header_widgets = []
@@ -28,9 +83,60 @@ class ScrolledColumns(ttk.Frame):
         # list of lists (row x column) of widgets in the table
         self._widgets = []
 
+        # After rows are deleted, the first row whose widgets may still be gridded on
+        # their old row, or None if all are in place.
+        self._compact_from = None
+
+        # To keep the widths of the columns of the headers and table the same, the
+        # requested widths of the widgets in the table by column, the column of each
+        # widget, the widgets still to be measured, the columns whose widths may
+        # have changed, the requested widths of the headers, and the widths last
+        # given to the columns.
+        self._cell_widths = {}
+        self._cell_column = {}
+        self._to_measure = set()
+        self._changed_columns = set()
+        self._header_widths = None
+        self._column_widths = {}
+
+        # The widgets in the table are given this bindtag, so that they are measured
+        # again when resized, e.g. once the grid inside a composite widget settles or
+        # the text of a label is configured. The requested width last measured is
+        # kept in Tcl, so only widgets whose width has changed call back to Python.
+        self._cell_tag = f"Cell{self._w}"
+        self.tk.call(
+            "bind",
+            self._cell_tag,
+            "<Configure>",
+            "if {![info exists ::seamm_widgets_cell_width(%W)]"
+            " || [winfo reqwidth %W] != $::seamm_widgets_cell_width(%W)} "
+            f"{{{self.register(self._cell_resized)} %W}}",
+        )
+        self.tk.call(
+            "bind",
+            self._cell_tag,
+            "<Destroy>",
+            "unset -nocomplain ::seamm_widgets_cell_width(%W)",
+        )
+
         # Columns that are separators
         self._column_separators = set()
 
+        # For virtual tables, the source of the data, the cell factories, the rows
+        # of widgets that are reused, the first row shown and the number of rows of
+        # widgets showing data.
+        self._source = None
+        self._factories = None
+        self._slots = []
+        self._first = 0
+        self._n_shown = 0
+        self._n_visible = 1
+        self._overscan = 5
+        self._row_height = None
+        self._saved_wheel = None
+        self._wheel_handler = None
+        self._configure_bound = False
+
         # Create the two subframes, linking them both to the
         # horizontal scrollbar at the bottom
         # self.headers = ttk.Frame(self)
@@ -68,6 +174,14 @@ class ScrolledColumns(ttk.Frame):
 
     def cell(self, row, column, value=None):
         """Return or set the widget at the given cell"""
+        if self.virtual:
+            if value is not None:
+                raise RuntimeError("Cannot set the cells of a virtual table")
+            # Only the rows being shown have widgets
+            slot = row - self._first
+            if slot < 0 or slot >= self._n_shown:
+                return None
+            return self._slots[slot][column]
         if value is None:
             try:
                 result = self._widgets[row][column]
@@ -75,6 +189,7 @@ class ScrolledColumns(ttk.Frame):
                 raise
             return result
         else:
+            self._compact_now()
             if column >= self.ncolumns:
                 # pad the header and each row with None's
                 extra = [None] * (column - self.ncolumns + 1)
@@ -89,6 +204,7 @@ class ScrolledColumns(ttk.Frame):
                         if col in self._column_separators:
                             tmp = ttk.Label(self.table.interior(), text="|")
                             tmp.grid(row=i, column=col)
+                            self._track(tmp, col)
                             extra.append(tmp)
                         else:
                             extra.append(None)
@@ -98,35 +214,191 @@ class ScrolledColumns(ttk.Frame):
                 value = ttk.Label(self.table.interior(), text=value)
 
             value.grid(row=row, column=column)
+            if self._widgets[row][column] is not None:
+                self._untrack(self._widgets[row][column])
             self._widgets[row][column] = value
+            self._track(value, column)
 
             self._update_widths()
 
+    def append_rows(self, rows):
+        """Add rows to the end of the table, all at once.
+
+        Parameters
+        ----------
+        rows : iterable of sequences
+            The contents of the cells of each row: a widget, text for a label, or
+            None for an empty cell, or a separator in a separator column.
+
+        Returns
+        -------
+        None
+        """
+        self.insert_rows(self.nrows, rows)
+
+    def insert_rows(self, index, rows):
+        """Insert rows before the given row, all at once.
+
+        The widgets are gridded in a single call to Tk, and the column widths are
+        updated once, which is much faster than setting the cells one at a time.
+
+        Parameters
+        ----------
+        index : int
+            The row to insert before. The number of rows appends the rows.
+        rows : iterable of sequences
+            The contents of the cells of each row: a widget, text for a label, or
+            None for an empty cell, or a separator in a separator column.
+
+        Returns
+        -------
+        None
+        """
+        if self.virtual:
+            raise RuntimeError("Add rows to a virtual table through its source")
+
+        rows = [list(row) for row in rows]
+        if len(rows) == 0:
+            return
+        index = max(0, min(index, self.nrows))
+        self._compact_now()
+
+        # Add any columns needed
+        ncolumns = max(len(row) for row in rows)
+        if ncolumns > self.ncolumns:
+            extra = [None] * (ncolumns - self.ncolumns)
+            self._header_widgets.extend(extra)
+            for row_of_widgets in self._widgets:
+                row_of_widgets.extend(extra)
+        ncolumns = self.ncolumns
+
+        parent = self.table.interior()
+        separators = self._column_separators
+        new_rows = []
+        # Each item is (path, row, column)
+        grid = []
+        for i, row in enumerate(rows, start=index):
+            widgets = []
+            for column in range(ncolumns):
+                value = row[column] if column < len(row) else None
+                if value is None and column in separators:
+                    value = "|"
+                if value is None:
+                    widgets.append(None)
+                    continue
+                if isinstance(value, str):
+                    widget = ttk.Label(parent, text=value)
+                else:
+                    widget = value
+                grid.append((widget._w, i, column))
+                widgets.append(widget)
+                self._track(widget, column)
+            new_rows.append(widgets)
+
+        # Move the rows after the new ones down
+        for i, row in enumerate(self._widgets[index:], start=index + len(rows)):
+            for column, widget in enumerate(row):
+                if widget is not None:
+                    grid.append((widget._w, i, column))
+
+        self._widgets[index:index] = new_rows
+
+        for_each(
+            parent, "path row column", "grid $path -row $row -column $column", grid
+        )
+
+        self._update_widths()
+
+    def set_data(self, data):
+        """Replace the contents of the table, all at once.
+
+        Parameters
+        ----------
+        data : iterable of sequences
+            The contents of the cells of each row: a widget, text for a label, or
+            None for an empty cell, or a separator in a separator column.
+
+        Returns
+        -------
+        None
+        """
+        self.clear()
+        self.append_rows(data)
+
     def clear(self):
         """Clear the contents of the widget.
 
+        A virtual table is returned to being an ordinary table.
+
         Returns
         -------
         None
         """
-        for row in self._widgets:
-            for item in row:
-                if item is not None:
-                    item.destroy()
+        if self.virtual:
+            self._end_virtual()
+        _destroy([item for row in self._widgets for item in row if item is not None])
         self._widgets = []
+        self._compact_from = None
+        if self._compact_id is not None:
+            self.after_cancel(self._compact_id)
+            self._compact_id = None
+        self._forget_widths()
+        self._update_widths()
 
     def delete_row(self, index):
-        for item in self._widgets[index]:
-            if item is not None:
-                item.destroy()
-        del self._widgets[index]
+        self.delete_rows((index,))
+
+    def delete_rows(self, indices):
+        """Delete rows, all at once.
+
+        The widgets in the rows are destroyed in a single call to Tk. The rows below
+        are moved up to close the gaps when Tk is next idle, once for all the rows
+        deleted in the meantime.
+
+        Parameters
+        ----------
+        indices : iterable of int
+            The rows to delete. Negative indices count from the end.
+
+        Returns
+        -------
+        None
+        """
+        if self.virtual:
+            raise RuntimeError("Delete rows of a virtual table from its source")
+        nrows = self.nrows
+        indices = {index + nrows if index < 0 else index for index in indices}
+        if len(indices) == 0:
+            return
+        if min(indices) < 0 or max(indices) >= nrows:
+            raise IndexError("row index out of range")
+
+        widgets = []
+        for index in indices:
+            for item in self._widgets[index]:
+                if item is not None:
+                    self._untrack(item)
+                    widgets.append(item)
+        _destroy(widgets)
+        self._widgets = [
+            row for index, row in enumerate(self._widgets) if index not in indices
+        ]
+
+        first = min(indices)
+        if self._compact_from is None or first < self._compact_from:
+            self._compact_from = first
+        if self._compact_id is None:
+            self._compact_id = self.after_idle(self._compact_now)
 
         self._update_widths()
 
     def delete_column(self, index):
+        if self.virtual:
+            raise RuntimeError("Cannot delete the columns of a virtual table")
         for row in self._widgets:
             item = row[index]
             if item is not None:
+                self._untrack(item)
                 item.destroy()
             del row[index]
 
@@ -153,11 +425,14 @@ class ScrolledColumns(ttk.Frame):
 
     def __delitem__(self, key):
         """Allow deletion of keys"""
+        if self.virtual:
+            raise RuntimeError("Cannot delete the cells of a virtual table")
         if isinstance(key, tuple):
             row, column = key
             widget = self.cell(row, column)
+            self._untrack(widget)
             widget.destroy()
-            self.cell(row, column, None)
+            self._widgets[row][column] = None
 
             self._update_widths()
         else:
@@ -165,51 +440,395 @@ class ScrolledColumns(ttk.Frame):
 
     @property
     def nrows(self):
+        if self.virtual:
+            return len(self._source)
         return len(self._widgets)
 
     @property
     def ncolumns(self):
         return len(self._header_widgets)
 
+    def cell_changed(self, row, column):
+        """Note that the size of the widget in a cell may have changed.
+
+        Widgets are measured again when they are resized, so this is only needed
+        when a widget's requested width changes without it being resized, e.g. when
+        the text of a widget stretched to fill its cell is shortened.
+
+        Parameters
+        ----------
+        row, column : int
+            The cell.
+
+        Returns
+        -------
+        None
+        """
+        widget = self.cell(row, column)
+        if widget is not None and widget in self._cell_column:
+            self._to_measure.add(widget)
+            self._update_widths()
+
+    @property
+    def virtual(self):
+        """Whether the table is showing rows from a data source."""
+        return self._source is not None
+
+    def refresh(self):
+        """Show the current data of a virtual table, e.g. after the source changes.
+
+        Returns
+        -------
+        None
+        """
+        if not self.virtual:
+            return
+
+        if len(self._slots) == 0 and len(self._source) > 0:
+            self._slots.append(self._make_slot(0))
+        if self._row_height is None and len(self._slots) > 0:
+            # Measure the height of a row from the first one
+            self._draw(n_shown=1)
+            self.table.interior().update_idletasks()
+            heights = [w.winfo_reqheight() for w in self._slots[0] if w is not None]
+            self._row_height = max(heights, default=0)
+            if self._row_height <= 0:
+                self._row_height = None
+
+        row_height = 20 if self._row_height is None else self._row_height
+        height = self.table.canvas.winfo_height()
+        # The number of whole rows visible, plus one more for a partial row
+        self._n_visible = max(1, height // row_height)
+        n_slots = min(len(self._source), self._n_visible + 1 + self._overscan)
+        while len(self._slots) < n_slots:
+            self._slots.append(self._make_slot(len(self._slots)))
+
+        self.yview("moveto", self._first / max(1, len(self._source)))
+        self._draw(n_shown=n_slots)
+
+    def virtualize(self, source, factories=None, overscan=5, row_height=None):
+        """Show rows from a data source, with widgets only for the visible rows.
+
+        Rather than a widget for every cell, the table has a widget for each cell of
+        the rows that fit in the window, plus a few extra. As the table is scrolled
+        these widgets are updated to show the data of the rows now in view, so the
+        number of widgets does not depend on the number of rows. Call `refresh` if
+        the data changes, and `clear` to return to an ordinary table. The columns
+        are as wide as the widest rows shown so far, widening as wider rows come
+        into view.
+
+        Parameters
+        ----------
+        source : sequence
+            The data, supporting len() and indexing, with each row a sequence of the
+            values for the columns.
+        factories : [callable]
+            For each column, a function factory(parent, value, widget) which returns
+            a widget showing the value. It is given the widget it made previously for
+            the cell, which it should update and return, or None to make a new one.
+            None for a column, or for all columns, uses `label_cell`.
+        overscan : int
+            The number of extra rows of widgets beyond those visible.
+        row_height : int
+            The height of the rows, in pixels. By default it is measured from the
+            first row.
+
+        Returns
+        -------
+        None
+        """
+        self.clear()
+        # The widths grow as wider rows are scrolled into view, starting afresh
+        self._column_widths = {}
+
+        self._source = source
+        if factories is None:
+            factories = []
+        self._factories = [
+            label_cell if factory is None else factory for factory in factories
+        ]
+        self._factories.extend([label_cell] * (self.ncolumns - len(self._factories)))
+        self._overscan = overscan
+        self._row_height = row_height
+        self._first = 0
+
+        # Take over the vertical scrolling from the canvas
+        table = self.table
+        canvas = table.canvas
+        canvas.yview_moveto(0)
+        canvas.configure(yscrollcommand="")
+        table.yscrollbar["command"] = self.yview
+        if self._wheel_handler is None:
+            self._wheel_handler = sw.MousewheelSupport(self).scroll_handler(self, "y")
+        self._saved_wheel = (canvas.onMouseWheel, table.yscrollbar.onMouseWheel)
+        canvas.onMouseWheel = self._wheel_handler
+        table.yscrollbar.onMouseWheel = self._wheel_handler
+        if not self._configure_bound:
+            canvas.bind("<Configure>", lambda event: self.refresh(), add="+")
+            self._configure_bound = True
+
+        self.refresh()
+        self._update_widths()
+
+    def yview(self, *args):
+        """Scroll the table vertically, by rows for a virtual table."""
+        if not self.virtual:
+            return self.table.canvas.yview(*args)
+
+        n = len(self._source)
+        if len(args) == 0:
+            if n == 0:
+                return (0.0, 1.0)
+            return (self._first / n, min(1.0, (self._first + self._n_visible) / n))
+
+        first = self._first
+        if args[0] == "moveto":
+            first = int(float(args[1]) * n + 0.5)
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            if args[2].startswith("page"):
+                amount *= max(1, self._n_visible - 1)
+            first += amount
+        first = max(0, min(first, n - self._n_visible))
+
+        if first != self._first:
+            self._first = first
+            self._draw()
+            self._update_widths()
+        self.table.yscrollbar.set(*self.yview())
+
+    def _draw(self, n_shown=None):
+        """Fill the rows of widgets of a virtual table with the data in view.
+
+        Parameters
+        ----------
+        n_shown : int
+            The number of rows of widgets to use, by default the number in use.
+        """
+        if n_shown is None:
+            n_shown = self._n_shown
+        source = self._source
+        n_shown = max(0, min(n_shown, len(source) - self._first, len(self._slots)))
+        parent = self.table.interior()
+        factories = self._factories
+        separators = self._column_separators
+
+        for k in range(n_shown):
+            data = source[self._first + k]
+            slot = self._slots[k]
+            for column, widget in enumerate(slot):
+                if column in separators:
+                    if k >= self._n_shown:
+                        widget.grid(row=k, column=column)
+                    continue
+                new = factories[column](parent, data[column], widget)
+                if new is not widget:
+                    if widget is not None:
+                        widget.destroy()
+                    slot[column] = new
+                    new.grid(row=k, column=column)
+                elif k >= self._n_shown:
+                    widget.grid(row=k, column=column)
+
+        # Hide any rows of widgets no longer needed
+        for slot in self._slots[n_shown : self._n_shown]:
+            for widget in slot:
+                if widget is not None:
+                    widget.grid_remove()
+
+        self._n_shown = n_shown
+
+    def _end_virtual(self):
+        """Return a virtual table to being an ordinary one."""
+        for slot in self._slots:
+            for widget in slot:
+                if widget is not None:
+                    widget.destroy()
+        self._slots = []
+        self._n_shown = 0
+        self._first = 0
+        self._source = None
+        self._factories = None
+
+        table = self.table
+        canvas = table.canvas
+        canvas.configure(yscrollcommand=table.yscrollbar.set)
+        table.yscrollbar["command"] = canvas.yview
+        canvas.onMouseWheel, table.yscrollbar.onMouseWheel = self._saved_wheel
+        self._saved_wheel = None
+
+    def _make_slot(self, k):
+        """A row of widgets for a virtual table, with just the separators made."""
+        parent = self.table.interior()
+        return [
+            ttk.Label(parent, text="|") if column in self._column_separators else None
+            for column in range(self.ncolumns)
+        ]
+
+    def _compact_now(self):
+        """Move the rows after deleted ones up to their new rows in the grid."""
+        if self._compact_id is not None:
+            self.after_cancel(self._compact_id)
+            self._compact_id = None
+        if self._compact_from is None:
+            return
+        first = self._compact_from
+        self._compact_from = None
+
+        for_each(
+            self.table.interior(),
+            "path row",
+            "grid configure $path -row $row",
+            [
+                (widget._w, row)
+                for row, widgets in enumerate(self._widgets[first:], start=first)
+                for widget in widgets
+                if widget is not None
+            ],
+        )
+
+    def _forget_widths(self):
+        """Stop tracking the widths of all the widgets in the table."""
+        self._changed_columns.update(self._cell_widths)
+        self._cell_widths = {}
+        self._cell_column = {}
+        self._to_measure = set()
+
+    def _track(self, widget, column):
+        """Start tracking the width of a widget in the table."""
+        self._cell_column[widget] = column
+        self._to_measure.add(widget)
+
+    def _untrack(self, widget):
+        """Stop tracking the width of a widget, e.g. because it is being removed."""
+        column = self._cell_column.pop(widget, None)
+        if column is None:
+            return
+        self._to_measure.discard(widget)
+        if self._cell_widths.get(column, {}).pop(widget, None) is not None:
+            self._changed_columns.add(column)
+
+    def _cell_resized(self, path):
+        """Measure a widget in the table again, since its requested width changed."""
+        try:
+            widget = self.nametowidget(path)
+        except KeyError:
+            return
+        if widget in self._cell_column:
+            self._to_measure.add(widget)
+            self._update_widths()
+
     def _update_widths_now(self):
         """Force the update of the column widths to happen now"""
         self._update_widths(when="now")
 
     def _update_widths(self, when="later"):
-        """Make the column widths of header and table identical"""
+        """Make the column widths of header and table identical
+
+        Only the widgets added or changed since the last time are measured, and only
+        the columns whose widest widget has changed are resized.
+        """
 
         if when == "later":
             if self._after_id is None:
                 self._after_id = self.after_idle(self._update_widths_now)
             return
 
-        self.after_cancel(self._after_id)
-        self._after_id = None
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+            self._after_id = None
 
         header = self.headers.interior()
         table = self.table.interior()
 
-        # Remove any widths currently set
-        for column in range(0, self.ncolumns):
-            header.columnconfigure(column, minsize=0)
-            table.columnconfigure(column, minsize=0)
-
-        # Let everything settle and finds its size
-        header.update_idletasks()
-
-        # And make the sizes equal
-        for column in range(0, self.ncolumns):
-            # bbox returns (x, y, w, h) so we want the third item
-            w1 = header.grid_bbox(column, 0)[2]
-            w2 = table.grid_bbox(column, 0)[2]
-            if w1 < w2:
-                header.columnconfigure(column, minsize=w2)
-            else:
-                table.columnconfigure(column, minsize=w1)
-
-        # ensure that the header area is large enough
-        h = header.grid_bbox(0, 0)[3]
-        self.headers.height = h + 5
+        if self.virtual:
+            # There are only the widgets for the rows in view, so measure them all.
+            # The columns are never narrowed, so they do not jump about as rows of
+            # different widths are scrolled through.
+            self._forget_widths()
+            for slot in self._slots[: self._n_shown]:
+                for column, widget in enumerate(slot):
+                    if widget is not None:
+                        self._track(widget, column)
+
+        # The headers only need measuring when first shown or columns are added
+        if self._header_widths is None or len(self._header_widths) != self.ncolumns:
+            sizes = map_each(
+                header,
+                "path",
+                "list [winfo reqwidth $path] [winfo reqheight $path]",
+                [(w._w,) for w in self._header_widgets if w is not None],
+            )
+            sizes = iter(sizes)
+            self._header_widths = []
+            height = 0
+            for widget in self._header_widgets:
+                if widget is None:
+                    self._header_widths.append(0)
+                else:
+                    width, h = header.tk.splitlist(next(sizes))
+                    self._header_widths.append(int(width))
+                    height = max(height, int(h))
+            self._changed_columns.update(range(self.ncolumns))
+
+            # ensure that the header area is large enough
+            self.headers.height = height + 5
+
+        # Measure the new or changed widgets in the table
+        widgets = [*self._to_measure]
+        self._to_measure = set()
+        widths = map_each(
+            table,
+            "path tag",
+            "if {![winfo exists $path]} {list} else {\n"
+            "    if {$tag ni [bindtags $path]} {\n"
+            "        bindtags $path [linsert [bindtags $path] end $tag]\n"
+            "    }\n"
+            "    set ::seamm_widgets_cell_width($path) [winfo reqwidth $path]\n"
+            "}",
+            [(w._w, self._cell_tag) for w in widgets],
+        )
+        for widget, width in zip(widgets, widths):
+            if width == "":
+                # Destroyed without being removed from the table
+                continue
+            column = self._cell_column[widget]
+            self._cell_widths.setdefault(column, {})[widget] = int(width)
+            self._changed_columns.add(column)
+
+        # And make the sizes equal, for the columns that have changed
+        resize = []
+        for column in sorted(self._changed_columns):
+            width = max(self._cell_widths.get(column, {}).values(), default=0)
+            if column < len(self._header_widths):
+                width = max(width, self._header_widths[column])
+            if column < len(self.min_sizes):
+                width = max(width, self.min_sizes[column])
+            if self.virtual:
+                width = max(width, self._column_widths.get(column, 0))
+            if self._column_widths.get(column) != width:
+                self._column_widths[column] = width
+                resize.append((table._w, column, width))
+        self._changed_columns = set()
+
+        for_each(
+            header,
+            "table column width",
+            "grid columnconfigure $w $column -minsize $width\n"
+            "grid columnconfigure $table $column -minsize $width",
+            resize,
+        )
+
+    def destroy(self):
+        """Cancel any pending updates, then destroy the widget."""
+        for after_id in (self._after_id, self._compact_id):
+            if after_id is not None:
+                self.after_cancel(after_id)
+        self._after_id = None
+        self._compact_id = None
+        super().destroy()
+        for sequence in ("<Configure>", "<Destroy>"):
+            self.tk.call("bind", self._cell_tag, sequence, "")
 
     def interior(self):
         """Where the user packs widgets"""
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+"""A small window for picking one item from a long list by typing part of it.
+
+The items are shown as "name: description". Typing in the search field narrows the
+list to the items whose name or description contains the text, using a `TextIndex`
+built the first time a search is made. Items can be excluded when the picker is
+posted, e.g. those already chosen, without rebuilding the index.
+
+Return or a double-click picks the selected item, or the first if none is selected;
+Escape closes the picker.
+"""
+
+import logging
+import tkinter as tk
+import tkinter.ttk as ttk
+
+from seamm_widgets.text_index import TextIndex
+
+module_logger = logging.getLogger(__name__)
+
+
+class SearchPicker(tk.Toplevel):
+    """A window with a search field and a list of the matching items.
+
+    Parameters
+    ----------
+    master : tkinter.Misc
+        The parent widget.
+    items : iterable of (str, str)
+        The names and descriptions of the items.
+    command : callable
+        Called with the name of the item picked.
+    title : str
+        The title of the window.
+    height : int
+        The number of items visible in the list.
+    width : int
+        The width of the list, in characters.
+    """
+
+    def __init__(
+        self,
+        master,
+        items=(),
+        command=None,
+        title="",
+        height=15,
+        width=50,
+        logger=module_logger,
+    ):
+        super().__init__(master)
+        self.withdraw()
+        self.title(title)
+        self.transient(master.winfo_toplevel())
+        self.protocol("WM_DELETE_WINDOW", self.unpost)
+
+        self.logger = logger
+        self.command = command
+        self._items = {}
+        self._index = None
+        self._exclude = frozenset()
+        self._shown = []
+        self._search_id = None
+
+        self._search = tk.StringVar()
+        self._search.trace_add("write", lambda *args: self._search_later())
+        self._entry = ttk.Entry(self, textvariable=self._search)
+        self._entry.grid(row=0, column=0, columnspan=2, sticky=tk.EW, padx=2, pady=2)
+
+        self._listbox = tk.Listbox(
+            self, height=height, width=width, exportselection=False
+        )
+        scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._listbox.yview)
+        self._listbox.configure(yscrollcommand=scrollbar.set)
+        self._listbox.grid(row=1, column=0, sticky=tk.NSEW)
+        scrollbar.grid(row=1, column=1, sticky=tk.NS)
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+
+        self._entry.bind("<Return>", lambda event: self._pick())
+        self._entry.bind("<Down>", lambda event: self._move(1))
+        self._entry.bind("<Up>", lambda event: self._move(-1))
+        self._listbox.bind("<Return>", lambda event: self._pick())
+        self._listbox.bind("<Double-Button-1>", lambda event: self._pick())
+        self.bind("<Escape>", lambda event: self.unpost())
+
+        self.set_items(items)
+
+    def post(self, x, y, exclude=()):
+        """Show the picker with its top-left corner at a point on the screen.
+
+        Parameters
+        ----------
+        x, y : int
+            The position on the screen.
+        exclude : iterable of str
+            The names of items not to show, e.g. those already chosen.
+        """
+        self._exclude = frozenset(exclude)
+        if self._search.get() == "":
+            self._refresh()
+        else:
+            self._search.set("")
+        self.geometry(f"+{x}+{y}")
+        self.deiconify()
+        self.lift()
+        self._entry.focus_set()
+
+    def set_items(self, items):
+        """Replace the items.
+
+        Parameters
+        ----------
+        items : iterable of (str, str)
+            The names and descriptions of the items.
+        """
+        self._items = dict(items)
+        self._index = None
+        if self.winfo_viewable():
+            self._refresh()
+
+    def unpost(self):
+        """Hide the picker."""
+        if self._search_id is not None:
+            self.after_cancel(self._search_id)
+            self._search_id = None
+        self.withdraw()
+
+    def _move(self, step):
+        """Move the selection in the list up or down."""
+        listbox = self._listbox
+        if listbox.size() == 0:
+            return "break"
+        selection = listbox.curselection()
+        if len(selection) == 0:
+            index = 0
+        else:
+            index = min(max(selection[0] + step, 0), listbox.size() - 1)
+        listbox.selection_clear(0, tk.END)
+        listbox.selection_set(index)
+        listbox.see(index)
+        return "break"
+
+    def _pick(self):
+        """Hide the picker and pass the selected item to the command."""
+        self._search_now()
+        if len(self._shown) == 0:
+            return "break"
+        selection = self._listbox.curselection()
+        name = self._shown[selection[0] if len(selection) > 0 else 0]
+        self.unpost()
+        if self.command is not None:
+            self.command(name)
+        return "break"
+
+    def _refresh(self):
+        """Show the items matching the search that are not excluded."""
+        text = self._search.get().strip()
+        if text == "":
+            names = self._items
+        else:
+            if self._index is None:
+                self._index = TextIndex(
+                    (name, f"{name}\n{description}")
+                    for name, description in self._items.items()
+                )
+            found = self._index.search(text)
+            names = [name for name in self._items if name in found]
+        exclude = self._exclude
+        self._shown = [name for name in names if name not in exclude]
+
+        items = self._items
+        listbox = self._listbox
+        listbox.delete(0, tk.END)
+        if len(self._shown) > 0:
+            listbox.insert(tk.END, *(f"{name}: {items[name]}" for name in self._shown))
+            listbox.selection_set(0)
+
+    def _search_later(self):
+        """Search once the user pauses typing, i.e. when Tk is next idle."""
+        if self._search_id is None:
+            self._search_id = self.after_idle(self._search_now)
+
+    def _search_now(self):
+        if self._search_id is not None:
+            self.after_cancel(self._search_id)
+            self._search_id = None
+        self._refresh()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+"""Helpers for sending many commands to Tk in a single call.
+
+Every call from Python into Tk has a fixed overhead, which adds up quickly when e.g.
+thousands of items are inserted into a tree one at a time. These helpers instead pass
+all the data to Tcl in one call, as a list that tkinter converts directly, and loop
+over it in Tcl. This also avoids quoting the values into the text of a script.
+"""
+
+from itertools import chain
+
+
+def for_each(widget, names, body, rows):
+    """Run a Tcl script for each row of values, all in a single call to Tk.
+
+    For example, to set the image of many items in a Treeview
+
+        for_each(tree, "iid image", "$w item $iid -image $image", rows)
+
+    Parameters
+    ----------
+    widget : tkinter.Misc
+        The widget, whose path is available in the script as $w.
+    names : str or [str]
+        The names of the Tcl variables holding the values in each row.
+    body : str
+        The Tcl script to run for each row.
+    rows : iterable of sequences
+        The values for each row, in the same order as the names. Values may be
+        strings, numbers, booleans or lists and tuples of them.
+
+    Returns
+    -------
+    None
+    """
+    if not isinstance(names, str):
+        names = " ".join(names)
+    values = tuple(chain.from_iterable(rows))
+    if len(values) == 0:
+        return
+    widget.tk.call(
+        "apply", ("w values", f"foreach {{{names}}} $values {{{body}}}"), widget, values
+    )
+
+
+def map_each(widget, names, body, rows):
+    """Evaluate a Tcl expression for each row of values, all in a single call to Tk.
+
+    For example, to get the requested widths of many widgets
+
+        widths = map_each(frame, "path", "winfo reqwidth $path", paths)
+
+    Parameters
+    ----------
+    widget : tkinter.Misc
+        The widget, whose path is available in the script as $w.
+    names : str or [str]
+        The names of the Tcl variables holding the values in each row.
+    body : str
+        The Tcl script to run for each row, whose result is collected.
+    rows : iterable of sequences
+        The values for each row, in the same order as the names.
+
+    Returns
+    -------
+    [str]
+        The result of the script for each row.
+    """
+    if not isinstance(names, str):
+        names = " ".join(names)
+    values = tuple(chain.from_iterable(rows))
+    if len(values) == 0:
+        return []
+    result = widget.tk.call(
+        "apply", ("w values", f"lmap {{{names}}} $values {{{body}}}"), widget, values
+    )
+    return list(widget.tk.splitlist(result))
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+"""An index for quickly finding the items whose text contains a string.
+
+The index maps each n-gram -- the substrings of up to three characters -- of the text
+of the items to the set of items containing it. A search for a short string is then a
+single lookup, and a search for a longer string only needs to check the text of the
+items that contain all of its trigrams. The result of the last search is kept, so that
+when a query is extended, e.g. as the user types into a filter box, only the items that
+matched the shorter query need to be checked.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TextIndex(object):
+    """Case-insensitive substring search over the text of a collection of items.
+
+    Parameters
+    ----------
+    items : iterable of (key, str)
+        The initial items, as pairs of a hashable key and its text.
+    """
+
+    n = 3
+
+    def __init__(self, items=()):
+        self._texts = {}
+        self._grams = {}
+        self._last = None
+        self.add_many(items)
+
+    def __contains__(self, key):
+        return key in self._texts
+
+    def __len__(self):
+        return len(self._texts)
+
+    def add(self, key, text):
+        """Add an item to the index, or update its text.
+
+        Parameters
+        ----------
+        key : hashable
+            The key of the item.
+        text : str
+            The text to search.
+        """
+        self.add_many(((key, text),))
+
+    def add_many(self, items):
+        """Add a number of items to the index, or update their text.
+
+        Parameters
+        ----------
+        items : iterable of (key, str)
+            The items, as pairs of the key and text.
+        """
+        texts = self._texts
+        grams = self._grams
+        ngrams = self._ngrams
+        for key, text in items:
+            if key in texts:
+                self.remove(key)
+            text = text.lower()
+            texts[key] = text
+            for gram in ngrams(text):
+                keys = grams.get(gram)
+                if keys is None:
+                    grams[gram] = {key}
+                else:
+                    keys.add(key)
+        self._last = None
+
+    def _ngrams(self, text):
+        """The distinct substrings of text of length 1 up to n."""
+        n = self.n
+        return {
+            text[i : i + length]
+            for i in range(len(text))
+            for length in range(1, n + 1)
+            if i + length <= len(text)
+        }
+
+    def remove(self, key):
+        """Remove an item from the index, if it is present.
+
+        Parameters
+        ----------
+        key : hashable
+            The key of the item.
+        """
+        text = self._texts.pop(key, None)
+        if text is None:
+            return
+        for gram in self._ngrams(text):
+            keys = self._grams[gram]
+            keys.discard(key)
+            if len(keys) == 0:
+                del self._grams[gram]
+        self._last = None
+
+    def search(self, query):
+        """Find the items whose text contains the query, ignoring case.
+
+        If the query contains the previous query, only the items that matched it are
+        checked.
+
+        Parameters
+        ----------
+        query : str
+            The string to search for.
+
+        Returns
+        -------
+        frozenset
+            The keys of the matching items.
+        """
+        query = query.lower()
+        if self._last is not None and self._last[0] == query:
+            return self._last[1]
+
+        if query == "":
+            result = frozenset(self._texts)
+        elif len(query) <= self.n:
+            result = frozenset(self._grams.get(query, ()))
+        else:
+            candidates = [
+                self._grams.get(query[i : i + self.n], ())
+                for i in range(len(query) - self.n + 1)
+            ]
+            if self._last is not None and self._last[0] in query:
+                candidates.append(self._last[1])
+            candidates.sort(key=len)
+            texts = self._texts
+            result = frozenset(key for key in candidates[0] if query in texts[key])
+        self._last = (query, result)
+        return result
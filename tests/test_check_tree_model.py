@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the CheckTree model in `seamm_widgets`."""
+
+import random
+
+from seamm_widgets.check_tree_model import CheckTreeModel
+
+
+def test_add_many_nothing_to_checked_leaf():
+    """Adding no items to a checked leaf leaves it a checked leaf."""
+    model = CheckTreeModel()
+    model.add("", "end", "a", checked=True)
+    model.add("", "end", "b")
+
+    assert model.add_many("a", []) == []
+    assert model["a"].state == "checked"
+    assert model.count_checked() == 1
+    assert [node.iid for node in model.checked_leaves()] == ["a"]
+
+
+def test_add_many_to_checked_leaf():
+    """Adding items to a checked leaf makes it a branch with the items' state."""
+    model = CheckTreeModel()
+    model.add("", "end", "a", checked=True)
+    model.add_many("a", [("a", "a1", True, (), "", (), False)])
+
+    assert model["a"].state == "checked"
+    assert [node.iid for node in model.checked_leaves()] == ["a1"]
+
+
+def brute_force_checked(model, iid):
+    """The checked leaves below an item, found by walking the tree."""
+    result = []
+    stack = [*reversed(model[iid].children)]
+    while len(stack) > 0:
+        node = stack.pop()
+        if len(node.children) == 0:
+            if node.checked:
+                result.append(node.iid)
+        else:
+            stack.extend(reversed(node.children))
+    return result
+
+
+def test_add_many_not_depth_first():
+    """Items added breadth-first are still counted under the right branches."""
+    model = CheckTreeModel()
+    model.add_many(
+        "",
+        [
+            ("", "n5", False, (), "", (), False),
+            ("", "n6", True, (), "", (), False),
+            ("n5", "n7", True, (), "", (), False),
+        ],
+    )
+    assert [node.iid for node in model.checked_leaves("n5")] == ["n7"]
+    assert model.count_checked("n5") == 1
+    assert [node.iid for node in model.checked_leaves()] == ["n7", "n6"]
+
+
+def test_add_many_depth_first():
+    """Items added depth-first are numbered in tree order without renumbering."""
+    model = CheckTreeModel()
+    model.add("", "end", "a", checked=True)
+    model.add_many(
+        "",
+        [
+            ("", "b", False, (), "", (), False),
+            ("b", "b1", True, (), "", (), False),
+            ("b1", "b11", True, (), "", (), False),
+            ("b", "b2", True, (), "", (), False),
+            ("", "c", True, (), "", (), False),
+        ],
+    )
+    assert model._ordered
+    for iid in ("", "b", "b1"):
+        assert [node.iid for node in model.checked_leaves(iid)] == (
+            brute_force_checked(model, iid)
+        )
+    assert model.count_checked("b") == 2
+
+
+def brute_force_state(node):
+    """The state of an item, worked out from its leaves."""
+    if len(node.children) == 0:
+        return "checked" if node.checked else "unchecked"
+    states = {brute_force_state(child) for child in node.children}
+    return states.pop() if len(states) == 1 else "mixed"
+
+
+def test_propagation():
+    """Checking and unchecking leaves updates the state of their ancestors."""
+    model = CheckTreeModel()
+    model.add("", "end", "a")
+    model.add("a", "end", "a1")
+    model.add("a1", "end", "a11")
+    model.add("a1", "end", "a12")
+    model.add("a", "end", "a2")
+
+    model.set_checked("a11", True)
+    assert [model[iid].state for iid in ("a", "a1", "a11", "a12")] == [
+        "mixed",
+        "mixed",
+        "checked",
+        "unchecked",
+    ]
+    assert model.dirty == {"a", "a1", "a11"}
+
+    model.set_checked("a12", True)
+    assert model["a1"].state == "checked"
+    assert model["a"].state == "mixed"
+
+    model.set_checked("a", True)
+    assert model["a"].state == "checked"
+    assert model.count_checked() == 3
+
+    model.set_checked("a1", False)
+    assert model["a"].state == "mixed"
+    assert [node.iid for node in model.checked_leaves()] == ["a2"]
+
+
+def test_random_changes():
+    """The states and checked leaves agree with brute force after random changes."""
+    rng = random.Random(1)
+    model = CheckTreeModel()
+    n = 0
+    for step in range(500):
+        iids = [*model.nodes]
+        action = rng.random()
+        if action < 0.3 or len(iids) < 5:
+            n += 1
+            model.add(rng.choice(iids), "end", f"n{n}", checked=rng.random() < 0.5)
+        elif action < 0.4:
+            items = []
+            parents = [rng.choice(["", rng.choice(iids)])]
+            for _ in range(rng.randint(0, 5)):
+                n += 1
+                items.append((rng.choice(parents), f"n{n}", rng.random() < 0.5))
+                parents.append(f"n{n}")
+            model.add_many(
+                parents[0],
+                [
+                    (parent, iid, checked, (), "", (), False)
+                    for parent, iid, checked in items
+                ],
+            )
+        elif action < 0.5:
+            iid = rng.choice(iids[1:])
+            parent = rng.choice(iids)
+            try:
+                model.move(iid, parent, "end")
+            except ValueError:
+                pass
+        elif action < 0.55:
+            model.remove(rng.choice(iids[1:]))
+        else:
+            model.set_checked(
+                rng.choice(iids[1:]), rng.random() < 0.5, recursive=rng.random() < 0.8
+            )
+
+        for node in model.nodes.values():
+            assert node.state == brute_force_state(node), (step, node)
+        for iid in rng.sample([*model.nodes], min(5, len(model.nodes))):
+            expected = brute_force_checked(model, iid)
+            assert [node.iid for node in model.checked_leaves(iid)] == expected
+            assert model.count_checked(iid) == len(expected)
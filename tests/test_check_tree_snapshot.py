@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the snapshots of CheckTree selections in `seamm_widgets`."""
+
+import json
+
+from seamm_widgets.check_tree import CheckTree
+from seamm_widgets.check_tree_model import CheckTreeModel
+
+
+class Tree(object):
+    """The parts of a CheckTree used by snapshots, without the widget."""
+
+    snapshot = CheckTree.snapshot
+    restore = CheckTree.restore
+
+    def __init__(self, n=20):
+        self._model = CheckTreeModel()
+        for i in range(n):
+            self._model.add("", "end", f"b{i}")
+            for j in range(i % 4 + 1):
+                self._model.add(f"b{i}", "end", f"b{i}.{j}", checked=(i + j) % 3 == 0)
+
+    def _update_items(self):
+        pass
+
+    def checked(self, parent=""):
+        return [node.iid for node in self._model.checked_leaves(parent)]
+
+
+def test_same_shape():
+    """A snapshot restores the checked leaves of a tree of the same shape."""
+    tree = Tree()
+    expected = tree.checked()
+    snapshot = json.loads(json.dumps(tree.snapshot()))
+
+    tree._model.set_checked("", False)
+    assert tree.checked() == []
+    assert tree.restore(snapshot)
+    assert tree.checked() == expected
+
+
+def test_changed_shape():
+    """After the tree changes, the leaves are found by iid, ignoring missing ones."""
+    tree = Tree()
+    expected = tree.checked()
+    snapshot = tree.snapshot()
+
+    tree._model.remove(expected[0])
+    tree._model.add("b1", "end", "new", checked=True)
+    assert not tree.restore(snapshot)
+    assert tree.checked() == expected[1:]
+
+
+def test_branch():
+    """A snapshot of a branch restores only that branch."""
+    tree = Tree()
+    snapshot = tree.snapshot("b3")
+    expected = tree.checked()
+
+    tree._model.set_checked("b3", True)
+    tree._model.set_checked("b4", True)
+    assert tree.restore(snapshot, "b3")
+    assert tree.checked("b3") == [iid for iid in expected if iid.startswith("b3.")]
+    assert "b4.0" in tree.checked()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the keyword index in `seamm_widgets`."""
+
+import gc
+
+from seamm_widgets.keyword_index import KeywordIndex
+from seamm_widgets.metadata_cache import invalidate
+
+
+def test_shared():
+    """The index is shared while in use."""
+    metadata = {"AM1": {}, "CHARGE": {}}
+    index = KeywordIndex.for_metadata(metadata)
+    assert KeywordIndex.for_metadata(metadata) is index
+
+
+def test_renamed_keyword():
+    """Renaming a keyword, keeping the number of keywords, rebuilds the index."""
+    metadata = {"AM1": {}, "PM7": {}}
+    index = KeywordIndex.for_metadata(metadata)
+    del metadata["PM7"]
+    metadata["CHARGE"] = {}
+    assert index.stale
+    assert KeywordIndex.for_metadata(metadata).matches("C") == ["CHARGE"]
+
+
+def test_invalidate():
+    """Invalidating the metadata rebuilds the index after other changes."""
+    metadata = {"AM1": {"description": "semiempirical"}}
+    index = KeywordIndex.for_metadata(metadata)
+    assert index.complete("hamiltonian") == []
+    metadata["AM1"]["description"] = "the AM1 hamiltonian"
+    invalidate(metadata)
+    assert index.stale
+    assert KeywordIndex.for_metadata(metadata).complete("hamiltonian") == ["AM1"]
+
+
+def test_released():
+    """The index is dropped from the cache once no longer used."""
+    metadata = {"AM1": {}}
+    KeywordIndex.for_metadata(metadata)
+    gc.collect()
+    assert (id(metadata),) not in KeywordIndex._cache
+
+
+metadata = {
+    "CHARGE": {"description": "The charge on the system"},
+    "CHARGES": {"description": "Print the charges"},
+    "CHAIN": {"description": "A polymer chain"},
+    "COSWRT": {"description": "Write the COSMO charges"},
+    "CYCLES": {"description": "Number of cycles"},
+    "AM1": {"description": "The AM1 Hamiltonian"},
+    "1SCF": {"description": "Do one SCF and then stop"},
+    "EPS": {"description": "The dielectric constant, for COSMO"},
+}
+
+
+def test_complete_prefix_first():
+    """Keywords starting with the text come first, shortest first."""
+    index = KeywordIndex(metadata)
+    assert index.complete("cha", 3) == ["CHAIN", "CHARGE", "CHARGES"]
+    assert index.complete("cha", 1) == ["CHAIN"]
+
+
+def test_complete_subsequence():
+    """Then keywords with the same first letter containing the letters in order."""
+    index = KeywordIndex(metadata)
+    assert index.complete("cs") == ["COSWRT", "CYCLES", "CHARGES"]
+
+
+def test_complete_description():
+    """Then keywords with a word in their description starting with the text."""
+    index = KeywordIndex(metadata)
+    assert index.complete("cosmo") == ["EPS", "COSWRT"]
+    assert index.complete("hamil") == ["AM1"]
+
+
+def test_complete_normalized():
+    """Case and punctuation are ignored."""
+    index = KeywordIndex({"ADD-H": {}, "ADDH2": {}, "XYZ": {}})
+    assert index.complete("addh") == ["ADD-H", "ADDH2"]
+    assert index.complete("--") == []
+    assert index.complete("xyz", 0) == []
+
+
+def test_prefixes():
+    """Counting, matching and resolving prefixes."""
+    index = KeywordIndex(metadata)
+    assert index.count("CHA") == 3
+    assert index.matches("CHAR") == ["CHARGE", "CHARGES"]
+    assert index.lcp("CHAR") == "CHARGE"
+    assert index.resolve("CY") == "CYCLES"
+    assert index.resolve("CHAR") is None
+    assert index.resolve("CHARGE") == "CHARGE"
+    assert index.lcp("Q") is None
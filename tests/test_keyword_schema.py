@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the keyword schema in `seamm_widgets`."""
+
+from seamm_widgets.keyword_schema import KeywordSchema, quote, tokenize
+
+
+def test_renamed_keyword():
+    """Renaming a keyword, keeping the number of keywords, recompiles the schema."""
+    metadata = {"AM1": {}, "PM7": {}}
+    schema = KeywordSchema.for_metadata(metadata)
+    del metadata["PM7"]
+    metadata["CHARGE"] = {"takes values": 1, "type": "integer"}
+    schema = KeywordSchema.for_metadata(metadata)
+    assert "CHARGE" in schema
+    assert not schema["CHARGE"].is_valid("x")
+
+
+def test_tokenize_unclosed_quotes():
+    """Quotes and brackets without a partner are kept as ordinary characters."""
+    assert tokenize("AM1 CHARGE=1 TITLE=don't stop") == [
+        "AM1",
+        "CHARGE=1",
+        "TITLE=don't",
+        "stop",
+    ]
+    assert tokenize('TITLE="abc def') == ['TITLE="abc', "def"]
+    assert tokenize("METAL=(Zn, Cu) X=(1") == ["METAL=(Zn, Cu)", "X=(1"]
+    assert tokenize("TITLE='a b' T=\"c d\"") == ["TITLE='a b'", 'T="c d"']
+
+
+def test_parse_removes_quotes():
+    """The quotes around values are removed."""
+    schema = KeywordSchema({"T": {"takes values": 1}})
+    assert schema.parse('T="a b"') == ("T", "a b")
+    assert schema.parse("X='c'") == ("X", "c")
+
+
+def test_round_trip():
+    """Formatting keywords with quoted values and parsing them gives them back."""
+    metadata = {
+        "AM1": {},
+        "CHARGE": {"takes values": 1, "type": "integer"},
+        "TITLE": {"takes values": 1},
+        "METAL": {"takes values": 1, "format": "{}({})"},
+        "EPS": {"takes values": 1, "type": "float"},
+    }
+    schema = KeywordSchema(metadata)
+    keywords = [
+        ("AM1", None),
+        ("CHARGE", "-1"),
+        ("TITLE", "don't stop"),
+        ("TITLE", 'say "hello" now'),
+        ("TITLE", '"quoted"'),
+        ("TITLE", "'"),
+        ("METAL", "Zn, Cu"),
+        ("TITLE", "(draft"),
+        ("EPS", "78.4"),
+        ("TITLE", "v2)"),
+        ("TITLE", "'90s"),
+        ("TITLE", "[a"),
+        ("TITLE", "{"),
+        ("TITLE", "rock'"),
+        ("X", "a b"),
+    ]
+    line = " ".join(
+        keyword if value is None else schema.format(keyword, value)
+        for keyword, value in keywords
+    )
+    assert schema.parse_line(line) == keywords
+
+
+def test_quote():
+    """Values are quoted only if needed."""
+    assert quote("abc") == "abc"
+    assert quote("don't") == "don't"
+    assert quote("(a b)") == "(a b)"
+    assert quote("a b") == '"a b"'
+    assert quote('"a"') == "'\"a\"'"
+    assert quote("(draft") == '"(draft"'
+    assert quote("'90s") == '"\'90s"'
+
+
+def test_text_round_trip():
+    """Parsing a line and formatting the keywords again gives the same line."""
+    metadata = {
+        "AM1": {},
+        "CHARGE": {"takes values": 1},
+        "TITLE": {"takes values": 1},
+        "METAL": {"takes values": 1, "format": "{}({})"},
+    }
+    schema = KeywordSchema(metadata)
+    for line in (
+        "AM1 METAL(Zn, Cu)",
+        'AM1 CHARGE=1 TITLE="a b" METAL(Zn)',
+        "TITLE=don't TITLE='say \"hi\"'",
+        'TITLE="(draft" TITLE=v2)',
+    ):
+        keywords = schema.parse_line(line)
+        text = " ".join(
+            keyword if value is None else schema.format(keyword, value)
+            for keyword, value in keywords
+        )
+        assert text == line
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the batched Tcl helpers in `seamm_widgets`."""
+
+import tkinter
+
+import pytest
+
+from seamm_widgets.tcl_script import for_each, map_each
+
+
+@pytest.fixture
+def interpreter():
+    """A Tcl interpreter, which needs no display."""
+    return tkinter.Tcl()
+
+
+def test_for_each(interpreter):
+    """The script is run once for each row, with awkward values passed intact."""
+    interpreter.eval("set ::seen {}")
+    rows = [("a", 1), ("b c", 2), ("{[$x]}", 3), ('"', True)]
+    for_each(interpreter, "text n", "lappend ::seen [list $w $text $n]", rows)
+    seen = [
+        interpreter.tk.splitlist(item)
+        for item in interpreter.tk.splitlist(interpreter.eval("set ::seen"))
+    ]
+    assert [item[1] for item in seen] == ["a", "b c", "{[$x]}", '"']
+    assert [int(item[2]) for item in seen] == [1, 2, 3, 1]
+    assert {item[0] for item in seen} == {str(interpreter)}
+
+
+def test_for_each_no_rows(interpreter):
+    """Nothing is run for no rows."""
+    for_each(interpreter, ["x"], "error oops", [])
+
+
+def test_map_each(interpreter):
+    """The results are collected for each row."""
+    rows = [(1, 2), (3, 4), (10, -1)]
+    assert map_each(interpreter, "a b", "expr {$a + $b}", rows) == [3, 7, 9]
+    assert map_each(interpreter, "s", "string length $s", [("a b",), ("",)]) == [3, 0]
+    assert map_each(interpreter, "s", "set s", []) == []
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the text index in `seamm_widgets`."""
+
+import random
+
+from seamm_widgets.text_index import TextIndex
+
+words = ["alpha", "beta", "gamma", "delta", "Epsilon", "zeta", "eta", "theta"]
+
+
+def test_search():
+    """Searches find the items containing the text, ignoring case."""
+    index = TextIndex([(1, "Alpha beta"), (2, "gamma"), (3, "ALPHABET")])
+    assert index.search("") == {1, 2, 3}
+    assert index.search("a") == {1, 2, 3}
+    assert index.search("alpha") == {1, 3}
+    assert index.search("alphab") == {3}
+    assert index.search("ha b") == {1}
+    assert index.search("xyz") == set()
+
+
+def test_add_and_remove():
+    """Items can be added, changed and removed."""
+    index = TextIndex([(1, "alpha"), (2, "beta")])
+    assert index.search("alp") == {1}
+    index.add(3, "alpine")
+    assert index.search("alp") == {1, 3}
+    index.add(1, "omega")
+    assert index.search("alp") == {3}
+    index.remove(3)
+    index.remove(4)
+    assert index.search("alp") == set()
+    assert len(index) == 2 and 1 in index and 3 not in index
+
+
+def test_random_against_brute_force():
+    """Extending and shortening queries gives the same as searching the text."""
+    rng = random.Random(3)
+    texts = {i: " ".join(rng.choices(words, k=3)) for i in range(200)}
+    index = TextIndex(texts.items())
+    for _ in range(100):
+        word = rng.choice(words).lower()
+        start = rng.randrange(len(word))
+        query = ""
+        for character in word[start:] + " " + rng.choice(words):
+            query += character
+            expected = {i for i, text in texts.items() if query.lower() in text.lower()}
+            assert index.search(query) == expected, query